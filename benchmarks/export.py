@@ -0,0 +1,72 @@
+"""
+Benchmark for exporting a library to a deck file.
+
+Exports the same synthetic library with the previous export path (json.dump of the list of FlashCardSet.to_dict
+results) and with the streaming writer of utils.deck_io in each format, and reports the time, the peak memory
+allocated while exporting and the size of the file.
+
+Run from the repository root:
+
+    python -m benchmarks.export [number_of_cards]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cards.flashcard_set import FlashCardSet
+from utils.deck_io import write_deck_file
+
+from .card_storage import iter_card_data
+
+DECK_COUNT = 10
+
+
+def build_library(size):
+    return [
+        FlashCardSet.from_dict({"title": f"Synthetic Deck {i}", "cards": iter_card_data(size // DECK_COUNT)})
+        for i in range(DECK_COUNT)
+    ]
+
+
+def export_json_dump(path, flashcard_sets):
+    data = [flashcard_set.to_dict() for flashcard_set in flashcard_sets]
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+
+def measure(exporter, path, flashcard_sets):
+    """
+    Return (seconds, peak bytes allocated) for exporting the library to path with the given exporter.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    exporter(path, flashcard_sets)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(size=100_000):
+    flashcard_sets = build_library(size)
+    print(f"{size} cards in {DECK_COUNT} decks")
+    exports = (
+        ("json.dump", "decks.json", export_json_dump),
+        ("stream", "decks.json", write_deck_file),
+        ("stream", "decks.ndjson", write_deck_file),
+        ("stream", "decks.json.gz", write_deck_file),
+        ("stream", "decks.ndjson.xz", write_deck_file),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, file_name, exporter in exports:
+            path = os.path.join(directory, file_name)
+            elapsed, peak = measure(exporter, path, flashcard_sets)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{name:>9} {file_name:>15}: {elapsed:6.2f}s  peak {peak / 1e6:7.1f} MB  file {size_mb:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
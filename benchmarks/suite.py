@@ -0,0 +1,350 @@
+"""
+Headless benchmark suite.
+
+Builds synthetic libraries (see benchmarks.synthetic) and measures the hot paths of the application without a
+window: FlashCardSet.from_dict and to_dict, the library and deck aggregates, the review forecast, import and
+export through FileOperations with the file dialogs stubbed and a simulated study loop. Every benchmark reports
+its time and the peak memory it allocated; the peak is measured in a second run with tracemalloc, which would
+slow down the timed run.
+
+The results are saved as benchmarks/results/<commit>.json, so runs on different commits can be compared:
+
+    python -m benchmarks.suite                      # 1k and 100k cards
+    python -m benchmarks.suite --sizes 1k,100k,1m
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest import mock
+
+from cards import forecast
+from cards.flashcard_set import FlashCardSet
+from cards.library import FlashCardLibrary
+from cards.review_log import ReviewLog
+from core.decks import DeckService
+from core.session import DUE_CARDS, StudySession
+from core.stats import StatsService
+from utils.background import TaskRunner
+from utils.file_operations import FileOperations
+
+from .synthetic import DECK_SIZE, build_library, iter_card_data, iter_deck_data
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,100k"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Simulated study loop: number of sessions, cards per session and share of correct answers
+SESSIONS = 50
+SESSION_CARDS = 20
+CORRECT_SHARE = 0.8
+# Ratio of the new to the old time above which --compare flags a benchmark as slower
+REGRESSION_THRESHOLD = 1.1
+
+
+class HeadlessRoot:
+    """
+    Stands in for the Tk root window of the TaskRunner: after() callbacks are queued and run by run_pending().
+    """
+
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def after(self, ms, callback):
+        self._next_id += 1
+        self.callbacks[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+
+class RecordingMessageBox:
+    """
+    Stands in for MessageBox and keeps the titles of the messages the app would show.
+    """
+
+    def __init__(self):
+        self.titles = []
+
+    def show_message(self, title, message, type="info", on_ok=None):
+        self.titles.append(title)
+
+    def show_progress(self, title, message, on_cancel):
+        pass
+
+    def update_progress(self, done, total, unit=""):
+        pass
+
+
+class HeadlessDeckManager:
+    def show_deck_manager(self):
+        pass
+
+
+class HeadlessApp:
+    """
+    The parts of FlashcardGUI that FileOperations uses, without a window.
+    """
+
+    def __init__(self, flashcard_sets):
+        self.root = HeadlessRoot()
+        self.flashcard_sets = flashcard_sets
+        self.decks = DeckService(flashcard_sets)
+        self.tasks = TaskRunner(self.root)
+        self.message_box = RecordingMessageBox()
+        self.deck_manager = HeadlessDeckManager()
+
+    def wait_for_tasks(self):
+        while self.tasks.tasks:
+            time.sleep(0.001)
+            self.root.run_pending()
+        self.root.run_pending()
+
+
+def measure(function):
+    """
+    Return (seconds, peak bytes allocated) of two calls of function: one timed, one traced with tracemalloc.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_from_dict(card_count, library, directory):
+    def run():
+        for data in deck_data:
+            FlashCardSet.from_dict(data)
+
+    # The dictionaries are built up front, as json.load would, so only from_dict is measured
+    deck_data = [dict(data, cards=list(data["cards"])) for data in iter_deck_data(card_count)]
+    return run
+
+
+def bench_to_dict(card_count, library, directory):
+    return lambda: [flashcard_set.to_dict() for flashcard_set in library]
+
+
+def bench_aggregates(card_count, library, directory):
+    def run():
+        stats = StatsService(library)
+        stats.overall()
+        for flashcard_set in library:
+            stats.deck_stats(flashcard_set)
+
+    return run
+
+
+def bench_forecast(card_count, library, directory):
+    if forecast.np is None:
+        return None
+    return lambda: StatsService(library).forecast()
+
+
+def bench_bulk_add(card_count, library, directory):
+    """
+    Adding all cards of the library to new decks through the DeckService, as a script would.
+    """
+    def run():
+        decks = DeckService(FlashCardLibrary())
+        for flashcard_set in library:
+            deck = decks.create_deck(flashcard_set.title)
+            decks.add_cards(deck.id, pairs)
+
+    pairs = [(card["front"], card["back"]) for card in iter_card_data(min(card_count, DECK_SIZE))]
+    return run
+
+
+def bench_export(card_count, library, directory):
+    path = os.path.join(directory, "export.json")
+
+    def run():
+        app = HeadlessApp(library)
+        with mock.patch("utils.file_operations.filedialog.asksaveasfilename", return_value=path):
+            FileOperations(app).export_flashcard_sets()
+        app.wait_for_tasks()
+        app.tasks.shutdown()
+        if app.message_box.titles != ["Export Successful"]:
+            raise RuntimeError(f"export failed: {app.message_box.titles}")
+
+    return run
+
+
+def bench_import(card_count, library, directory):
+    path = os.path.join(directory, "import.json")
+    with open(path, "w") as file:
+        json.dump([flashcard_set.to_dict() for flashcard_set in library], file)
+
+    def run():
+        app = HeadlessApp(FlashCardLibrary())
+        with mock.patch("utils.file_operations.filedialog.askopenfilename", return_value=path):
+            FileOperations(app).import_flashcard_sets()
+        app.wait_for_tasks()
+        app.tasks.shutdown()
+        if app.message_box.titles or len(app.flashcard_sets) != len(library):
+            raise RuntimeError(f"import failed: {app.message_box.titles}")
+
+    return run
+
+
+def bench_study_sessions(card_count, library, directory):
+    """
+    SESSIONS study sessions of the due cards of random decks, run by the StudySession that the GUI's
+    LearningSession shows, with the reviews recorded in a review log.
+    """
+    def run():
+        review_log = ReviewLog(os.path.join(directory, f"reviews-{time.perf_counter_ns()}.log"))
+        rng = random.Random(0)
+        decks = list(library)
+        for _ in range(SESSIONS):
+            session = StudySession(
+                rng.choice(decks), DUE_CARDS, review_log=review_log, library=library, limit=SESSION_CARDS, rng=rng
+            )
+            while not session.finished:
+                session.card_shown()
+                card = session.current_card
+                session.check_answer(card.back if rng.random() < CORRECT_SHARE else "")
+                session.next_card()
+        review_log.flush()
+
+    return run
+
+
+BENCHMARKS = (
+    ("from_dict", bench_from_dict),
+    ("to_dict", bench_to_dict),
+    ("bulk_add", bench_bulk_add),
+    ("aggregates", bench_aggregates),
+    ("forecast", bench_forecast),
+    ("export", bench_export),
+    ("import", bench_import),
+    ("study_sessions", bench_study_sessions),
+)
+
+
+def run_suite(size_names):
+    """
+    Run every benchmark for every size and return the results as a list of dictionaries.
+    """
+    results = []
+    for size_name in size_names:
+        card_count = SIZES[size_name]
+        library = build_library(card_count)
+        with tempfile.TemporaryDirectory() as directory:
+            for name, setup in BENCHMARKS:
+                function = setup(card_count, library, directory)
+                if function is None:
+                    print(f"{size_name:>5} {name:<16} skipped")
+                    continue
+                seconds, peak = measure(function)
+                print(f"{size_name:>5} {name:<16} {seconds * 1000:10.1f} ms {peak / 2 ** 20:10.1f} MiB")
+                results.append({"size": size_name, "cards": card_count, "benchmark": name,
+                                "seconds": seconds, "peak_bytes": peak})
+    return results
+
+
+def git_commit():
+    """
+    Return the short hash of the checked out commit with a "-dirty" suffix for uncommitted changes, or "unknown".
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def save_results(results):
+    """
+    Save the results with the commit and machine they were measured on and return the path of the file.
+    """
+    commit = git_commit()
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    data = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": forecast.np is not None,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+    return path
+
+
+def compare(old_path, new_path):
+    """
+    Print the time and memory of the benchmarks of two result files side by side. Returns True if no benchmark
+    got slower by more than REGRESSION_THRESHOLD.
+    """
+    with open(old_path) as file:
+        old = json.load(file)
+    with open(new_path) as file:
+        new = json.load(file)
+    old_results = {(r["size"], r["benchmark"]): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    ok = True
+    for result in new["results"]:
+        before = old_results.get((result["size"], result["benchmark"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        flag = ""
+        if ratio > REGRESSION_THRESHOLD:
+            flag = "  slower"
+            ok = False
+        print(
+            f"{result['size']:>5} {result['benchmark']:<16} {before['seconds'] * 1000:10.1f} -> "
+            f"{result['seconds'] * 1000:10.1f} ms ({ratio:5.2f}x)  "
+            f"{before['peak_bytes'] / 2 ** 20:8.1f} -> {result['peak_bytes'] / 2 ** 20:8.1f} MiB{flag}"
+        )
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated sizes out of {', '.join(SIZES)}")
+    parser.add_argument("--no-save", action="store_true", help="do not save the results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 0 if compare(*args.compare) else 1
+    size_names = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in size_names if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+    results = run_suite(size_names)
+    if not args.no_save:
+        print(f"Saved to {save_results(results)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
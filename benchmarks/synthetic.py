@@ -0,0 +1,80 @@
+"""
+Synthetic libraries for the benchmarks, modeled on german_colours.json.
+
+Every deck looks like the example deck: a title and cards with a short English front and its German translation
+as back. Cards get a seeded mix of review histories and scheduling states, so aggregates, due queues and
+forecasts have realistic work to do. Generating the same size with the same seed always gives the same library.
+"""
+import json
+import os
+import random
+
+from cards.flashcard_set import FlashCardSet
+from cards.library import FlashCardLibrary
+from utils.storage import COMPACT_THRESHOLD
+
+# The example deck the synthetic decks are modeled on
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "german_colours.json")
+# Largest number of cards per synthetic deck
+DECK_SIZE = 10_000
+DAY = 86400
+
+
+def load_template(path=TEMPLATE_PATH):
+    """
+    Return the title and the (front, back) pairs of the first deck of the example file.
+    """
+    with open(path, "r") as file:
+        deck = json.load(file)[0]
+    return deck["title"], [(card["front"], card["back"]) for card in deck["cards"]]
+
+
+def iter_card_data(count, seed=0, now=1_700_000_000.0, template=None):
+    """
+    Yield count card dictionaries in the export format. About a third of the cards were never reviewed; the others
+    have review counts, SM-2 state and due times spread over the past and the next 60 days.
+    """
+    _, pairs = template or load_template()
+    rng = random.Random(seed)
+    for i in range(count):
+        front, back = pairs[i % len(pairs)]
+        card = {"front": f"{front} {i}", "back": f"{back} {i}"}
+        if rng.random() < 0.66:
+            reviews = rng.randint(1, 30)
+            repetitions = rng.randint(0, 8)
+            card.update(
+                review_count=reviews,
+                correct_count=rng.randint(0, reviews),
+                ease=round(rng.uniform(1.3, 3.0), 2),
+                interval=rng.choice((0, 1, 6, 15, 40, 100)) if repetitions else 0,
+                repetitions=repetitions,
+                due=now + rng.uniform(-10, 60) * DAY,
+            )
+        yield card
+
+
+def iter_deck_data(card_count, deck_size=DECK_SIZE, seed=0):
+    """
+    Yield the deck dictionaries of a library with card_count cards in decks of at most deck_size cards. The cards
+    of each deck are a generator, so the dictionaries can be passed to FlashCardSet.from_dict without holding
+    all of them in memory.
+    """
+    template = load_template()
+    title = template[0]
+    number = 0
+    while card_count > 0:
+        size = min(deck_size, card_count)
+        yield {"title": f"{title} {number + 1}", "cards": iter_card_data(size, seed + number, template=template)}
+        card_count -= size
+        number += 1
+
+
+def build_library(card_count, deck_size=DECK_SIZE, seed=0):
+    """
+    Return a FlashCardLibrary with card_count synthetic cards. Large decks use compact storage, as when the library
+    is loaded from the database.
+    """
+    return FlashCardLibrary(
+        FlashCardSet.from_dict(data, compact=deck_size > COMPACT_THRESHOLD)
+        for data in iter_deck_data(card_count, deck_size, seed)
+    )
@@ -0,0 +1,556 @@
+from array import array
+from collections.abc import MutableSequence
+
+from .flashcard import FlashCard, new_card_id
+
+
+class StringTable:
+    """
+    An append-only table of interned strings. Every distinct string is stored once, UTF-8 encoded in a single
+    shared buffer, and referred to by its id. Repeated texts (e.g. the same answer on many cards) cost one entry,
+    and no per-string Python objects are kept alive. Lookups use an open-addressing hash index held in a typed
+    array instead of a dict, so the index costs a few bytes per string.
+    """
+    __slots__ = ("_blob", "_offsets", "_slots")
+
+    def __init__(self):
+        self._blob = bytearray()
+        self._offsets = array("Q", [0])
+        # Slot values are string id + 1, so that 0 marks an empty slot
+        self._slots = array("I", bytes(4 * 8))
+
+    def _encoded(self, string_id):
+        return bytes(self._blob[self._offsets[string_id]:self._offsets[string_id + 1]])
+
+    def _find_slot(self, encoded):
+        slots, blob, offsets = self._slots, self._blob, self._offsets
+        mask = len(slots) - 1
+        slot = hash(encoded) & mask
+        while slots[slot] and blob[offsets[slots[slot] - 1]:offsets[slots[slot]]] != encoded:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _grow(self):
+        self._slots = array("I", bytes(4 * len(self._slots) * 2))
+        for string_id in range(len(self)):
+            self._slots[self._find_slot(self._encoded(string_id))] = string_id + 1
+
+    def add(self, text):
+        """
+        Return the id of the given string, adding it to the table if it is not present yet.
+        """
+        encoded = text.encode("utf-8")
+        slot = self._find_slot(encoded)
+        if self._slots[slot]:
+            return self._slots[slot] - 1
+        string_id = len(self)
+        self._blob += encoded
+        self._offsets.append(len(self._blob))
+        self._slots[slot] = string_id + 1
+        if 2 * len(self) > len(self._slots):
+            self._grow()
+        return string_id
+
+    def __getitem__(self, string_id):
+        return self._blob[self._offsets[string_id]:self._offsets[string_id + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+class RowIndex:
+    """
+    A hash index from card id to row number. Like the StringTable index, it uses open addressing in a typed array
+    and compares against the ids stored in the rows themselves, so it costs a few bytes per card instead of a dict
+    entry with two int objects.
+    """
+    __slots__ = ("_row_id", "_slots", "_size")
+
+    def __init__(self, row_id):
+        # Callable returning the card id stored in a given row
+        self._row_id = row_id
+        # Slot values are row + 1, so that 0 marks an empty slot
+        self._slots = array("q", bytes(8 * 8))
+        self._size = 0
+
+    def _find_slot(self, card_id):
+        slots, row_id = self._slots, self._row_id
+        mask = len(slots) - 1
+        slot = hash(card_id) & mask
+        while slots[slot] and row_id(slots[slot] - 1) != card_id:
+            slot = (slot + 1) & mask
+        return slot
+
+    def get(self, card_id):
+        """
+        Return the row of the card with the given id, or None if the id is not indexed.
+        """
+        row = self._slots[self._find_slot(card_id)] - 1
+        return row if row >= 0 else None
+
+    def set(self, card_id, row):
+        """
+        Index the card with the given id, which must already be stored in the given row.
+        """
+        slot = self._find_slot(card_id)
+        if not self._slots[slot]:
+            self._size += 1
+        self._slots[slot] = row + 1
+        if 2 * self._size > len(self._slots):
+            self._grow()
+
+    def discard(self, card_id):
+        """
+        Remove the card with the given id from the index, if it is indexed. The card must still be stored in its
+        row. The entries after it in the same probe sequence are moved back, so they can still be found.
+        """
+        slots, row_id = self._slots, self._row_id
+        mask = len(slots) - 1
+        hole = self._find_slot(card_id)
+        if not slots[hole]:
+            return
+        self._size -= 1
+        slot = (hole + 1) & mask
+        while slots[slot]:
+            home = hash(row_id(slots[slot] - 1)) & mask
+            # The entry may only move back to the hole if the hole lies between its home slot and its slot
+            if (slot - home) & mask >= (slot - hole) & mask:
+                slots[hole] = slots[slot]
+                hole = slot
+            slot = (slot + 1) & mask
+        slots[hole] = 0
+
+    def _grow(self):
+        old_slots = self._slots
+        self._slots = array("q", bytes(8 * 2 * len(old_slots)))
+        for value in old_slots:
+            if value:
+                self._slots[self._find_slot(self._row_id(value - 1))] = value
+
+    def reindex(self, first, removed_ids, row_count):
+        """
+        Update the index after the cards with the given ids were removed and the rows from first on moved. The rows of
+        all moved cards changed, so the index is rebuilt instead of updated entry by entry.
+        """
+        self.rebuild(row_count)
+
+    def rebuild(self, row_count):
+        """
+        Re-index rows 0 to row_count - 1 from scratch.
+        """
+        capacity = 8
+        while capacity < 2 * row_count:
+            capacity *= 2
+        slots = self._slots = array("q", bytes(8 * capacity))
+        self._size = row_count
+        mask = capacity - 1
+        # The ids of the rows are unique, so free slots are found without comparing ids
+        for row, card_id in enumerate(map(self._row_id, range(row_count))):
+            slot = hash(card_id) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = row + 1
+
+
+class DictRowIndex(dict):
+    """
+    A dict-based index from card id to row number with the same interface as RowIndex. It is faster to update
+    than RowIndex but uses more memory per card.
+    """
+
+    def __init__(self, row_id):
+        super().__init__()
+        self._row_id = row_id
+
+    def set(self, card_id, row):
+        self[card_id] = row
+
+    def discard(self, card_id):
+        self.pop(card_id, None)
+
+    def rebuild(self, row_count):
+        self.clear()
+        row_id = self._row_id
+        for row in range(row_count):
+            self[row_id(row)] = row
+
+    def reindex(self, first, removed_ids, row_count):
+        for card_id in removed_ids:
+            del self[card_id]
+        row_id = self._row_id
+        for row in range(first, row_count):
+            self[row_id(row)] = row
+
+
+class CardStore(MutableSequence):
+    """
+    Base class of the card storages of a FlashCardSet. Cards are kept in insertion order and indexed by id, so
+    looking up, editing and deleting a card by id are O(1). Deleting only marks the row as dead; dead rows are
+    compacted in a single pass the next time the cards are accessed by position, so deleting many cards costs one
+    pass over the storage instead of one per card.
+
+    Subclasses store the rows, implement the _row_count, _row_id, _card_at, _set_row, _insert_row and _drop_rows
+    hooks and choose the id index type.
+    """
+    INDEX_TYPE = DictRowIndex
+
+    def __init__(self, deck=None):
+        # The FlashCardSet owning the store. It is informed of the counts of added and removed cards.
+        self.deck = deck
+        self._positions = self.INDEX_TYPE(self._row_id)
+        self._dead = set()
+
+    def __len__(self):
+        return self._row_count() - len(self._dead)
+
+    def __contains__(self, card):
+        return isinstance(card, FlashCard) and self.has(card.id)
+
+    def _row_of(self, card_id):
+        row = self._positions.get(card_id)
+        if row is None or row in self._dead:
+            raise KeyError(card_id)
+        return row
+
+    def has(self, card_id):
+        """
+        Return True if a card with the given id is in the store.
+        """
+        row = self._positions.get(card_id)
+        return row is not None and row not in self._dead
+
+    def get(self, card_id):
+        """
+        Return the card with the given id. Raises KeyError if there is no such card.
+        """
+        return self._card_at(self._row_of(card_id))
+
+    def discard(self, card_id):
+        """
+        Remove the card with the given id. The row is only marked as dead and dropped by the next compaction.
+        """
+        self._dead.add(self._row_of(card_id))
+
+    def compact(self):
+        """
+        Drop all dead rows in one pass and re-index the remaining cards.
+        """
+        if not self._dead:
+            return
+        # Rows before the first dead row keep their position
+        first = min(self._dead)
+        # A dead card's id may have been indexed again for a card added since
+        dead_ids = [
+            card_id for card_id, row in zip(map(self._row_id, self._dead), self._dead)
+            if self._positions.get(card_id) == row
+        ]
+        self._drop_rows(self._dead)
+        self._dead = set()
+        self._positions.reindex(first, dead_ids, self._row_count())
+
+    def _row(self, index):
+        self.compact()
+        size = self._row_count()
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("card index out of range")
+        return index
+
+    def _take_id(self, card):
+        """
+        Return the id under which the given card will be stored. A card whose id is already taken gets a new one.
+        """
+        return new_card_id() if self.has(card.id) else card.id
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.compact()
+            return [self._card_at(row) for row in range(*index.indices(self._row_count()))]
+        return self._card_at(self._row(index))
+
+    def __setitem__(self, index, card):
+        row = self._row(index)
+        self._on_removed(self._card_at(row))
+        # The old id is unindexed while the row still holds it, so the new card may keep the same id
+        self._positions.discard(self._row_id(row))
+        card_id = self._take_id(card)
+        self._set_row(row, card, card_id)
+        self._positions.set(card_id, row)
+        self._on_added(card)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.compact()
+            card_ids = [self._row_id(row) for row in range(*index.indices(self._row_count()))]
+        else:
+            card_ids = [self._row_id(self._row(index))]
+        for card_id in card_ids:
+            self.discard(card_id)
+
+    def append(self, card):
+        card_id = self._take_id(card)
+        row = self._row_count()
+        self._insert_row(row, card, card_id)
+        self._positions.set(card_id, row)
+        self._on_added(card)
+
+    def insert(self, index, card):
+        if index < 0:
+            index = max(index + len(self), 0)
+        if index >= len(self):
+            self.append(card)
+            return
+        self.compact()
+        card_id = self._take_id(card)
+        self._insert_row(index, card, card_id)
+        self._positions.rebuild(self._row_count())
+        self._on_added(card)
+
+    def copy(self):
+        """
+        Return a list of all cards, mirroring list.copy().
+        """
+        return self[:]
+
+    def column(self, field):
+        """
+        Return the values of the given card field (e.g. "due" or "review_count") for all cards, in card order.
+        """
+        self.compact()
+        return [getattr(card, field) for card in self]
+
+    def records(self):
+        """
+        Yield the record of every card (see FlashCard.record), in card order.
+        """
+        self.compact()
+        for card in self:
+            yield card.record()
+
+    def _on_added(self, card):
+        if self.deck is not None:
+            self.deck._card_added(card)
+
+    def _on_removed(self, card):
+        if self.deck is not None:
+            self.deck._card_removed(card)
+
+
+class CardList(CardStore):
+    """
+    Default card storage of a FlashCardSet: a list of FlashCard objects indexed by card id.
+    """
+
+    def __init__(self, cards=(), deck=None):
+        super().__init__(deck)
+        self._cards = []
+        self.extend(cards)
+
+    def discard(self, card_id):
+        card = self.get(card_id)
+        self._on_removed(card)
+        card._deck = None
+        super().discard(card_id)
+
+    def _row_count(self):
+        return len(self._cards)
+
+    def _row_id(self, row):
+        return self._cards[row].id
+
+    def _card_at(self, row):
+        return self._cards[row]
+
+    def _set_row(self, row, card, card_id):
+        self._cards[row]._deck = None
+        card.id = card_id
+        card._deck = self.deck
+        self._cards[row] = card
+
+    def _insert_row(self, row, card, card_id):
+        card.id = card_id
+        card._deck = self.deck
+        self._cards.insert(row, card)
+
+    def _drop_rows(self, dead):
+        if len(dead) < 64:
+            for row in sorted(dead, reverse=True):
+                del self._cards[row]
+            return
+        self._cards = [card for row, card in enumerate(self._cards) if row not in dead]
+
+
+def _column_property(name):
+    """
+    Return a property reading and writing the given typed array column of the view's store at the view's row.
+    """
+    def getter(self):
+        store = self._store
+        return getattr(store, name)[store._row_of(self._card_id)]
+
+    def setter(self, value):
+        store = self._store
+        getattr(store, name)[store._row_of(self._card_id)] = value
+
+    return property(getter, setter)
+
+
+class FlashCardView(FlashCard):
+    """
+    A lightweight view onto one card of a CompactCardStore. It behaves like a FlashCard, but reads and writes its
+    fields straight from the store's arrays, locating its row through the card id.
+    """
+    __slots__ = ("_store", "_card_id")
+
+    def __init__(self, store, card_id):
+        self._store = store
+        self._card_id = card_id
+
+    @property
+    def id(self):
+        return self._card_id
+
+    @property
+    def _deck(self):
+        return self._store.deck
+
+    @property
+    def front(self):
+        store = self._store
+        return store._strings[store._fronts[store._row_of(self._card_id)]]
+
+    @front.setter
+    def front(self, value):
+        store = self._store
+        store._fronts[store._row_of(self._card_id)] = store._strings.add(value)
+
+    @property
+    def back(self):
+        store = self._store
+        return store._strings[store._backs[store._row_of(self._card_id)]]
+
+    @back.setter
+    def back(self, value):
+        store = self._store
+        store._backs[store._row_of(self._card_id)] = store._strings.add(value)
+
+    review_count = _column_property("_review_counts")
+    correct_count = _column_property("_correct_counts")
+    ease = _column_property("_eases")
+    interval = _column_property("_intervals")
+    repetitions = _column_property("_repetitions")
+    due = _column_property("_dues")
+    edited = _column_property("_edits")
+
+
+class CompactCardStore(CardStore):
+    """
+    Column-oriented card storage used by FlashCardSet in compact mode. Front and back texts are kept in a shared
+    StringTable and referenced by id, ids, counts and scheduling state are kept in typed arrays. Indexing returns
+    FlashCardView objects, so code written against a list of FlashCard objects keeps working.
+    """
+    INDEX_TYPE = RowIndex
+    # Names of the typed array attributes holding one value per row
+    COLUMNS = (
+        "_ids", "_fronts", "_backs", "_review_counts", "_correct_counts", "_eases", "_intervals", "_repetitions",
+        "_dues", "_edits",
+    )
+
+    # Typed array column of each numeric card field
+    FIELD_COLUMNS = {
+        "id": "_ids",
+        "review_count": "_review_counts",
+        "correct_count": "_correct_counts",
+        "ease": "_eases",
+        "interval": "_intervals",
+        "repetitions": "_repetitions",
+        "due": "_dues",
+        "edited": "_edits",
+    }
+
+    def __init__(self, cards=(), deck=None):
+        super().__init__(deck)
+        self._strings = StringTable()
+        self._ids = array("q")
+        self._fronts = array("I")
+        self._backs = array("I")
+        self._review_counts = array("I")
+        self._correct_counts = array("I")
+        self._eases = array("d")
+        self._intervals = array("d")
+        self._repetitions = array("H")
+        self._dues = array("d")
+        self._edits = array("d")
+        self.extend(cards)
+
+    def discard(self, card_id):
+        self._on_removed(self.get(card_id))
+        super().discard(card_id)
+
+    def column(self, field):
+        """
+        Return the typed array holding the given card field for all cards. The array is the store's own column,
+        not a copy.
+        """
+        self.compact()
+        return getattr(self, self.FIELD_COLUMNS[field])
+
+    def records(self):
+        """
+        Yield the record of every card (see FlashCard.record), read column by column without creating views.
+        """
+        self.compact()
+        text = self._strings.__getitem__
+        return zip(
+            self._ids, map(text, self._fronts), map(text, self._backs), self._review_counts, self._correct_counts,
+            self._eases, self._intervals, self._repetitions, self._dues, self._edits,
+        )
+
+    def _row_values(self, card, card_id):
+        return (
+            card_id,
+            self._strings.add(card.front),
+            self._strings.add(card.back),
+            card.review_count,
+            card.correct_count,
+            card.ease,
+            card.interval,
+            card.repetitions,
+            card.due,
+            card.edited,
+        )
+
+    def _row_count(self):
+        return len(self._ids)
+
+    def _row_id(self, row):
+        return self._ids[row]
+
+    def _card_at(self, row):
+        return FlashCardView(self, self._ids[row])
+
+    def _set_row(self, row, card, card_id):
+        for name, value in zip(self.COLUMNS, self._row_values(card, card_id)):
+            getattr(self, name)[row] = value
+
+    def _insert_row(self, row, card, card_id):
+        values = self._row_values(card, card_id)
+        if row == len(self._ids):
+            for name, value in zip(self.COLUMNS, values):
+                getattr(self, name).append(value)
+        else:
+            for name, value in zip(self.COLUMNS, values):
+                getattr(self, name).insert(row, value)
+
+    def _drop_rows(self, dead):
+        if len(dead) < 64:
+            # A few rows, as after deleting single cards, are cheaper to delete in place
+            for row in sorted(dead, reverse=True):
+                for name in self.COLUMNS:
+                    del getattr(self, name)[row]
+            return
+        kept = [row for row in range(len(self._ids)) if row not in dead]
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, map(column.__getitem__, kept)))
@@ -1,22 +1,68 @@
+import random
+
+from .scheduler import scheduler
+
+# Card ids are random 63-bit integers, so cards created on different devices do not collide
+_id_random = random.Random()
+
+
+def new_card_id():
+    """
+    Return a new random card id.
+    """
+    return _id_random.getrandbits(63)
+
+
+# Persistent fields of a card, in the order used by to_dict and CardStore.records
+CARD_FIELDS = (
+    "id", "front", "back", "review_count", "correct_count", "ease", "interval", "repetitions", "due", "edited"
+)
+
+
 class FlashCard:
-    def __init__(self, front, back):
+    __slots__ = (
+        "id", "front", "back", "review_count", "correct_count", "ease", "interval", "repetitions", "due", "edited",
+        "_deck",
+    )
+
+    def __init__(self, front, back, review_count=0, correct_count=0, card_id=None,
+                 ease=None, interval=0, repetitions=0, due=0, edited=0):
+        self.id = new_card_id() if card_id is None else card_id
         self.front = front
         self.back = back
-        self.review_count = 0
-        self.correct_count = 0
+        self.review_count = review_count
+        self.correct_count = correct_count
+        # Spaced-repetition state, see cards.scheduler. A due time of 0 means the card was never scheduled.
+        self.ease = scheduler.initial_ease if ease is None else ease
+        self.interval = interval
+        self.repetitions = repetitions
+        self.due = due
+        # Time of the last edit of the front or back, 0 if they were not edited since the card was created. It
+        # decides which copy's texts win when copies of the card are merged, see cards.sync.
+        self.edited = edited
+        # The FlashCardSet this card belongs to. It is kept informed of reviews so it can maintain running totals.
+        self._deck = None
 
-    def mark_correct(self):
+    def mark_correct(self, now=None):
         """
-        Mark the card as correctly answered and increment the review count.
+        Mark the card as correctly answered, increment the review count and schedule the next review. now is the
+        time of the review and defaults to the current time.
         """
         self.review_count += 1
         self.correct_count += 1
+        scheduler.review(self, True, now)
+        if self._deck is not None:
+            self._deck._card_reviewed(self, True)
 
-    def mark_incorrect(self):
+    def mark_incorrect(self, now=None):
         """
-        Mark the card as incorrectly answered and increment the review count.
+        Mark the card as incorrectly answered, increment the review count and schedule the card to be shown again.
+        now is the time of the review and defaults to the current time.
         """
         self.review_count += 1
+        scheduler.review(self, False, now)
+        if self._deck is not None:
+            self._deck._card_reviewed(self, False)
 
     def success_rate(self):
         """
@@ -24,4 +70,36 @@ class FlashCard:
         """
         if self.review_count == 0:
             return 0
-        return (self.correct_count / self.review_count) * 100
\ No newline at end of file
+        return (self.correct_count / self.review_count) * 100
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a card from a dictionary with "front" and "back" keys and the optional other keys written by to_dict.
+        A card without an "id" gets a new id.
+        """
+        return cls(
+            data["front"],
+            data["back"],
+            data.get("review_count", 0),
+            data.get("correct_count", 0),
+            data.get("id"),
+            data.get("ease"),
+            data.get("interval", 0),
+            data.get("repetitions", 0),
+            data.get("due", 0),
+            data.get("edited", 0),
+        )
+
+    def record(self):
+        """
+        Return the values of the CARD_FIELDS of the card as a tuple.
+        """
+        return tuple(getattr(self, field) for field in CARD_FIELDS)
+
+    def to_dict(self):
+        """
+        Convert the card to a dictionary with "id", "front", "back", "review_count" and "correct_count" keys,
+        the "ease", "interval", "repetitions" and "due" scheduling keys and the "edited" time of its texts.
+        """
+        return {field: getattr(self, field) for field in CARD_FIELDS}
@@ -1,69 +1,287 @@
-from .flashcard import FlashCard
+import time
+import uuid
+
+from .flashcard import CARD_FIELDS, FlashCard
+from .card_store import CardList, CompactCardStore
+from .scheduler import DueQueue
+from .sync import content_hash
+
+
+def new_deck_id():
+    """
+    Return a new unique deck id.
+    """
+    return uuid.uuid4().hex
+
 
 class FlashCardSet:
-    def __init__(self, title):
+    def __init__(self, title, compact=False, deck_id=None):
+        """
+        Create an empty set with the given title. With compact=True the cards are kept in a CompactCardStore
+        (typed arrays and a shared string table) instead of a list of FlashCard objects, which uses a fraction of
+        the memory for very large decks. Both storages index the cards by their id.
+        """
+        self.id = deck_id or new_deck_id()
         self.title = title
-        self.cards = []
+        # Time of the last rename, 0 if the set was not renamed since it was created. It decides which title wins
+        # when copies of the set are merged, see cards.sync.
+        self.title_edited = 0
+        self.cards = CompactCardStore(deck=self) if compact else CardList(deck=self)
+        # Running totals over all cards, kept up to date on every review, add and delete
+        self.total_reviews = 0
+        self.total_correct = 0
+        # The FlashCardLibrary the set belongs to, if any
+        self.library = None
+        # Index of the cards by due time, built on the first call of due_cards
+        self._due_queue = None
+        # Incremented on every change of the set or one of its cards
+        self.version = 0
+        # Device whose reviews the card totals count directly (the device of the library), and the counts other
+        # devices contributed to the cards, for the cards that have any: card id -> {device id: (reviews, correct)}.
+        # See cards.sync.
+        self.device_id = None
+        self.remote_counts = {}
+        # Content hash written with the set, for a set read from a deck file, and the hashes of the copies of the
+        # set that were already merged into it
+        self.source_hash = None
+        self.merged_hashes = set()
+        # ((version, device id), hash) of the last content hash computed, see cards.sync.content_hash
+        self._content_hash = None
+
+    @property
+    def compact(self):
+        """
+        Return True if the set uses compact array-backed card storage.
+        """
+        return isinstance(self.cards, CompactCardStore)
+
+    def _record_review(self, reviews, correct):
+        """
+        Apply a change of the review and correct counts to the running totals of the set and its library.
+        """
+        self.total_reviews += reviews
+        self.total_correct += correct
+        if self.library is not None:
+            self.library._record_review(reviews, correct)
+
+    def _changed(self, card_id=None, removed=False):
+        """
+        Bump the version of the set and report the change to the library's listeners. card_id is the id of the
+        changed card, or None if the set itself changed.
+        """
+        self.version += 1
+        if self.library is not None:
+            self.library._set_changed(self, card_id, removed)
+
+    def _card_added(self, card):
+        """
+        Called by the card storage when a card was added.
+        """
+        if card.review_count or card.correct_count:
+            self._record_review(card.review_count, card.correct_count)
+        if self._due_queue is not None:
+            self._due_queue.push(card)
+        self._changed(card.id)
+
+    def _card_removed(self, card):
+        """
+        Called by the card storage when a card was removed. Its due queue entries are dropped lazily.
+        """
+        if card.review_count or card.correct_count:
+            self._record_review(-card.review_count, -card.correct_count)
+        self.remote_counts.pop(card.id, None)
+        self._changed(card.id, removed=True)
+
+    def _card_reviewed(self, card, correct):
+        """
+        Called by a card of the set after it was marked as correct or incorrect and rescheduled.
+        """
+        self._record_review(1, 1 if correct else 0)
+        if self._due_queue is not None:
+            self._due_queue.push(card)
+        self._changed(card.id)
 
     def add_card(self, front, back):
         """
-        Add a card to the set with the given front and back text.
+        Add a card to the set with the given front and back text. Returns the new card.
         """
-        self.cards.append(FlashCard(front, back))
+        card = FlashCard(front, back)
+        self.cards.append(card)
+        return self.cards.get(card.id)
 
-    def edit_card(self, index, new_front, new_back):
+    def append_card_data(self, card_data):
         """
-        Edit a card in the set by its index.
+        Add a card from a dictionary in the format written by to_dict, including the counts of other devices.
         """
-        self.cards[index].front = new_front
-        self.cards[index].back = new_back
+        card = FlashCard.from_dict(card_data)
+        counts = card_data.get("counters")
+        # A card whose id is taken gets a new id, and its counts stay with the card it was exported as
+        if counts and not self.cards.has(card.id):
+            self.remote_counts[card.id] = {device: tuple(values) for device, values in counts.items()}
+        self.cards.append(card)
 
-    def delete_card(self, index):
+    def own_counts(self, card_id, review_count, correct_count):
         """
-        Delete a card from the set by its index.
+        Return the part of a card's review and correct totals that was counted on the set's own device, i.e. the
+        totals minus the counts of the other devices.
         """
-        self.cards.pop(index)
+        remote = self.remote_counts.get(card_id)
+        if remote:
+            review_count -= sum(counts[0] for counts in remote.values())
+            correct_count -= sum(counts[1] for counts in remote.values())
+        return review_count, correct_count
+
+    def set_device(self, device_id):
+        """
+        Count the reviews of the set's own device as reviews of device_id from now on. The reviews counted for the
+        previous device are moved to remote_counts, unless the set had no device yet (a new set, or one read from a
+        file written before devices were tracked).
+        """
+        previous, self.device_id = self.device_id, device_id
+        if previous is None or previous == device_id:
+            return
+        remote_counts = self.remote_counts
+        for record in self.cards.records():
+            card_id = record[0]
+            remote = remote_counts.get(card_id)
+            if remote is None:
+                # Most cards were only reviewed on the previous device
+                if record[3] or record[4]:
+                    remote_counts[card_id] = {previous: (record[3], record[4])}
+                continue
+            counts = self.own_counts(card_id, record[3], record[4])
+            if counts != (0, 0):
+                remote[previous] = counts
+            # What the new device contributed is now counted directly
+            remote.pop(device_id, None)
+            if not remote:
+                del remote_counts[card_id]
+
+    def merge_card(self, record, remote):
+        """
+        Set the card with the id of the given record (see FlashCard.record) to the record, adding it if the set has
+        no such card, with remote as the counts of the other devices. Used by cards.sync to apply a merge.
+        """
+        card_id = record[0]
+        if remote:
+            self.remote_counts[card_id] = remote
+        else:
+            self.remote_counts.pop(card_id, None)
+        if not self.cards.has(card_id):
+            self.cards.append(FlashCard.from_dict(dict(zip(CARD_FIELDS, record))))
+            return
+        card = self.cards.get(card_id)
+        self._record_review(record[3] - card.review_count, record[4] - card.correct_count)
+        for field, value in zip(CARD_FIELDS[1:], record[1:]):
+            setattr(card, field, value)
+        if self._due_queue is not None:
+            self._due_queue.push(card)
+        self._changed(card_id)
+
+    def get_card(self, card_id):
+        """
+        Return the card with the given id.
+        """
+        return self.cards.get(card_id)
+
+    def edit_card(self, card_id, new_front, new_back, now=None):
+        """
+        Edit the card with the given id. now is the time of the edit and defaults to the current time.
+        """
+        card = self.cards.get(card_id)
+        card.front = new_front
+        card.back = new_back
+        card.edited = time.time() if now is None else now
+        self._changed(card_id)
+
+    def rename(self, new_title, now=None):
+        """
+        Change the title of the set. now is the time of the change and defaults to the current time.
+        """
+        self.title = new_title
+        self.title_edited = time.time() if now is None else now
+        self._changed()
+
+    def delete_card(self, card_id):
+        """
+        Delete the card with the given id.
+        """
+        self.cards.discard(card_id)
+
+    def delete_cards(self, card_ids):
+        """
+        Delete all cards with the given ids, compacting the storage in a single pass.
+        """
+        for card_id in card_ids:
+            self.cards.discard(card_id)
+        self.cards.compact()
+
+    def due_cards(self, limit, now=None):
+        """
+        Return up to limit cards that are due for review, most overdue first. Cards that were never reviewed are
+        always due. The first call builds the due queue in O(n), later calls take O(k log n) for k cards.
+        """
+        if self._due_queue is None:
+            self._due_queue = DueQueue(self.cards)
+        return self._due_queue.most_due(limit, now)
 
     def to_dict(self):
         """
-        Convert the FlashCardSet instance to a dictionary. The dictionary will have a "title" key with the title of
-        the set, and a "cards" key with a list of dictionaries representing the cards in the set. Each card
-        dictionary will have a "front" key with the front of the card, a "back" key with the back of the card,
-        and "review_count" and "correct_count" keys with the review and correct counts for the card.
+        Convert the FlashCardSet instance to a dictionary. The dictionary will have an "id" key with the id of the
+        set, a "title" key with the title of the set, and a "cards" key with a list of dictionaries representing the
+        cards in the set. Each card dictionary will have an "id" key with the id of the card, a "front" key with the
+        front of the card, a "back" key with the back of the card, "review_count" and "correct_count" keys with
+        the review and correct counts for the card, and "ease", "interval", "repetitions" and "due" keys with the
+        spaced-repetition state of the card, and an "edited" key with the time its texts were last edited. Cards that
+        other devices reviewed have a "counters" key with their counts per device, and the set has a "title_edited"
+        key with the time it was last renamed, a "device" key with its own device and a "hash" key with its content
+        hash (see cards.sync).
         """
+        cards = []
+        for record in self.cards.records():
+            card_data = dict(zip(CARD_FIELDS, record))
+            remote = self.remote_counts.get(record[0])
+            if remote:
+                card_data["counters"] = dict(remote)
+            cards.append(card_data)
         return {
+            "id": self.id,
             "title": self.title,
-            "cards": [{"front": card.front, "back": card.back, "review_count": card.review_count, "correct_count": card.correct_count} for card in self.cards],
+            "title_edited": self.title_edited,
+            "device": self.device_id,
+            "cards": cards,
+            "hash": content_hash(self),
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, compact=False):
         """
         Create a FlashCardSet instance from a dictionary. The dictionary should have a "title" key with the title of
         the set, and a "cards" key with a list of dictionaries representing the cards in the set. Each card
         dictionary should have a "front" key with the front of the card, a "back" key with the back of the card,
-        and optional "review_count" and "correct_count" keys with the review and correct counts for the card.
+        and optional "review_count" and "correct_count" keys with the review and correct counts for the card, as
+        well as the optional scheduling keys written by to_dict. Decks and cards keep their "id" if the dictionaries
+        have one, otherwise they get a new id. The optional "title_edited", "device", "hash" and "counters" keys
+        written by to_dict are kept for merging the set.
         """
-        set_instance = cls(data["title"])
+        set_instance = cls(data["title"], compact=compact, deck_id=data.get("id"))
+        set_instance.title_edited = data.get("title_edited", 0)
+        set_instance.device_id = data.get("device")
+        set_instance.source_hash = data.get("hash")
         for card_data in data["cards"]:
-            card = FlashCard(card_data["front"], card_data["back"])
-            card.review_count = card_data.get("review_count", 0)
-            card.correct_count = card_data.get("correct_count", 0)
-            set_instance.cards.append(card)
+            set_instance.append_card_data(card_data)
         return set_instance
 
     def total_score(self):
         """
-        Calculate the total score for the set, which is the sum of the correct counts for all cards.
+        Return the total score for the set, which is the sum of the correct counts for all cards.
         """
-        return sum(card.correct_count for card in self.cards)
+        return self.total_correct
 
     def success_rate(self):
         """
-        Calculate the success rate for the set, which is the total correct count divided by the total review count.
+        Return the success rate for the set, which is the total correct count divided by the total review count.
         """
-        total_reviews = sum(card.review_count for card in self.cards)
-        total_correct = sum(card.correct_count for card in self.cards)
-        if total_reviews == 0:
+        if self.total_reviews == 0:
             return 0
-        return (total_correct / total_reviews) * 100
\ No newline at end of file
+        return (self.total_correct / self.total_reviews) * 100
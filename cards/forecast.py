@@ -0,0 +1,268 @@
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for forecasting
+    np = None
+
+from .scheduler import DAY, scheduler
+
+
+class WorkloadForecast:
+    """
+    The result of forecast_workload: the expected number of reviews per deck and day.
+
+    Attributes:
+        deck_ids (list): The ids of the forecast decks, in library order.
+        deck_titles (list): The titles of the forecast decks.
+        start (float): Timestamp of the start of the first forecast day.
+        daily_due (numpy.ndarray): Array of shape (number of decks, number of days); daily_due[i, d] is the number of
+            reviews of deck i on day d.
+    """
+
+    def __init__(self, deck_ids, deck_titles, start, daily_due):
+        self.deck_ids = deck_ids
+        self.deck_titles = deck_titles
+        self.start = start
+        self.daily_due = daily_due
+        self._positions = {deck_id: position for position, deck_id in enumerate(deck_ids)}
+
+    @property
+    def days(self):
+        return self.daily_due.shape[1]
+
+    def total_per_day(self):
+        """
+        Return the number of reviews over all decks for every day.
+        """
+        return self.daily_due.sum(axis=0)
+
+    def for_deck(self, deck_id):
+        """
+        Return the number of reviews of the deck with the given id for every day.
+        """
+        return self.daily_due[self._positions[deck_id]]
+
+    def total(self, days=None, deck_id=None):
+        """
+        Return the number of reviews in the first days of the forecast, for one deck or for all decks.
+        """
+        counts = self.total_per_day() if deck_id is None else self.for_deck(deck_id)
+        return int(counts[:days].sum())
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Forecasting the review workload requires numpy. Run `pip install numpy` to install it.")
+
+
+def collect_review_state(flashcard_sets):
+    """
+    Gather the scheduling state of every card of the given sets into flat NumPy arrays. Returns a dictionary with
+    the "due", "interval", "ease", "repetitions", "review_count" and "correct_count" arrays and a "deck" array
+    holding the position of each card's set. Cards are grouped by set, in set order.
+    """
+    require_numpy()
+    fields = ("due", "interval", "ease", "repetitions", "review_count", "correct_count")
+    parts = {field: [] for field in fields}
+    deck_parts = []
+    for position, flashcard_set in enumerate(flashcard_sets):
+        for field in fields:
+            parts[field].append(np.asarray(flashcard_set.cards.column(field), dtype=np.float64))
+        deck_parts.append(np.full(len(flashcard_set.cards), position, dtype=np.int64))
+    state = {
+        field: np.concatenate(columns) if columns else np.empty(0, dtype=np.float64)
+        for field, columns in parts.items()
+    }
+    state["deck"] = np.concatenate(deck_parts) if deck_parts else np.empty(0, dtype=np.int64)
+    return state
+
+
+def forecast_workload(flashcard_sets, days=90, new_cards_per_day=20, retention=0.9, now=None, seed=0):
+    """
+    Simulate the reviews of the coming days for all cards of the given sets and return a WorkloadForecast.
+
+    The simulation runs on NumPy arrays for all cards at once and mirrors SM2Scheduler: each day, the cards due
+    that day are reviewed, pass with a probability estimated from their own history (falling back to the given
+    retention for cards without reviews) and are rescheduled. Overdue cards count towards the first day. Cards
+    that were never reviewed are introduced at new_cards_per_day per deck, in deck order; None introduces all of
+    them on the first day. Changing new_cards_per_day shows the effect of a different new-card limit.
+    """
+    require_numpy()
+    now = time.time() if now is None else now
+    flashcard_sets = list(flashcard_sets)
+    state = collect_review_state(flashcard_sets)
+    start = day_start(now)
+    daily_due = simulate_workload(state, len(flashcard_sets), start, days, new_cards_per_day, retention, seed)
+    return WorkloadForecast(
+        [flashcard_set.id for flashcard_set in flashcard_sets],
+        [flashcard_set.title for flashcard_set in flashcard_sets],
+        start,
+        daily_due,
+    )
+
+
+def day_start(now):
+    """
+    Return the timestamp of the start of the forecast day containing now.
+    """
+    return now - (now % DAY)
+
+
+def simulate_workload(state, deck_count, start, days=90, new_cards_per_day=20, retention=0.9, seed=0):
+    """
+    Run the simulation of forecast_workload on review state collected by collect_review_state and return the
+    daily_due array of shape (deck_count, days). Only reads and copies the arrays of state, so it can run on a
+    worker thread.
+    """
+    rng = np.random.default_rng(seed)
+
+    reviews, correct = state["review_count"], state["correct_count"]
+    ease = state["ease"].copy()
+    interval = state["interval"].copy()
+    repetitions = state["repetitions"].copy()
+    deck = state["deck"]
+
+    # Pass probability per card: its success ratio, smoothed towards the retention for cards with few reviews
+    prior_weight = 2.0
+    pass_probability = (correct + retention * prior_weight) / (reviews + prior_weight)
+
+    due_day = np.maximum(np.floor((state["due"] - start) / DAY), 0).astype(np.int64)
+    new = np.flatnonzero((state["due"] == 0) & (reviews == 0))
+    if new_cards_per_day is not None:
+        # Rank of every new card within its deck; the cards are grouped by deck, so deck[new] is sorted
+        new_decks = deck[new]
+        rank = np.arange(len(new)) - np.searchsorted(new_decks, new_decks, side="left")
+        due_day[new] = rank // new_cards_per_day if new_cards_per_day > 0 else days
+
+    daily_due = np.zeros((deck_count, days), dtype=np.int64)
+    for day in range(days):
+        cards = np.flatnonzero(due_day == day)
+        if not len(cards):
+            continue
+        daily_due[:, day] = np.bincount(deck[cards], minlength=deck_count)
+
+        passed = rng.random(len(cards)) < pass_probability[cards]
+        card_reps = np.where(passed, repetitions[cards] + 1, 0)
+        lapsed = ~passed & (repetitions[cards] > 0)
+        ease[cards[lapsed]] = np.maximum(
+            scheduler.minimum_ease, ease[cards[lapsed]] - 0.54
+        )
+        card_interval = np.where(
+            card_reps == 1, 1, np.where(card_reps == 2, 6, np.round(interval[cards] * ease[cards]))
+        )
+        card_interval[~passed] = 0
+        repetitions[cards] = card_reps
+        interval[cards] = card_interval
+        # Failed cards are relearned the next day
+        due_day[cards] = day + np.maximum(card_interval, 1).astype(np.int64)
+
+    return daily_due
+
+
+class ForecastSnapshot:
+    """
+    Copy of what ForecastCache needs to bring a forecast up to date, taken on the Tk thread.
+
+    Attributes:
+        library_version (int): The version of the library when the snapshot was taken.
+        start (float): Timestamp of the start of the first forecast day.
+        deck_ids (list): The ids of all decks of the library, in library order.
+        deck_titles (list): The titles of all decks.
+        stale (list): (deck id, deck version) of every deck whose cached forecast is missing or out of date.
+        state (dict): The review state of the cards of the stale decks, see collect_review_state.
+    """
+
+    def __init__(self, library_version, start, deck_ids, deck_titles, stale, state):
+        self.library_version = library_version
+        self.start = start
+        self.deck_ids = deck_ids
+        self.deck_titles = deck_titles
+        self.stale = stale
+        self.state = state
+
+
+class ForecastCache:
+    """
+    Workload forecasts of a library, kept per deck and keyed by the deck versions.
+
+    Bringing the forecast up to date takes three steps: snapshot copies the review state of the decks that changed
+    since their forecast was made, on the Tk thread; simulate runs the simulation for those decks only, on any
+    thread; update stores the new rows and assembles the WorkloadForecast of the whole library, on the Tk thread.
+    While the library version and the day stay the same, current returns the assembled forecast without any work.
+    """
+
+    def __init__(self, days=90, new_cards_per_day=20, retention=0.9, seed=0):
+        self.days = days
+        self.new_cards_per_day = new_cards_per_day
+        self.retention = retention
+        self.seed = seed
+        # Deck id -> (deck version, row of daily_due) of every forecast deck
+        self.decks = {}
+        self.start = None
+        # The forecast of the whole library and the library version it was made for
+        self.forecast = None
+        self.library_version = None
+
+    def current(self, library, now=None):
+        """
+        Return the forecast of the library if it is up to date, otherwise None.
+        """
+        now = time.time() if now is None else now
+        if self.library_version == library.version and self.start == day_start(now):
+            return self.forecast
+        return None
+
+    def snapshot(self, library, now=None):
+        """
+        Return a ForecastSnapshot with the review state of the decks whose forecast is out of date.
+        """
+        require_numpy()
+        now = time.time() if now is None else now
+        start = day_start(now)
+        # A new day moves every card, so all rows are out of date
+        known = self.decks if start == self.start else {}
+        stale_sets = []
+        for flashcard_set in library:
+            entry = known.get(flashcard_set.id)
+            if entry is None or entry[0] != flashcard_set.version:
+                stale_sets.append(flashcard_set)
+        return ForecastSnapshot(
+            library.version,
+            start,
+            [flashcard_set.id for flashcard_set in library],
+            [flashcard_set.title for flashcard_set in library],
+            [(flashcard_set.id, flashcard_set.version) for flashcard_set in stale_sets],
+            collect_review_state(stale_sets),
+        )
+
+    def simulate(self, snapshot):
+        """
+        Return the daily_due rows of the stale decks of the snapshot. Does not change the cache.
+        """
+        return simulate_workload(
+            snapshot.state, len(snapshot.stale), snapshot.start, self.days, self.new_cards_per_day,
+            self.retention, self.seed,
+        )
+
+    def update(self, snapshot, daily_due):
+        """
+        Store the rows computed by simulate for the snapshot and return the forecast of the whole library as it
+        was when the snapshot was taken.
+        """
+        if snapshot.start != self.start:
+            self.decks = {}
+            self.start = snapshot.start
+        for (deck_id, version), row in zip(snapshot.stale, daily_due):
+            self.decks[deck_id] = (version, row)
+        # Rows of deleted decks are dropped
+        self.decks = {deck_id: self.decks[deck_id] for deck_id in snapshot.deck_ids}
+        rows = [self.decks[deck_id][1] for deck_id in snapshot.deck_ids]
+        self.forecast = WorkloadForecast(
+            snapshot.deck_ids,
+            snapshot.deck_titles,
+            snapshot.start,
+            np.stack(rows) if rows else np.zeros((0, self.days), dtype=np.int64),
+        )
+        self.library_version = snapshot.library_version
+        return self.forecast
@@ -0,0 +1,148 @@
+import uuid
+from collections.abc import MutableSequence
+
+from .flashcard_set import new_deck_id
+
+
+def new_device_id():
+    """
+    Return a new unique device id.
+    """
+    return uuid.uuid4().hex
+
+
+class FlashCardLibrary(MutableSequence):
+    """
+    The list of all flashcard sets of the application. It behaves like a list of FlashCardSet objects, indexes
+    the sets by id so they can be looked up and deleted in O(1), and keeps running totals of the review and correct
+    counts over every card of every set, so global statistics are constant-time reads.
+    """
+
+    def __init__(self, flashcard_sets=(), device_id=None):
+        # Id of the device the library is studied on; reviews on other devices are merged in, see cards.sync
+        self.device_id = device_id or new_device_id()
+        self._sets = {}
+        # Sets in order, rebuilt lazily after a deletion or an insertion in the middle
+        self._order = []
+        self.total_reviews = 0
+        self.total_correct = 0
+        # Offset in the review log up to which the card counters are up to date, see ReviewLog.catch_up
+        self.review_log_offset = 0
+        # Incremented on every change of a set or card of the library
+        self.version = 0
+        # Callables called as listener(flashcard_set, card_id, removed) after every change, see _set_changed
+        self.listeners = []
+        self.extend(flashcard_sets)
+
+    def _record_review(self, reviews, correct):
+        """
+        Apply a change of the review and correct counts of one of the sets to the running totals.
+        """
+        self.total_reviews += reviews
+        self.total_correct += correct
+
+    def _set_changed(self, flashcard_set, card_id=None, removed=False):
+        """
+        Bump the library version and inform the listeners that a card of the set (card_id), or the set itself
+        (card_id None), was changed or removed.
+        """
+        self.version += 1
+        for listener in self.listeners:
+            listener(flashcard_set, card_id, removed)
+
+    def _attach(self, flashcard_set):
+        if flashcard_set.id in self._sets:
+            flashcard_set.id = new_deck_id()
+        flashcard_set.library = self
+        flashcard_set.set_device(self.device_id)
+        self._record_review(flashcard_set.total_reviews, flashcard_set.total_correct)
+        self._set_changed(flashcard_set)
+
+    def _detach(self, flashcard_set):
+        flashcard_set.library = None
+        self._record_review(-flashcard_set.total_reviews, -flashcard_set.total_correct)
+        self._set_changed(flashcard_set, removed=True)
+
+    def _ordered(self):
+        if self._order is None:
+            self._order = list(self._sets.values())
+        return self._order
+
+    def __len__(self):
+        return len(self._sets)
+
+    def __iter__(self):
+        return iter(self._ordered())
+
+    def __contains__(self, flashcard_set):
+        return self._sets.get(getattr(flashcard_set, "id", None)) is flashcard_set
+
+    def __getitem__(self, index):
+        return self._ordered()[index]
+
+    def __setitem__(self, index, flashcard_set):
+        order = list(self._ordered())
+        replaced = order[index] if isinstance(index, slice) else [order[index]]
+        for old_set in replaced:
+            del self._sets[old_set.id]
+            self._detach(old_set)
+        new_sets = list(flashcard_set) if isinstance(index, slice) else [flashcard_set]
+        for new_set in new_sets:
+            self._attach(new_set)
+            self._sets[new_set.id] = new_set
+        order[index] = new_sets if isinstance(index, slice) else flashcard_set
+        self._sets = {existing.id: existing for existing in order}
+        self._order = order
+
+    def __delitem__(self, index):
+        removed = self._ordered()[index]
+        for flashcard_set in (removed if isinstance(index, slice) else [removed]):
+            self.delete(flashcard_set.id)
+
+    def insert(self, index, flashcard_set):
+        self._attach(flashcard_set)
+        if index < 0:
+            index = max(index + len(self), 0)
+        if index >= len(self):
+            self._sets[flashcard_set.id] = flashcard_set
+            if self._order is not None:
+                self._order.append(flashcard_set)
+        else:
+            order = list(self._ordered())
+            order.insert(index, flashcard_set)
+            self._sets = {existing.id: existing for existing in order}
+            self._order = order
+
+    def get(self, deck_id):
+        """
+        Return the set with the given id.
+        """
+        return self._sets[deck_id]
+
+    def delete(self, deck_id):
+        """
+        Delete the set with the given id and return it.
+        """
+        flashcard_set = self._sets.pop(deck_id)
+        self._order = None
+        self._detach(flashcard_set)
+        return flashcard_set
+
+    def remove(self, flashcard_set):
+        if flashcard_set not in self:
+            raise ValueError("flashcard set is not in the library")
+        self.delete(flashcard_set.id)
+
+    def total_score(self):
+        """
+        Return the total score over all sets, which is the sum of the correct counts for all cards.
+        """
+        return self.total_correct
+
+    def success_rate(self):
+        """
+        Return the success rate over all sets, which is the total correct count divided by the total review count.
+        """
+        if self.total_reviews == 0:
+            return 0
+        return (self.total_correct / self.total_reviews) * 100
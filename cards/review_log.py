@@ -0,0 +1,133 @@
+import os
+import time
+from collections import namedtuple
+from itertools import chain
+from struct import Struct
+
+# One review: card id, timestamp, outcome (1 = correct, 0 = incorrect) and response time in milliseconds
+RECORD = Struct("<qdBI")
+MAX_RESPONSE_MS = 2 ** 32 - 1
+
+ReviewEvent = namedtuple("ReviewEvent", ["card_id", "timestamp", "correct", "response_time"])
+
+
+class ReviewLog:
+    """
+    Append-only log of every review, stored as fixed-size binary records of 21 bytes. Recording an event only
+    packs it into an in-memory buffer; the buffer is written to disk in one append once flush_every events have
+    accumulated, or when flush() is called (the GUI does so periodically and on exit).
+
+    The review counters and scheduling state of the cards are a cache derived from this log. The library
+    remembers the log offset up to which its cards are up to date (FlashCardLibrary.review_log_offset), and
+    catch_up() replays only the events after that offset, e.g. after restoring a saved library on startup.
+    """
+
+    def __init__(self, path, flush_every=256):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer = bytearray()
+        self._file_size = self._repair()
+
+    def _repair(self):
+        """
+        Drop a partially written record at the end of the file, left behind by a crash during a flush. Returns the
+        size of the file.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+        complete = size - size % RECORD.size
+        if complete != size:
+            with open(self.path, "r+b") as file:
+                file.truncate(complete)
+        return complete
+
+    @property
+    def end_offset(self):
+        """
+        Return the offset just behind the last recorded event, including events not flushed yet.
+        """
+        return self._file_size + len(self._buffer)
+
+    def record(self, card_id, correct, response_time=0.0, timestamp=None):
+        """
+        Append a review event. response_time is in seconds.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        response_ms = min(max(int(response_time * 1000), 0), MAX_RESPONSE_MS)
+        self._buffer += RECORD.pack(card_id, timestamp, 1 if correct else 0, response_ms)
+        if len(self._buffer) >= self.flush_every * RECORD.size:
+            self.flush()
+
+    def record_review(self, card, correct, response_time=0.0, library=None):
+        """
+        Record a review of the card and apply it to the card's counters and schedule. If the card's library is
+        given, its review log offset is advanced, since its counters now include the event.
+        """
+        timestamp = time.time()
+        self.record(card.id, correct, response_time, timestamp)
+        if correct:
+            card.mark_correct(timestamp)
+        else:
+            card.mark_incorrect(timestamp)
+        if library is not None:
+            library.review_log_offset = self.end_offset
+
+    def flush(self):
+        """
+        Write all buffered events to the end of the log file.
+        """
+        if not self._buffer:
+            return
+        with open(self.path, "ab") as file:
+            file.write(self._buffer)
+        self._file_size += len(self._buffer)
+        self._buffer.clear()
+
+    def events(self, start=0, chunk_size=RECORD.size * 4096):
+        """
+        Yield the events from the given offset on, reading the file in chunks.
+        """
+        self.flush()
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(start)
+            while True:
+                chunk = file.read(chunk_size)
+                chunk = chunk[:len(chunk) - len(chunk) % RECORD.size]
+                if not chunk:
+                    return
+                for card_id, timestamp, correct, response_ms in RECORD.iter_unpack(chunk):
+                    yield ReviewEvent(card_id, timestamp, bool(correct), response_ms / 1000)
+
+    def catch_up(self, library):
+        """
+        Apply all events after the library's review log offset to the cards of the library and advance the offset.
+        Events of cards that are not in the library are skipped. Returns the number of applied events.
+        """
+        applied = 0
+        events = self.events(library.review_log_offset)
+        first = next(events, None)
+        if first is None:
+            library.review_log_offset = self.end_offset
+            return applied
+        # One pass over the cards instead of a search through every deck per event
+        decks = {
+            card_id: flashcard_set for flashcard_set in library for card_id in flashcard_set.cards.column("id")
+        }
+        for event in chain([first], events):
+            flashcard_set = decks.get(event.card_id)
+            if flashcard_set is None:
+                continue
+            card = flashcard_set.cards.get(event.card_id)
+            if event.correct:
+                card.mark_correct(event.timestamp)
+            else:
+                card.mark_incorrect(event.timestamp)
+            applied += 1
+        library.review_log_offset = self.end_offset
+        return applied
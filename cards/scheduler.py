@@ -0,0 +1,107 @@
+import heapq
+import time
+
+DAY = 24 * 60 * 60
+
+
+class SM2Scheduler:
+    """
+    Spaced-repetition scheduler based on the SuperMemo SM-2 algorithm. Every card carries an ease factor, an
+    interval in days, the number of consecutive successful repetitions and the timestamp at which it is due.
+    Cards that were never reviewed have a due time of 0 and are therefore always due.
+
+    The app only knows whether an answer was right or wrong, so a correct answer is graded with quality 4 (the
+    ease factor stays the same) and an incorrect answer with quality 1.
+    """
+    CORRECT_QUALITY = 4
+    INCORRECT_QUALITY = 1
+
+    def __init__(self, initial_ease=2.5, minimum_ease=1.3, relearn_delay=10 * 60):
+        self.initial_ease = initial_ease
+        self.minimum_ease = minimum_ease
+        # Seconds until a card that was answered incorrectly is shown again
+        self.relearn_delay = relearn_delay
+
+    def _adjusted_ease(self, ease, quality):
+        ease += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        return max(self.minimum_ease, ease)
+
+    def review(self, card, correct, now=None):
+        """
+        Update the scheduling state of the card after it was answered correctly or incorrectly.
+        """
+        now = time.time() if now is None else now
+        if correct:
+            card.ease = self._adjusted_ease(card.ease, self.CORRECT_QUALITY)
+            card.repetitions += 1
+            if card.repetitions == 1:
+                card.interval = 1
+            elif card.repetitions == 2:
+                card.interval = 6
+            else:
+                card.interval = round(card.interval * card.ease)
+            card.due = now + card.interval * DAY
+        else:
+            # Only a lapse of a learned card lowers the ease, repeated wrong attempts at a new card do not
+            if card.repetitions:
+                card.ease = self._adjusted_ease(card.ease, self.INCORRECT_QUALITY)
+            card.repetitions = 0
+            card.interval = 0
+            card.due = now + self.relearn_delay
+
+
+# The scheduler used by FlashCard.mark_correct and FlashCard.mark_incorrect
+scheduler = SM2Scheduler()
+
+
+class DueQueue:
+    """
+    Priority queue of the cards of one FlashCardSet ordered by due time, so the k most due cards can be taken in
+    O(k log n) without looking at the other cards.
+
+    The queue holds (due, card id) entries. Rescheduling a card pushes a new entry instead of updating the old one;
+    entries that no longer match the card's due time, or whose card was deleted, are skipped and dropped when they
+    reach the top. The heap is rebuilt from the cards once stale entries make up more than half of it.
+    """
+
+    def __init__(self, cards):
+        self._cards = cards
+        self._heap = []
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuild the heap from the current cards in O(n).
+        """
+        self._heap = [(card.due, card.id) for card in self._cards]
+        heapq.heapify(self._heap)
+
+    def push(self, card):
+        """
+        Add a new entry for a card that was added or rescheduled.
+        """
+        heapq.heappush(self._heap, (card.due, card.id))
+        if len(self._heap) > 2 * len(self._cards) + 64:
+            self.rebuild()
+
+    def _is_current(self, entry):
+        due, card_id = entry
+        return self._cards.has(card_id) and self._cards.get(card_id).due == due
+
+    def most_due(self, limit, now=None):
+        """
+        Return up to limit cards that are due at the given time, most overdue first.
+        """
+        now = time.time() if now is None else now
+        heap = self._heap
+        taken = []
+        seen = set()
+        while heap and len(taken) < limit and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if entry[1] not in seen and self._is_current(entry):
+                seen.add(entry[1])
+                taken.append(entry)
+        # The cards stay queued until they are actually reviewed and rescheduled
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [self._cards.get(card_id) for _, card_id in taken]
@@ -0,0 +1,188 @@
+"""
+Conflict-free merging of decks that were studied on several devices.
+
+Every library has a device id (see FlashCardLibrary.device_id). The review and correct counts of a card are a
+grow-only counter (G-counter) per device: FlashCardSet.remote_counts holds the counts the other devices contributed
+to a card, only for the cards that have any, and whatever the card's totals exceed them by was counted on the deck's
+own device. Merging two copies of a card keeps the larger count of every device, so merging is deterministic,
+commutative and idempotent: importing the same files in any order, or the same file twice, gives the same totals.
+
+The texts of a card and the title of a deck are last-writer-wins registers: every edit stores its time
+(FlashCard.edited, FlashCardSet.title_edited) and the copy edited last wins. The scheduling state of a card is a
+register decided by the review totals: the copy with more reviews saw the later reviews. On a tie the local copy is
+kept, so restoring an old backup never reverts an edit or a review. Merging never deletes cards; a card deleted on
+one device comes back when a copy of its deck that still has it is merged.
+
+Deck files carry a content hash of every deck. A copy of a deck whose hash equals the hash of the local deck (an
+export of this device that did not change since) or of a copy merged before is skipped without looking at its
+cards, and merging a changed deck only changes, and writes to the database, the cards that actually changed.
+"""
+import json
+from hashlib import blake2b
+
+from .flashcard import CARD_FIELDS
+
+# Device of the counts read from deck files written before devices were tracked
+UNKNOWN_DEVICE = ""
+# Size of the content hash of a deck in bytes
+DIGEST_SIZE = 16
+# Positions of the scheduling state and of the edit time in a card record (see FlashCard.record)
+SCHEDULE = slice(CARD_FIELDS.index("ease"), CARD_FIELDS.index("due") + 1)
+EDITED = CARD_FIELDS.index("edited")
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+# Cards are hashed as they are written to deck files, see utils.deck_io
+_encode_card = json.JSONEncoder().encode
+
+
+def device_counts(flashcard_set, card_id, review_count, correct_count):
+    """
+    Return the counts of a card of the set per device, as a dictionary device id -> (reviews, correct).
+    """
+    remote = flashcard_set.remote_counts.get(card_id)
+    counts = dict(remote) if remote else {}
+    own = flashcard_set.own_counts(card_id, review_count, correct_count)
+    if own != (0, 0):
+        device = flashcard_set.device_id
+        counts[UNKNOWN_DEVICE if device is None else device] = own
+    return counts
+
+
+def merge_counts(counts, other_counts):
+    """
+    Return the per-device maximum of two dictionaries of counts.
+    """
+    merged = dict(counts)
+    for device, (reviews, correct) in other_counts.items():
+        current = merged.get(device)
+        if current is None:
+            merged[device] = (reviews, correct)
+        elif reviews > current[0] or correct > current[1]:
+            merged[device] = (max(reviews, current[0]), max(correct, current[1]))
+    return merged
+
+
+def _unattributed_counts(counts, review_count, correct_count):
+    """
+    Return the counts of a card read from a file without devices, given the counts of the local copy. Its totals
+    are only known to include the local ones, so they are merged as a lower bound: whatever the local devices do not
+    account for is counted for UNKNOWN_DEVICE.
+    """
+    reviews = review_count - sum(values[0] for device, values in counts.items() if device != UNKNOWN_DEVICE)
+    correct = correct_count - sum(values[1] for device, values in counts.items() if device != UNKNOWN_DEVICE)
+    return {UNKNOWN_DEVICE: (max(reviews, 0), max(correct, 0))} if reviews > 0 or correct > 0 else {}
+
+
+class ContentHasher:
+    """
+    Hash of a deck as it is written to a deck file: its id, title, rename time and device, and the JSON of its cards
+    (see card_json) in card order. The writer feeds it the JSON it writes anyway, so hashing costs little more than
+    a pass of blake2b over the output.
+    """
+
+    def __init__(self, flashcard_set):
+        self.flashcard_set = flashcard_set
+        self.key = (flashcard_set.version, flashcard_set.device_id)
+        header = [flashcard_set.id, flashcard_set.title, flashcard_set.title_edited, flashcard_set.device_id]
+        self._hash = blake2b(_encode(header).encode(), digest_size=DIGEST_SIZE)
+
+    def add(self, encoded_card):
+        """
+        Add the JSON of the next card of the set to the hash.
+        """
+        self._hash.update(b"\n")
+        self._hash.update(encoded_card.encode())
+
+    def hexdigest(self):
+        """
+        Return the hash of the added cards and remember it as the hash of the set's current version.
+        """
+        digest = self._hash.hexdigest()
+        self.flashcard_set._content_hash = (self.key, digest)
+        return digest
+
+
+def card_json(flashcard_set, record, encode=_encode_card):
+    """
+    Return the JSON of a card of the set in a deck file, given its record (see FlashCard.record): its fields and,
+    if other devices reviewed it, their counts under "counters".
+    """
+    card_data = dict(zip(CARD_FIELDS, record))
+    remote = flashcard_set.remote_counts.get(record[0])
+    if remote:
+        card_data["counters"] = remote
+    return encode(card_data)
+
+
+def content_hash(flashcard_set):
+    """
+    Return the content hash of the set, as written to deck files. It is computed once per version of the set.
+    """
+    cached = flashcard_set._content_hash
+    if cached is not None and cached[0] == (flashcard_set.version, flashcard_set.device_id):
+        return cached[1]
+    hasher = ContentHasher(flashcard_set)
+    for record in flashcard_set.cards.records():
+        hasher.add(card_json(flashcard_set, record))
+    return hasher.hexdigest()
+
+
+def merge_deck(flashcard_set, other):
+    """
+    Merge other, a copy of the set read from a deck file, into the set. Returns the number of cards of the set that
+    were added or changed.
+    """
+    if other.source_hash is not None:
+        cached = flashcard_set._content_hash
+        unchanged = cached is not None and cached[0] == (flashcard_set.version, flashcard_set.device_id) and (
+            cached[1] == other.source_hash
+        )
+        if unchanged or other.source_hash in flashcard_set.merged_hashes:
+            return 0
+    device = flashcard_set.device_id
+    cards = flashcard_set.cards
+    if other.title_edited > flashcard_set.title_edited:
+        flashcard_set.rename(other.title, other.title_edited)
+    changed = 0
+    for record in other.cards.records():
+        card_id = record[0]
+        if other.device_id is None:
+            if cards.has(card_id):
+                local = cards.get(card_id).record()
+                counts = device_counts(flashcard_set, card_id, local[3], local[4])
+                other_counts = _unattributed_counts(counts, record[3], record[4])
+            else:
+                # A new card from a file without devices counts as reviewed here, as imports always did
+                local, counts, other_counts = None, {}, {device: (record[3], record[4])}
+        else:
+            local = cards.get(card_id).record() if cards.has(card_id) else None
+            counts = {} if local is None else device_counts(flashcard_set, card_id, local[3], local[4])
+            other_counts = device_counts(other, card_id, record[3], record[4])
+        merged = merge_counts(counts, other_counts)
+        texts = record if local is None or record[EDITED] > local[EDITED] else local
+        schedule = record if local is None or record[3] > local[3] else local
+        if texts is local and schedule is local and merged == counts:
+            continue
+        remote = {other_device: values for other_device, values in merged.items() if other_device != device}
+        totals = (sum(values[0] for values in merged.values()), sum(values[1] for values in merged.values()))
+        flashcard_set.merge_card((card_id, *texts[1:3], *totals, *schedule[SCHEDULE], texts[EDITED]), remote)
+        changed += 1
+    if other.source_hash is not None:
+        flashcard_set.merged_hashes.add(other.source_hash)
+    return changed
+
+
+def merge_into_library(library, flashcard_set):
+    """
+    Merge a deck read from a deck file into the library: into the deck with the same id if the library has one,
+    otherwise the deck is added. Returns the deck of the library the cards ended up in.
+    """
+    try:
+        existing = library.get(flashcard_set.id)
+    except KeyError:
+        library.append(flashcard_set)
+        if flashcard_set.source_hash is not None:
+            flashcard_set.merged_hashes.add(flashcard_set.source_hash)
+        return flashcard_set
+    merge_deck(existing, flashcard_set)
+    return existing
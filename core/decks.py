@@ -0,0 +1,99 @@
+from cards.flashcard_set import FlashCardSet
+from cards.sync import merge_into_library
+from utils.deck_io import iter_deck_file, write_deck_file
+
+
+class DeckService:
+    """
+    Creating, changing and deleting decks and cards of a library, and importing and exporting deck files,
+    independent of any user interface. The bulk operations work on whole batches, e.g. for scripts and benchmarks.
+    """
+
+    def __init__(self, library):
+        self.library = library
+
+    def create_deck(self, title):
+        """
+        Add a new empty deck with the given title to the library and return it.
+        """
+        if not title:
+            raise ValueError("a deck needs a title")
+        flashcard_set = FlashCardSet(title)
+        self.library.append(flashcard_set)
+        return flashcard_set
+
+    def delete_deck(self, deck_id):
+        """
+        Remove the deck with the given id from the library and return it.
+        """
+        return self.library.delete(deck_id)
+
+    def add_card(self, deck_id, front, back):
+        """
+        Add a card to the deck with the given id and return it, or return None if the front or the back is empty.
+        """
+        if not (front and back):
+            return None
+        return self.library.get(deck_id).add_card(front, back)
+
+    def add_cards(self, deck_id, pairs):
+        """
+        Add a card for every (front, back) pair with both sides filled in and return the number of cards added.
+        """
+        flashcard_set = self.library.get(deck_id)
+        added = 0
+        for front, back in pairs:
+            if front and back:
+                flashcard_set.add_card(front, back)
+                added += 1
+        return added
+
+    def edit_card(self, deck_id, card_id, front, back):
+        """
+        Change the front and back of a card. Returns False, leaving the card unchanged, if either is empty.
+        """
+        if not (front and back):
+            return False
+        self.library.get(deck_id).edit_card(card_id, front, back)
+        return True
+
+    def delete_card(self, deck_id, card_id):
+        self.library.get(deck_id).delete_card(card_id)
+
+    def delete_cards(self, deck_id, card_ids):
+        self.library.get(deck_id).delete_cards(card_ids)
+
+    def iter_import_file(self, path, compact=False, progress=None):
+        """
+        Merge the decks of a deck file into the library as they are read, and yield the deck of the library each one
+        ended up in. A deck whose id is in the library is merged into that deck (see cards.sync), the others are
+        added. Only one deck of the file is held in memory at a time; if the file turns out to be unreadable, the
+        decks before the error stay imported.
+        """
+        for flashcard_set in iter_deck_file(path, compact=compact, progress=progress):
+            yield self.merge_deck(flashcard_set)
+
+    def import_file(self, path, compact=False, progress=None):
+        """
+        Like iter_import_file, but all or nothing: the whole file is read before the first deck is merged, so a file
+        that cannot be read completely imports nothing. Returns the list of the decks of the library the decks of
+        the file ended up in.
+        """
+        imported = list(iter_deck_file(path, compact=compact, progress=progress))
+        return [self.merge_deck(flashcard_set) for flashcard_set in imported]
+
+    def merge_deck(self, flashcard_set):
+        """
+        Merge a deck read from a deck file into the library and return the deck of the library it ended up in.
+        """
+        return merge_into_library(self.library, flashcard_set)
+
+    def export_file(self, path, deck_ids=None, progress=None):
+        """
+        Write the decks with the given ids, or all decks, to a deck file. The format follows from the extension.
+        """
+        if deck_ids is None:
+            flashcard_sets = list(self.library)
+        else:
+            flashcard_sets = [self.library.get(deck_id) for deck_id in deck_ids]
+        write_deck_file(path, flashcard_sets, progress=progress)
@@ -0,0 +1,138 @@
+import random
+import time
+
+# Session modes: study every card of the deck in random order, or only the cards that are due for review
+ALL_CARDS = "all"
+DUE_CARDS = "due"
+
+# Maximum number of cards in a "due cards" session
+DUE_SESSION_LIMIT = 20
+
+
+def normalize_answer(answer):
+    """
+    Return the form of an answer that is compared when checking it: without surrounding whitespace, in lower case.
+    """
+    return answer.strip().lower()
+
+
+class StudySession:
+    """
+    A learning session over the cards of one deck, independent of any user interface.
+
+    The session keeps the order of the cards, the current card and the number of reviewed cards. check_answer
+    compares an answer with the current card and records the review, in the review log if one is given. The
+    GUI's LearningSession shows the session; benchmarks and other headless callers drive it directly.
+
+    The expected answer of a card is normalized ahead of time by prepare: for the current card when it is shown,
+    and for the upcoming card while the user reads the feedback on the current one.
+    """
+
+    def __init__(self, flashcard_set, mode=ALL_CARDS, review_log=None, library=None, limit=DUE_SESSION_LIMIT,
+                 rng=random):
+        self.flashcard_set = flashcard_set
+        self.mode = mode
+        self.review_log = review_log
+        self.library = library
+        self.limit = limit
+        self.rng = rng
+        self.cards = []
+        self.current_index = 0
+        self.reviewed = 0
+        # Monotonic time at which the current card was shown, used to log the response time
+        self.shown_at = 0.0
+        # (card, back, normalized back) of the last card passed to prepare
+        self._prepared = None
+        self.start()
+
+    def start(self):
+        """
+        Start over at the first card. In ALL_CARDS mode the whole deck is shuffled, in DUE_CARDS mode the most due
+        cards are taken from the deck's due queue.
+        """
+        self.current_index = 0
+        self.reviewed = 0
+        if self.mode == DUE_CARDS:
+            self.cards = self.flashcard_set.due_cards(self.limit)
+        else:
+            self.cards = self.flashcard_set.cards.copy()
+            self.rng.shuffle(self.cards)
+
+    @property
+    def finished(self):
+        return self.reviewed >= len(self.cards)
+
+    @property
+    def cards_left(self):
+        return len(self.cards) - self.reviewed
+
+    @property
+    def current_card(self):
+        return self.cards[self.current_index]
+
+    @property
+    def upcoming_card(self):
+        """
+        Return the card next_card will move to, or None if the session is finished after the current card.
+        """
+        if self.reviewed + 1 >= len(self.cards):
+            return None
+        return self.cards[self.current_index + 1 if self.current_index < len(self.cards) - 1 else 0]
+
+    def prepare(self, card):
+        """
+        Normalize the back of the card now, so checking an answer to it only has to normalize the answer.
+        """
+        self._prepared = (card, card.back, normalize_answer(card.back))
+
+    def expected_answer(self, card):
+        """
+        Return the normalized back of the card, prepared ahead of time if the card was the last one prepared.
+        """
+        prepared = self._prepared
+        if prepared is not None and prepared[0] is card and prepared[1] == card.back:
+            return prepared[2]
+        return normalize_answer(card.back)
+
+    def card_shown(self, now=None):
+        """
+        Note that the current card was shown to the user, at the monotonic time now.
+        """
+        self.shown_at = time.monotonic() if now is None else now
+        card = self.current_card
+        if self._prepared is None or self._prepared[0] is not card:
+            self.prepare(card)
+
+    def check_answer(self, answer, now=None):
+        """
+        Check the answer against the back of the current card, record the review and return True if it was
+        correct.
+        """
+        card = self.current_card
+        response_time = (time.monotonic() if now is None else now) - self.shown_at
+        correct = normalize_answer(answer) == self.expected_answer(card)
+        if self.review_log is not None:
+            self.review_log.record_review(card, correct, response_time, self.library)
+        elif correct:
+            card.mark_correct()
+        else:
+            card.mark_incorrect()
+        return correct
+
+    def next_card(self):
+        """
+        Count the current card as reviewed and move to the next one, wrapping around at the end.
+        """
+        self.reviewed += 1
+        if self.current_index < len(self.cards) - 1:
+            self.current_index += 1
+        else:
+            self.current_index = 0
+
+    def prev_card(self):
+        """
+        Move back to the previous card, which counts as not reviewed again.
+        """
+        if self.current_index > 0:
+            self.current_index -= 1
+            self.reviewed = max(0, self.reviewed - 1)
@@ -0,0 +1,93 @@
+import time
+from collections import namedtuple
+
+from cards import forecast
+
+# Number of days covered by the review forecast, and by the "due soon" count of a deck
+FORECAST_DAYS = 90
+DUE_SOON_DAYS = 7
+
+OverallStats = namedtuple("OverallStats", ["total_score", "success_rate"])
+DeckStats = namedtuple("DeckStats", ["deck_id", "title", "card_count", "score", "success_rate", "due_soon"])
+
+
+def card_sort_keys(cards):
+    """
+    Return the keys to sort the cards of a card store by, as lists in card order: "reviews", "correct" and
+    "success_rate" (between 0 and 1). They are read from the store's columns, without creating card objects.
+    """
+    reviews = cards.column("review_count")
+    corrects = cards.column("correct_count")
+    return {
+        "reviews": reviews,
+        "correct": corrects,
+        "success_rate": [correct / review if review else 0 for review, correct in zip(reviews, corrects)],
+    }
+
+
+class StatsService:
+    """
+    Statistics of a library, independent of any user interface.
+
+    The totals are running counts kept by the library and its decks, so they are constant-time reads. The review
+    forecast is kept in a ForecastCache: forecast() brings it up to date in the calling thread, while the GUI
+    splits the same steps between the Tk thread and a worker (forecast_snapshot, simulate_forecast,
+    update_forecast).
+    """
+
+    def __init__(self, library, forecast_days=FORECAST_DAYS):
+        self.library = library
+        self.forecast_cache = forecast.ForecastCache(days=forecast_days)
+
+    @property
+    def forecast_available(self):
+        """
+        Return True if the review forecast can be computed, which needs numpy.
+        """
+        return forecast.np is not None
+
+    def overall(self):
+        return OverallStats(self.library.total_score(), self.library.success_rate())
+
+    def deck_stats(self, flashcard_set, workload=None):
+        """
+        Return the DeckStats of a deck. due_soon is the number of reviews forecast for the next DUE_SOON_DAYS days
+        by the given WorkloadForecast, or None without one.
+        """
+        return DeckStats(
+            flashcard_set.id,
+            flashcard_set.title,
+            len(flashcard_set.cards),
+            flashcard_set.total_score(),
+            flashcard_set.success_rate(),
+            workload.total(DUE_SOON_DAYS, flashcard_set.id) if workload is not None else None,
+        )
+
+    def current_forecast(self, now=None):
+        """
+        Return the cached forecast if the library did not change since it was made, otherwise None.
+        """
+        return self.forecast_cache.current(self.library, now)
+
+    def forecast_snapshot(self, now=None):
+        return self.forecast_cache.snapshot(self.library, now)
+
+    def simulate_forecast(self, snapshot):
+        """
+        Simulate the decks of the snapshot that changed. Safe to call on a worker thread.
+        """
+        return self.forecast_cache.simulate(snapshot)
+
+    def update_forecast(self, snapshot, daily_due):
+        return self.forecast_cache.update(snapshot, daily_due)
+
+    def forecast(self, now=None):
+        """
+        Return the WorkloadForecast of the library, forecasting again only the decks that changed.
+        """
+        now = time.time() if now is None else now
+        workload = self.current_forecast(now)
+        if workload is None:
+            snapshot = self.forecast_snapshot(now)
+            workload = self.update_forecast(snapshot, self.simulate_forecast(snapshot) if snapshot.stale else [])
+        return workload
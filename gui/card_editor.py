@@ -4,6 +4,8 @@ from tkinter import messagebox
 
 import tkinter as tk
 import customtkinter as ctk
+from .virtual_list import VirtualList
+from utils import instrumentation
 
 class CardEditor:
     def __init__(self, app):
@@ -24,24 +26,32 @@ class CardEditor:
             - Pressing the Enter key on the question input field should focus on the answer input field.
             - Pressing the Enter key on the answer input field should call the add_card_from_input method.
         """
-        # Clear the main frame
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
-
+        self.app.screens.show("add_cards", self.build_add_cards_input)
+        self.add_cards_title_label.configure(text=f"Add Cards to {self.app.current_set.title}")
+        self.card_question_entry.delete(0, tk.END)
+        self.card_answer_entry.delete(0, tk.END)
+        self.feedback_label.configure(text="")
+        self.card_question_entry.focus_set()
+
+    def build_add_cards_input(self, screen):
+        """
+        Build the screen for adding cards once; show_add_cards_input updates it.
+        """
         # Create the header frame
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(
+        self.add_cards_title_label = ctk.CTkLabel(
             header_frame,
-            text=f"Add Cards to {self.app.current_set.title}",
+            text="",
             font=("Roboto", 24, "bold"),
             text_color="white",
-        ).pack(pady=20)
+        )
+        self.add_cards_title_label.pack(pady=20)
 
         # Create the input frame
-        input_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        input_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         input_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         # Question Entry
@@ -94,8 +104,7 @@ class CardEditor:
         back = self.card_answer_entry.get()
 
         # Check if both fields (Question & Answer) are filled
-        if front and back:
-            self.app.current_set.add_card(front, back)
+        if self.app.decks.add_card(self.app.current_set.id, front, back) is not None:
             self.card_question_entry.delete(0, tk.END)
             self.card_answer_entry.delete(0, tk.END)
             self.feedback_label.configure(text="Card added successfully!", text_color="green")
@@ -111,76 +120,55 @@ class CardEditor:
         """
         front = self.card_question_entry.get()
         back = self.card_answer_entry.get()
-        if front and back:
-            self.app.current_set.add_card(front, back)
+        self.app.decks.add_card(self.app.current_set.id, front, back)
         self.app.deck_manager.show_deck_manager()
 
-    def edit_set(self, set_index):
+    def edit_set(self, deck_id):
         """
-        Set the current set to the set at the given index and show the edit screen.
+        Set the current set to the set with the given id and show the edit screen.
         """
-        self.app.current_set = self.app.flashcard_sets[set_index]
+        self.app.current_set = self.app.flashcard_sets.get(deck_id)
         self.show_edit_screen()
 
+    @instrumentation.timed("show_edit_screen")
     def show_edit_screen(self):
         """
         Show the edit screen for the current set.
         """
-        # Clear the main frame
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("edit_deck", self.build_edit_screen)
+        self.edit_title_label.configure(text=f"Editing: {self.app.current_set.title}")
+        if self.card_list.items is self.app.current_set.cards:
+            # Back from editing a card of the same deck: keep the scroll position and rebind the visible rows
+            self.card_list.refresh()
+        else:
+            self.card_list.set_items(self.app.current_set.cards)
 
+    def build_edit_screen(self, screen):
+        """
+        Build the edit screen once; show_edit_screen updates it.
+        """
         # Create the header frame
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(
+        self.edit_title_label = ctk.CTkLabel(
             header_frame,
-            text=f"Editing: {self.app.current_set.title}",
+            text="",
             font=("Roboto", 24, "bold"),
             text_color="white",
-        ).pack(pady=20)
-
-        # Make the frame scrollable
-        scroll_frame = ctk.CTkScrollableFrame(self.app.main_frame, fg_color="#F0F0F0")
-        scroll_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
-
-        # Display each card in the set with edit and delete buttons
-        for i, card in enumerate(self.app.current_set.cards):
-            card_frame = ctk.CTkFrame(scroll_frame, fg_color="white", corner_radius=10)
-            card_frame.pack(fill=tk.X, pady=5)
-
-            ctk.CTkLabel(
-                card_frame, text=f"Q: {card.front[:30]}...", font=("Roboto", 14, "bold")
-            ).pack(anchor="w", padx=15, pady=(10, 5))
-            ctk.CTkLabel(
-                card_frame, text=f"A: {card.back[:30]}...", font=("Roboto", 12)
-            ).pack(anchor="w", padx=15, pady=(0, 10))
-
-            button_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-            button_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
-
-            ctk.CTkButton(
-                button_frame,
-                text="Edit",
-                command=lambda x=i: self.show_edit_card_input(x),
-                fg_color="#f39c12",
-                hover_color="#d35400",
-                width=60,
-            ).pack(side=tk.LEFT, padx=(0, 10))
-            ctk.CTkButton(
-                button_frame,
-                text="Delete",
-                command=lambda x=i: self.delete_card(x),
-                fg_color="#e74c3c",
-                hover_color="#c0392b",
-                width=60,
-            ).pack(side=tk.LEFT)
+        )
+        self.edit_title_label.pack(pady=20)
+
+        # Scrollable list with widgets only for the visible cards, each with edit and delete buttons
+        self.card_list = VirtualList(
+            screen, create_row=self.create_card_row, bind_row=self.bind_card_row, background="#F0F0F0"
+        )
+        self.card_list.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
 
         # Add New Card Button
         new_card_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="+ Add New Card",
             command=self.show_add_cards_input,
             fg_color="#2ecc71",
@@ -192,7 +180,7 @@ class CardEditor:
 
         # Delete Deck Button
         delete_deck_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Delete Deck",
             command=self.delete_current_deck,
             fg_color="#e74c3c",
@@ -204,7 +192,7 @@ class CardEditor:
 
         # Back Button
         back_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Back to Decks",
             command=self.app.deck_manager.show_deck_manager,
             fg_color="#95a5a6",
@@ -214,30 +202,78 @@ class CardEditor:
         )
         back_button.pack(padx=20, pady=(0, 20), fill=tk.X)
 
-    def show_edit_card_input(self, card_index):
+    def create_card_row(self, parent):
         """
-        Show the input fields to edit the card at the given index.
+        Create a row of the card list. A row is reused for different cards while scrolling; bind_card_row fills it
+        with a card, and its buttons act on the card it currently shows.
         """
-        # Get the card index to edit
-        card = self.app.current_set.cards[card_index]
-        # Clear the main frame
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        card_frame = ctk.CTkFrame(parent, fg_color="white", corner_radius=10)
+        card_frame.card_id = None
+
+        card_frame.front_label = ctk.CTkLabel(card_frame, text="", font=("Roboto", 14, "bold"))
+        card_frame.front_label.pack(anchor="w", padx=15, pady=(10, 5))
+        card_frame.back_label = ctk.CTkLabel(card_frame, text="", font=("Roboto", 12))
+        card_frame.back_label.pack(anchor="w", padx=15, pady=(0, 10))
+
+        button_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
+        button_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
 
+        ctk.CTkButton(
+            button_frame,
+            text="Edit",
+            command=lambda: self.show_edit_card_input(card_frame.card_id),
+            fg_color="#f39c12",
+            hover_color="#d35400",
+            width=60,
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        ctk.CTkButton(
+            button_frame,
+            text="Delete",
+            command=lambda: self.delete_card(card_frame.card_id),
+            fg_color="#e74c3c",
+            hover_color="#c0392b",
+            width=60,
+        ).pack(side=tk.LEFT)
+        return card_frame
+
+    def bind_card_row(self, card_frame, card):
+        """
+        Show a card in a row created by create_card_row.
+        """
+        card_frame.card_id = card.id
+        card_frame.front_label.configure(text=f"Q: {card.front[:30]}...")
+        card_frame.back_label.configure(text=f"A: {card.back[:30]}...")
+
+    def show_edit_card_input(self, card_id):
+        """
+        Show the input fields to edit the card with the given id.
+        """
+        # Get the card to edit
+        card = self.app.current_set.get_card(card_id)
+        self.app.screens.show("edit_card", self.build_edit_card_input)
+        self.edit_card_title_label.configure(text=f"Edit Card in {self.app.current_set.title}")
+        self.edit_card_question_entry.delete(0, tk.END)
+        self.edit_card_question_entry.insert(0, card.front)
+        self.edit_card_answer_entry.delete(0, tk.END)
+        self.edit_card_answer_entry.insert(0, card.back)
+        self.save_card_button.configure(command=lambda: self.save_card_edit(card_id))
+
+    def build_edit_card_input(self, screen):
         # Create the header frame
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(
+        self.edit_card_title_label = ctk.CTkLabel(
             header_frame,
-            text=f"Edit Card in {self.app.current_set.title}",
+            text="",
             font=("Roboto", 24, "bold"),
             text_color="white",
-        ).pack(pady=20)
+        )
+        self.edit_card_title_label.pack(pady=20)
 
         # Create the input frame
-        input_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        input_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         input_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         ctk.CTkLabel(input_frame, text="Question:", font=("Roboto", 16)).pack(
@@ -245,7 +281,6 @@ class CardEditor:
         )
         # Question Entry
         self.edit_card_question_entry = ctk.CTkEntry(input_frame, width=300)
-        self.edit_card_question_entry.insert(0, card.front)
         self.edit_card_question_entry.pack(pady=10)
 
         ctk.CTkLabel(input_frame, text="Answer:", font=("Roboto", 16)).pack(
@@ -253,17 +288,16 @@ class CardEditor:
         )
         # Answer Entry
         self.edit_card_answer_entry = ctk.CTkEntry(input_frame, width=300)
-        self.edit_card_answer_entry.insert(0, card.back)
         self.edit_card_answer_entry.pack(pady=10)
 
         # Save Changes Button
-        ctk.CTkButton(
+        self.save_card_button = ctk.CTkButton(
             input_frame,
             text="Save Changes",
-            command=lambda: self.save_card_edit(card_index),
             fg_color="#2ecc71",
             hover_color="#27ae60",
-        ).pack(pady=10)
+        )
+        self.save_card_button.pack(pady=10)
         ctk.CTkButton(
             input_frame,
             text="Cancel",
@@ -272,14 +306,13 @@ class CardEditor:
             hover_color="#7f8c8d",
         ).pack(pady=10)
 
-    def save_card_edit(self, card_index):
+    def save_card_edit(self, card_id):
         """
         Save the changes made to the card.
         """
         new_front = self.edit_card_question_entry.get()
         new_back = self.edit_card_answer_entry.get()
-        if new_front and new_back:
-            self.app.current_set.edit_card(card_index, new_front, new_back)
+        self.app.decks.edit_card(self.app.current_set.id, card_id, new_front, new_back)
         self.show_edit_screen()
 
     def delete_current_deck(self):
@@ -290,15 +323,15 @@ class CardEditor:
                 "Confirm Deletion",
                 f"Are you sure you want to delete the deck '{self.app.current_set.title}'?",
         ):
-            self.app.flashcard_sets.remove(self.app.current_set)
+            self.app.decks.delete_deck(self.app.current_set.id)
             self.app.deck_manager.show_deck_manager()
 
-    def delete_card(self, card_index):
+    def delete_card(self, card_id):
         """
         Delete the card from the current set. Ask for confirmation before deleting.
         """
         if messagebox.askyesno(
                 "Confirm Deletion", f"Are you sure you want to delete this card?"
         ):
-            self.app.current_set.delete_card(card_index)
-        self.show_edit_screen()
\ No newline at end of file
+            self.app.decks.delete_card(self.app.current_set.id, card_id)
+            self.card_list.refresh()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import tkinter as tk
+from tkinter import ttk
+import customtkinter as ctk
+
+from core.stats import card_sort_keys
+from .render_scheduler import render_scheduler
+
+# Number of cards shown per page of the table
+PAGE_SIZE = 100
+# Rows put into the table right away when a page is shown; the rest of the page follows in slices
+FIRST_ROWS = 25
+
+# Columns of the table: (column id, heading, width in pixels, sortable)
+COLUMNS = (
+    ("front", "Question", 170, False),
+    ("back", "Answer", 170, False),
+    ("reviews", "Reviews", 70, True),
+    ("correct", "Correct", 70, True),
+    ("success_rate", "Success Rate", 95, True),
+)
+
+
+class CardStatsTable(ctk.CTkFrame):
+    """
+    Paged table of the statistics of the cards of a deck, sortable by reviews, correct answers and success rate.
+
+    Only the current page of PAGE_SIZE cards is put into the Treeview. The sort keys are read once per deck from
+    the card store's columns, and sorting only orders card positions by those keys, so neither sorting nor paging
+    calls methods on every card.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="white", **kwargs)
+        self.flashcard_set = None
+        # Positions of the cards in the current sort order, or None for card order
+        self.order = None
+        self.sort_column = None
+        self.sort_descending = False
+        self.page = 0
+        self._keys = {}
+        self.scheduler = render_scheduler(self)
+
+        style = ttk.Style(self)
+        style.configure("Stats.Treeview", rowheight=26, font=("Roboto", 12))
+        style.configure("Stats.Treeview.Heading", font=("Roboto", 12, "bold"))
+
+        table_frame = ctk.CTkFrame(self, fg_color="white")
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(
+            table_frame, columns=[column for column, *_ in COLUMNS], show="headings", style="Stats.Treeview"
+        )
+        for column, heading, width, sortable in COLUMNS:
+            self.tree.heading(column, text=heading, command=(lambda c=column: self.sort_by(c)) if sortable else "")
+            self.tree.column(column, width=width, anchor="w" if not sortable else "e", stretch=not sortable)
+        scrollbar = ctk.CTkScrollbar(table_frame, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        pager_frame = ctk.CTkFrame(self, fg_color="transparent")
+        pager_frame.pack(fill=tk.X, pady=(10, 0))
+        self.previous_button = ctk.CTkButton(
+            pager_frame,
+            text="< Previous",
+            command=lambda: self.show_page(self.page - 1),
+            fg_color="#3498db",
+            hover_color="#2980b9",
+            width=100,
+        )
+        self.previous_button.pack(side=tk.LEFT, padx=15)
+        self.next_button = ctk.CTkButton(
+            pager_frame,
+            text="Next >",
+            command=lambda: self.show_page(self.page + 1),
+            fg_color="#3498db",
+            hover_color="#2980b9",
+            width=100,
+        )
+        self.next_button.pack(side=tk.RIGHT, padx=15)
+        self.page_label = ctk.CTkLabel(pager_frame, text="", font=("Roboto", 12))
+        self.page_label.pack(expand=True)
+
+    def set_deck(self, flashcard_set):
+        """
+        Show the first page of the cards of the given deck, in card order.
+        """
+        self.flashcard_set = flashcard_set
+        self.order = None
+        self.sort_column = None
+        self._keys = {}
+        self._update_headings()
+        self.show_page(0)
+
+    def _sort_keys(self, column):
+        """
+        Return the sort key of every card for the given column, in card order. The keys are computed once per deck.
+        """
+        if not self._keys:
+            self._keys = card_sort_keys(self.flashcard_set.cards)
+        return self._keys[column]
+
+    def sort_by(self, column):
+        """
+        Sort the table by the given column, descending first. Sorting by the same column again reverses the order.
+        """
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+            self.order.reverse()
+        else:
+            self.sort_column = column
+            self.sort_descending = True
+            keys = self._sort_keys(column)
+            self.order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+        self._update_headings()
+        self.show_page(0)
+
+    def _update_headings(self):
+        for column, heading, _, sortable in COLUMNS:
+            if column == self.sort_column:
+                heading += " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(column, text=heading)
+
+    def page_count(self):
+        return max(1, -(-len(self.flashcard_set.cards) // PAGE_SIZE))
+
+    def show_page(self, page):
+        """
+        Put the cards of the given page into the table. The first FIRST_ROWS rows are inserted right away, the
+        others by the RenderScheduler.
+        """
+        page = max(0, min(page, self.page_count() - 1))
+        self.page = page
+        cards = self.flashcard_set.cards
+        start = page * PAGE_SIZE
+        stop = min(start + PAGE_SIZE, len(cards))
+        positions = range(start, stop) if self.order is None else self.order[start:stop]
+
+        # Rows of the previous page that are still pending must not end up on this one
+        self.scheduler.cancel(self)
+        self.tree.delete(*self.tree.get_children())
+        rows = self._insert_rows(cards, positions)
+        for _ in range(FIRST_ROWS):
+            if next(rows, None) is None:
+                break
+        else:
+            self.scheduler.run(self, rows)
+        self.tree.yview_moveto(0)
+
+        self.page_label.configure(text=f"Cards {start + 1 if stop else 0}-{stop} of {len(cards)}")
+        self.previous_button.configure(state="normal" if page > 0 else "disabled")
+        self.next_button.configure(state="normal" if page < self.page_count() - 1 else "disabled")
+
+    def _insert_rows(self, cards, positions):
+        """
+        Insert a row per card position, yielding True after each one.
+        """
+        for position in positions:
+            card = cards[position]
+            self.tree.insert(
+                "",
+                tk.END,
+                values=(
+                    card.front,
+                    card.back,
+                    card.review_count,
+                    card.correct_count,
+                    f"{card.success_rate():.2f}%",
+                ),
+            )
+            yield True
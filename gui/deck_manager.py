@@ -1,23 +1,30 @@
 import tkinter as tk
 import customtkinter as ctk
-from cards.flashcard_set import FlashCardSet
+from core.session import DUE_CARDS
+from .virtual_list import VirtualList
+from utils import instrumentation
 
 class DeckManager:
     def __init__(self, app):
         self.new_deck_title_entry = None
         self.app = app
 
+    @instrumentation.timed("show_deck_manager")
     def show_deck_manager(self):
         """
         Show the deck manager screen. This screen displays all the decks the user has created or imported.
         """
-        # Clear the main frame
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("decks", self.build_deck_manager)
+        # Only the visible rows are rebound, so coming back to this screen keeps the scroll position
+        self.deck_list.refresh()
 
+    def build_deck_manager(self, screen):
+        """
+        Build the deck manager screen once; show_deck_manager updates it.
+        """
         # Create the header
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(
@@ -27,17 +34,16 @@ class DeckManager:
             text_color="white",
         ).pack(pady=20)
 
-        # Make frame scrollable
-        scroll_frame = ctk.CTkScrollableFrame(self.app.main_frame, fg_color="#F0F0F0")
-        scroll_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
-        self.app.bind_mousewheel(scroll_frame)
-
-        for i, deck in enumerate(self.app.flashcard_sets):
-            self.create_deck_card(scroll_frame, deck, i)
+        # Scrollable list with widgets only for the visible decks
+        self.deck_list = VirtualList(
+            screen, create_row=self.create_deck_row, bind_row=self.bind_deck_row, background="#F0F0F0"
+        )
+        self.deck_list.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        self.deck_list.set_items(self.app.flashcard_sets)
 
-        # Create buttons
+        # Create buttons. The other controllers are only created when a button is used, see FlashcardGUI
         new_deck_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="+ Create New Deck",
             command=self.show_new_deck_input,
             fg_color="#2ecc71",
@@ -48,9 +54,9 @@ class DeckManager:
         new_deck_button.pack(padx=20, pady=(0, 10), fill=tk.X)
 
         export_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Export Decks",
-            command=self.app.file_operations.export_flashcard_sets,
+            command=lambda: self.app.file_operations.export_flashcard_sets(),
             fg_color="#3498db",
             hover_color="#2980b9",
             height=50,
@@ -59,9 +65,9 @@ class DeckManager:
         export_button.pack(padx=20, pady=(0, 10), fill=tk.X)
 
         import_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Import Decks",
-            command=self.app.file_operations.import_flashcard_sets,
+            command=lambda: self.app.file_operations.import_flashcard_sets(),
             fg_color="#9b59b6",
             hover_color="#8e44ad",
             height=50,
@@ -70,9 +76,9 @@ class DeckManager:
         import_button.pack(padx=20, pady=(0, 10), fill=tk.X)
 
         stats_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Statistics",
-            command=self.app.statistics.show_statistics,
+            command=lambda: self.app.statistics.show_statistics(),
             fg_color="#f1c40f",
             hover_color="#f39c12",
             height=50,
@@ -81,9 +87,9 @@ class DeckManager:
         stats_button.pack(padx=20, pady=(0, 10), fill=tk.X)
 
         help_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Help",
-            command=self.app.help_screen.show,
+            command=lambda: self.app.help_screen.show(),
             fg_color="#1abc9c",
             hover_color="#16a085",
             height=50,
@@ -92,7 +98,7 @@ class DeckManager:
         help_button.pack(padx=20, pady=(0, 10), fill=tk.X)
 
         exit_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Exit",
             command=self.app.on_closing,
             fg_color="#e74c3c",
@@ -102,20 +108,19 @@ class DeckManager:
         )
         exit_button.pack(padx=20, pady=(0, 20), fill=tk.X)
 
-    def create_deck_card(self, parent, deck, index):
+    def create_deck_row(self, parent):
         """
-        Create a card that represents a deck. This card displays the deck's title and the number of cards in the deck.
+        Create a row of the deck list. A row is reused for different decks while scrolling; bind_deck_row fills it
+        with the title and the number of cards of a deck, and its buttons act on the deck it currently shows.
         """
         # Create the card frame
         card_frame = ctk.CTkFrame(parent, fg_color="white", corner_radius=10)
-        card_frame.pack(fill=tk.X, pady=5)
+        card_frame.deck_id = None
 
-        ctk.CTkLabel(card_frame, text=deck.title, font=("Roboto", 18, "bold")).pack(
-            anchor="w", padx=15, pady=(10, 5)
-        )
-        ctk.CTkLabel(
-            card_frame, text=f"{len(deck.cards)} cards", font=("Roboto", 14)
-        ).pack(anchor="w", padx=15, pady=(0, 10))
+        card_frame.title_label = ctk.CTkLabel(card_frame, text="", font=("Roboto", 18, "bold"))
+        card_frame.title_label.pack(anchor="w", padx=15, pady=(10, 5))
+        card_frame.count_label = ctk.CTkLabel(card_frame, text="", font=("Roboto", 14))
+        card_frame.count_label.pack(anchor="w", padx=15, pady=(0, 10))
 
         button_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         button_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
@@ -124,17 +129,27 @@ class DeckManager:
         ctk.CTkButton(
             button_frame,
             text="Study",
-            command=lambda: self.app.learning_session.start_learning(index),
+            command=lambda: self.app.learning_session.start_learning(card_frame.deck_id),
             fg_color="#3498db",
             hover_color="#2980b9",
             width=80,
         ).pack(side=tk.LEFT, padx=(0, 10))
 
+        # Review Due Cards Button
+        ctk.CTkButton(
+            button_frame,
+            text="Due",
+            command=lambda: self.app.learning_session.start_learning(card_frame.deck_id, mode=DUE_CARDS),
+            fg_color="#16a085",
+            hover_color="#138d75",
+            width=80,
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
         # Edit Button
         ctk.CTkButton(
             button_frame,
             text="Edit",
-            command=lambda: self.app.card_editor.edit_set(index),
+            command=lambda: self.app.card_editor.edit_set(card_frame.deck_id),
             fg_color="#f39c12",
             hover_color="#d35400",
             width=80,
@@ -144,7 +159,7 @@ class DeckManager:
         ctk.CTkButton(
             button_frame,
             text="Statistics",
-            command=lambda: self.app.statistics.show_individual_statistics(index),
+            command=lambda: self.app.statistics.show_individual_statistics(card_frame.deck_id),
             fg_color="#2ecc71",
             hover_color="#27ae60",
             width=80,
@@ -154,52 +169,63 @@ class DeckManager:
         ctk.CTkButton(
             button_frame,
             text="Delete",
-            command=lambda: self.confirm_delete_deck(index),
+            command=lambda: self.confirm_delete_deck(card_frame.deck_id),
             fg_color="#e74c3c",
             hover_color="#c0392b",
             width=80,
         ).pack(side=tk.RIGHT)
+        return card_frame
+
+    def bind_deck_row(self, card_frame, deck):
+        """
+        Show a deck in a row created by create_deck_row.
+        """
+        card_frame.deck_id = deck.id
+        card_frame.title_label.configure(text=deck.title)
+        card_frame.count_label.configure(text=f"{len(deck.cards)} cards")
 
-    def confirm_delete_deck(self, index):
+    def confirm_delete_deck(self, deck_id):
         """
         Show a confirmation dialog before deleting a deck.
         """
         self.app.message_box.show_confirmation(
             "Delete Deck",
-            f"Are you sure you want to delete the deck '{self.app.flashcard_sets[index].title}'?",
-            on_yes=lambda: self.delete_deck(index),
+            f"Are you sure you want to delete the deck '{self.app.flashcard_sets.get(deck_id).title}'?",
+            on_yes=lambda: self.delete_deck(deck_id),
             on_no=self.show_deck_manager
         )
 
-    def delete_deck(self, index):
+    def delete_deck(self, deck_id):
         """
         Delete a deck from the list of decks.
         """
-        del self.app.flashcard_sets[index]
+        self.app.decks.delete_deck(deck_id)
         self.show_deck_manager()
 
-    def start_learning_or_add_cards(self, set_index):
+    def start_learning_or_add_cards(self, deck_id):
         """
         Start a learning session or show the "add cards -prompt" based on whether the deck has cards or not.
         """
-        if not self.app.flashcard_sets[set_index].cards:
+        if not self.app.flashcard_sets.get(deck_id).cards:
             self.app.message_box.show_message(
                 "Empty Deck",
                 "This deck has no cards. Would you like to add some cards?",
-                on_ok=lambda: self.app.card_editor.show_add_cards_input(set_index)
+                on_ok=lambda: self.app.card_editor.show_add_cards_input(deck_id)
             )
         else:
-            self.app.learning_session.start_learning(set_index)
+            self.app.learning_session.start_learning(deck_id)
 
     def show_new_deck_input(self):
         """
         Show an input field for the user to create a new deck.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("new_deck", self.build_new_deck_input)
+        self.new_deck_title_entry.delete(0, tk.END)
+        self.new_deck_title_entry.focus_set()
 
+    def build_new_deck_input(self, screen):
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(
@@ -210,7 +236,7 @@ class DeckManager:
         ).pack(pady=20)
 
         # Frame to ask for the deck title
-        input_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        input_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         input_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         ctk.CTkLabel(input_frame, text="Deck Title:", font=("Roboto", 16)).pack(
@@ -247,7 +273,5 @@ class DeckManager:
         """
         title = self.new_deck_title_entry.get()
         if title:
-            new_set = FlashCardSet(title)
-            self.app.flashcard_sets.append(new_set)
-            self.app.current_set = new_set
+            self.app.current_set = self.app.decks.create_deck(title)
             self.app.card_editor.show_add_cards_input()
\ No newline at end of file
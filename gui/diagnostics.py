@@ -0,0 +1,92 @@
+import tkinter as tk
+from tkinter import filedialog, ttk
+import customtkinter as ctk
+
+from utils import instrumentation
+
+# Columns of the timing table: (key in instrumentation.summary(), heading, width in pixels)
+COLUMNS = (
+    ("name", "Call", 170),
+    ("calls", "Calls", 55),
+    ("mean_ms", "Mean ms", 70),
+    ("p95_ms", "p95 ms", 70),
+    ("max_ms", "Max ms", 70),
+    ("widgets", "Widgets", 65),
+)
+
+
+class Diagnostics:
+    """
+    Hidden screen with the timings recorded by utils.instrumentation, opened with Ctrl+Shift+D when the
+    instrumentation is enabled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def show(self):
+        """
+        Show the diagnostics screen with the current summary of the recorded calls.
+        """
+        self.app.screens.show("diagnostics", self.build)
+        self.refresh()
+
+    def build(self, screen):
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
+        header_frame.pack(fill=tk.X, pady=(0, 20))
+        ctk.CTkLabel(header_frame, text="Diagnostics", font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
+
+        back_button = ctk.CTkButton(
+            screen,
+            text="Back to Decks",
+            command=self.app.deck_manager.show_deck_manager,
+            fg_color="#95a5a6",
+            hover_color="#7f8c8d",
+            height=50,
+            corner_radius=10,
+        )
+        back_button.pack(padx=20, pady=(0, 20), fill=tk.X, side=tk.BOTTOM)
+
+        button_frame = ctk.CTkFrame(screen, fg_color="transparent")
+        button_frame.pack(padx=20, pady=(0, 10), fill=tk.X, side=tk.BOTTOM)
+        ctk.CTkButton(
+            button_frame, text="Refresh", command=self.refresh, fg_color="#3498db", hover_color="#2980b9", width=100
+        ).pack(side=tk.LEFT)
+        ctk.CTkButton(
+            button_frame, text="Clear", command=self.clear, fg_color="#e74c3c", hover_color="#c0392b", width=100
+        ).pack(side=tk.LEFT, padx=10)
+        ctk.CTkButton(
+            button_frame, text="Save as JSON", command=self.dump, fg_color="#2ecc71", hover_color="#27ae60", width=120
+        ).pack(side=tk.RIGHT)
+
+        table_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 10))
+        self.tree = ttk.Treeview(table_frame, columns=[key for key, *_ in COLUMNS], show="headings")
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w" if key == "name" else "e", stretch=key == "name")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in instrumentation.summary():
+            self.tree.insert(
+                "",
+                tk.END,
+                values=[
+                    f"{row[key]:.1f}" if key.endswith("_ms") else ("" if row[key] is None else row[key])
+                    for key, *_ in COLUMNS
+                ],
+            )
+
+    def clear(self):
+        instrumentation.clear()
+        self.refresh()
+
+    def dump(self):
+        """
+        Save the recorded calls and their summary to a JSON file chosen by the user.
+        """
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if file_path:
+            instrumentation.dump(file_path)
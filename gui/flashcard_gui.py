@@ -1,48 +1,139 @@
 import tkinter as tk
+from functools import cached_property
+
 import customtkinter as ctk
 
 from .deck_manager import DeckManager
-from .card_editor import CardEditor
-from .learning_session import LearningSession
-from .statistics import Statistics
-from utils.file_operations import FileOperations
-from utils.help_screen import HelpScreen
-from utils.message_box import MessageBox
+from .render_scheduler import render_scheduler
+from .screen_manager import ScreenManager
+from .scroll_dispatcher import scroll_dispatcher
+from cards.review_log import ReviewLog
+from utils import instrumentation
+from utils.startup_timer import StartupTimer
+from utils.storage import SQLiteStorage
+
+# Database holding the library, file the review events are logged to, and how often pending writes are flushed
+DATABASE_PATH = "flashcards.db"
+REVIEW_LOG_PATH = "reviews.log"
+FLUSH_INTERVAL_MS = 2000
 
 
 class FlashcardGUI:
-    def __init__(self, root):
+    """
+    The application: the window, the library and the controllers of the screens.
+
+    Only what the deck list needs is created at startup. The other controllers, and the modules they import, are
+    created on first use through the cached properties below, so the deck list appears before they are loaded.
+    """
+
+    def __init__(self, root, startup_timer=None):
         self.root = root
+        self.startup_timer = startup_timer or StartupTimer()
         self.root.title("Flashcard App")
         self.root.geometry("600x800")
         self.root.minsize(600, 800)
-        self.message_box = MessageBox(self)
-        self.help_screen = HelpScreen(self)
 
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("blue")
 
-        self.flashcard_sets = []
+        # The library is restored from the database, then brought up to date with reviews logged after the last save
+        with self.startup_timer.phase("load library"):
+            self.storage = SQLiteStorage(DATABASE_PATH)
+            self.flashcard_sets = self.storage.load_library()
         self.current_set = None
 
-        self.init_ui()
+        with self.startup_timer.phase("catch up review log"):
+            self.review_log = ReviewLog(REVIEW_LOG_PATH)
+            self.review_log.catch_up(self.flashcard_sets)
+        self.root.after(FLUSH_INTERVAL_MS, self.flush_pending_writes)
+        self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
+        if instrumentation.ENABLED:
+            instrumentation.set_root(self.root)
+            # Hidden diagnostics screen with the recorded timings
+            self.root.bind("<Control-Shift-D>", lambda event: self.show_diagnostics())
+
+        with self.startup_timer.phase("build deck list"):
+            self.init_ui()
+        self.root.after_idle(self.startup_timer.finish)
 
     def init_ui(self):
         self.create_main_frame()
         self.deck_manager = DeckManager(self)
-        self.card_editor = CardEditor(self)
-        self.learning_session = LearningSession(self)
-        self.statistics = Statistics(self)
-        self.file_operations = FileOperations(self)
-        self.help_screen = HelpScreen(self)
         self.deck_manager.show_deck_manager()
 
+    @cached_property
+    def decks(self):
+        from core.decks import DeckService
+        return DeckService(self.flashcard_sets)
+
+    @cached_property
+    def stats(self):
+        from core.stats import StatsService
+        return StatsService(self.flashcard_sets)
+
+    @cached_property
+    def card_editor(self):
+        from .card_editor import CardEditor
+        return CardEditor(self)
+
+    @cached_property
+    def learning_session(self):
+        from .learning_session import LearningSession
+        return LearningSession(self)
+
+    @cached_property
+    def statistics(self):
+        from .statistics import Statistics
+        return Statistics(self)
+
+    @cached_property
+    def file_operations(self):
+        from utils.file_operations import FileOperations
+        return FileOperations(self)
+
+    @cached_property
+    def help_screen(self):
+        from utils.help_screen import HelpScreen
+        return HelpScreen(self)
+
+    @cached_property
+    def message_box(self):
+        from utils.message_box import MessageBox
+        return MessageBox(self)
+
+    @cached_property
+    def diagnostics(self):
+        from .diagnostics import Diagnostics
+        return Diagnostics(self)
+
+    def show_diagnostics(self):
+        """
+        Show the diagnostics screen, unless an import or export is running. The progress screen keeps the decks
+        from being changed while the worker reads them, so it must stay until the task ends.
+        """
+        if not self.screens.is_shown("progress"):
+            self.diagnostics.show()
+
+    @cached_property
+    def tasks(self):
+        """
+        Worker threads for imports, exports and other long operations, started on first use.
+        """
+        from utils.background import TaskRunner
+        return TaskRunner(self.root)
+
     def create_main_frame(self):
         """
         Create the main frame of the application.
         """
         self.main_frame = ctk.CTkFrame(self.root, fg_color="#F0F0F0")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
+        # Large screens are rendered in slices between events
+        self.render_scheduler = render_scheduler(self.root)
+        # Every screen is a frame in the main frame, built once and then hidden and shown again
+        self.screens = ScreenManager(self.main_frame, self.render_scheduler)
+        # A single mouse-wheel binding for all scrollable widgets
+        self.scroll_dispatcher = scroll_dispatcher(self.root)
 
     def on_closing(self):
         """
@@ -51,29 +142,37 @@ class FlashcardGUI:
         self.message_box.show_confirmation(
             "Quit",
             "Do you want to quit?",
-            on_yes=self.root.destroy,
+            on_yes=self.shutdown,
             on_no=self.deck_manager.show_deck_manager
         )
 
-    def _on_mousewheel(self, event):
+    def flush_pending_writes(self):
+        """
+        Write the buffered review events and the changed decks and cards to disk, and schedule the next flush.
+        The review log is flushed first, so the saved log offset never points behind the end of the log file.
+        """
+        self.review_log.flush()
+        self.storage.flush()
+        self.root.after(FLUSH_INTERVAL_MS, self.flush_pending_writes)
+
+    def shutdown(self):
         """
-        Allow scrolling with the mouse wheel.
+        Cancel the background tasks, flush all pending data and close the application.
         """
-        widget = event.widget
-        while widget.master and not isinstance(widget, ctk.CTkScrollableFrame):
-            widget = widget.master
-        if isinstance(widget, ctk.CTkScrollableFrame):
-            widget._parent_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        if "tasks" in self.__dict__:
+            self.tasks.shutdown()
+        self.review_log.flush()
+        self.storage.close()
+        self.root.destroy()
 
     def bind_mousewheel(self, widget):
         """
-        Bind the mousewheel to the widget.
+        Scroll a CTkScrollableFrame with the mouse wheel over it and all its descendants, present and future.
         """
-        widget.bind("<MouseWheel>", self._on_mousewheel, "+") # + means that this binding will be called before the default binding
-        widget.bind("<Button-4>", self._on_mousewheel, "+")
-        widget.bind("<Button-5>", self._on_mousewheel, "+")
-        for child in widget.winfo_children():
-            self.bind_mousewheel(child)
+        # The scrollable frame sits in a canvas in an outer frame, which also covers the scrollbar
+        self.scroll_dispatcher.register(
+            widget._parent_frame, lambda units: widget._parent_canvas.yview_scroll(units, "units")
+        )
 
     def show_help_screen(self):
         """
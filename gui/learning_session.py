@@ -1,66 +1,109 @@
 import tkinter as tk
 import customtkinter as ctk
-import random
+
+from core.session import ALL_CARDS, DUE_CARDS, StudySession
+from utils import instrumentation
 
 
 class LearningSession:
+    """
+    The study screens. The order of the cards, answer checking and the bookkeeping of the session are done by a
+    core.session.StudySession; this class shows it.
+    """
+
     def __init__(self, app):
         self.app = app
-        self.current_card_index = 0
-        self.cards_to_review = []
-        self.reviewed_cards = 0
-
-    def start_learning(self, set_index):
+        self.session = None
+        # The study screen has two question labels: one shows the current card, the other is filled with the upcoming
+        # card while the user reads the feedback, so Continue only has to swap them (see prepare_next_card)
+        self.question_labels = ()
+        self.visible_question = 0
+        # The card the hidden question label shows, or None
+        self.prepared_card = None
+        self._prepare_id = None
+
+    def start_learning(self, deck_id, mode=ALL_CARDS):
         """
         Start a learning session with the selected deck. If the deck is empty, show a message to add cards.
+        In DUE_CARDS mode only the most due cards are studied; if none are due, a message is shown instead.
         """
-        self.app.current_set = self.app.flashcard_sets[set_index]
+        self.app.current_set = self.app.flashcard_sets.get(deck_id)
         if not self.app.current_set.cards:
-            self.show_empty_deck_message(set_index)
+            self.show_empty_deck_message(deck_id)
+            return
+        self.session = StudySession(
+            self.app.current_set, mode, review_log=self.app.review_log, library=self.app.flashcard_sets
+        )
+        self.prepared_card = None
+        if not self.session.cards:
+            self.app.message_box.show_message(
+                "Nothing Due", f"No cards in '{self.app.current_set.title}' are due for review right now."
+            )
         else:
-            self.initialize_session()
             self.show_flashcard()
 
-    def initialize_session(self):
-        """
-        Initialise the learning session by shuffling the cards and setting the current card index to 0.
-        """
-        self.current_card_index = 0
-        self.cards_to_review = self.app.current_set.cards.copy()
-        random.shuffle(self.cards_to_review)
-        self.reviewed_cards = 0
-
+    @instrumentation.timed("show_flashcard")
     def show_flashcard(self):
         """
-        Show the flashcard to the user. If all cards have been reviewed, end the learning session.
+        Show the flashcard to the user. If all cards have been reviewed, end the learning session. The study screen
+        is built once; moving to another card only updates its texts, and if the card was prepared by
+        prepare_next_card, only swaps the question labels.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
-
-        if self.reviewed_cards >= len(self.cards_to_review):
+        self.cancel_prepare()
+        session = self.session
+        if session.finished:
             self.end_learning_session(completed=True)
             return
 
-        card = self.cards_to_review[self.current_card_index]
+        card = session.current_card
 
+        self.app.screens.show("study", self.build_study_screen)
+        self.study_title_label.configure(
+            text=f"{self.app.current_set.title} - Card {session.reviewed + 1}/{len(session.cards)}"
+        )
+        hidden_label = self.question_labels[1 - self.visible_question]
+        if self.prepared_card is not card:
+            hidden_label.configure(text=card.front)
+        self.prepared_card = None
+        hidden_label.pack(pady=(40, 20), padx=20)
+        self.question_labels[self.visible_question].pack_forget()
+        self.visible_question = 1 - self.visible_question
+        self.user_answer_entry.delete(0, tk.END)
+        self.answer_message_label.configure(text="")
+        self.continue_button.pack_forget()
+        if not self.check_answer_btn.winfo_manager():
+            self.check_answer_btn.pack(side=tk.LEFT, padx=5)
+            self.show_answer_btn.pack(side=tk.LEFT, padx=5)
+        self.user_answer_entry.focus_set()
+        session.card_shown()
+
+    def build_study_screen(self, screen):
+        """
+        Build the study screen once; show_flashcard updates it for every card.
+        """
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(
+        self.study_title_label = ctk.CTkLabel(
             header_frame,
-            text=f"{self.app.current_set.title} - Card {self.reviewed_cards + 1}/{len(self.cards_to_review)}",
+            text="",
             font=("Roboto", 24, "bold"),
             text_color="white",
-        ).pack(pady=20)
+        )
+        self.study_title_label.pack(pady=20)
 
-        card_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        card_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         card_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        question_label = ctk.CTkLabel(
-            card_frame, text=card.front, font=("Roboto", 18), wraplength=300
+        # Holds whichever of the two question labels is visible
+        question_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
+        question_frame.pack()
+        self.question_labels = tuple(
+            ctk.CTkLabel(question_frame, text="", font=("Roboto", 18), wraplength=300) for _ in range(2)
         )
-        question_label.pack(pady=(40, 20), padx=20)
+        self.visible_question = 0
+        self.prepared_card = None
 
         self.user_answer_entry = ctk.CTkEntry(card_frame, width=300)
         self.user_answer_entry.pack(pady=10)
@@ -92,13 +135,23 @@ class LearningSession:
         )
         self.show_answer_btn.pack(side=tk.LEFT, padx=5)
 
-        self.create_navigation_buttons()
+        # Replaces the two buttons above once the card is answered
+        self.continue_button = ctk.CTkButton(
+            self.button_frame,
+            text="Continue",
+            command=self.next_card,
+            fg_color="#2ecc71",
+            hover_color="#27ae60",
+        )
+        self.continue_button.bind("<Return>", lambda event: self.continue_button.invoke())
+
+        self.create_navigation_buttons(screen)
 
-    def create_navigation_buttons(self):
+    def create_navigation_buttons(self, screen):
         """
         Create the navigation buttons to move between flashcards within a running learning session.
         """
-        nav_frame = ctk.CTkFrame(self.app.main_frame, fg_color="transparent")
+        nav_frame = ctk.CTkFrame(screen, fg_color="transparent")
         nav_frame.pack(fill=tk.X, padx=20, pady=20)
 
         ctk.CTkButton(
@@ -118,32 +171,29 @@ class LearningSession:
             width=100,
         ).pack(side=tk.RIGHT)
         ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="End Session",
             command=lambda: self.end_learning_session(completed=False),
             fg_color="#e74c3c",
             hover_color="#c0392b",
         ).pack(pady=10)
 
+    @instrumentation.timed("check_answer")
     def check_answer(self):
         """
         Check the user's answer against the correct answer and provide feedback.
         """
-        user_answer = self.user_answer_entry.get()
-        card = self.cards_to_review[self.current_card_index]
-        if user_answer.strip().lower() == card.back.strip().lower():
-            card.mark_correct()
+        if self.session.check_answer(self.user_answer_entry.get()):
             self.answer_message_label.configure(text="Correct!", text_color="green")
             self.show_continue_button()
         else:
-            card.mark_incorrect()
             self.answer_message_label.configure(text="Incorrect. Try again or show the answer.", text_color="red")
 
     def show_answer(self):
         """
         Reveals the correct answer if prompted by the user.
         """
-        card = self.cards_to_review[self.current_card_index]
+        card = self.session.current_card
         self.answer_message_label.configure(text=f"The correct answer is: {card.back}", text_color="blue")
         self.show_continue_button()
 
@@ -151,38 +201,45 @@ class LearningSession:
         """
         Show the continue button after the user has answered the flashcard correctly.
         """
-        for widget in self.button_frame.winfo_children():
-            widget.destroy()
+        self.check_answer_btn.pack_forget()
+        self.show_answer_btn.pack_forget()
+        self.continue_button.pack(pady=10)
+        self.continue_button.focus_set()
+        # After the feedback has been drawn
+        if self._prepare_id is None:
+            self._prepare_id = self.app.root.after_idle(self.prepare_next_card)
+
+    def prepare_next_card(self):
+        """
+        Lay out the upcoming card in the hidden question label and normalize its answer, while the user reads the
+        feedback on the current card.
+        """
+        self._prepare_id = None
+        card = self.session.upcoming_card
+        if card is None or card is self.prepared_card:
+            return
+        with instrumentation.measure("prepare_next_card"):
+            self.session.prepare(card)
+            self.question_labels[1 - self.visible_question].configure(text=card.front)
+            self.prepared_card = card
 
-        continue_button = ctk.CTkButton(
-            self.button_frame,
-            text="Continue",
-            command=self.next_card,
-            fg_color="#2ecc71",
-            hover_color="#27ae60",
-        )
-        continue_button.pack(pady=10)
-        continue_button.focus_set()
-        continue_button.bind("<Return>", lambda event: continue_button.invoke())
+    def cancel_prepare(self):
+        if self._prepare_id is not None:
+            self.app.root.after_cancel(self._prepare_id)
+            self._prepare_id = None
 
     def prev_card(self):
         """
         Show the previous flashcard in the deck.
         """
-        if self.current_card_index > 0:
-            self.current_card_index -= 1
-            self.reviewed_cards = max(0, self.reviewed_cards - 1)
+        self.session.prev_card()
         self.show_flashcard()
 
     def next_card(self):
         """
         Show the next flashcard in the deck.
         """
-        self.reviewed_cards += 1
-        if self.current_card_index < len(self.cards_to_review) - 1:
-            self.current_card_index += 1
-        else:
-            self.current_card_index = 0
+        self.session.next_card()
         self.show_flashcard()
 
     def end_learning_session(self, completed=False):
@@ -191,70 +248,79 @@ class LearningSession:
         If the deck was completed, show a message with the option to return to the main menu. If exit was triggered
         while the deck was not completed, show a message with the option to quit anyway or continue learning.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
-
-        header_frame = ctk.CTkFrame(self.app.main_frame, fg_color="#3498db", corner_radius=0)
+        self.app.screens.show("session_ended", self.build_session_ended_screen)
+        if completed:
+            if self.session.mode == DUE_CARDS:
+                message = "Congratulations! You have reviewed all due cards in this deck!"
+            else:
+                message = "Congratulations! You have reviewed all cards in this deck!"
+            self.session_message_label.configure(text=message, font=("Roboto", 18, "bold"))
+            self.incomplete_button_frame.pack_forget()
+            self.return_button.pack(pady=20)
+            self.return_button.focus_set()
+        else:
+            session = self.session
+            message = f"You have reviewed {session.reviewed} out of {len(session.cards)} cards. There are {session.cards_left} cards left to review."
+            self.session_message_label.configure(text=message, font=("Roboto", 14))
+            self.return_button.pack_forget()
+            self.incomplete_button_frame.pack(pady=10)
+            self.quit_button.focus_set()
+
+    def build_session_ended_screen(self, screen):
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(header_frame, text="Session Ended", font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
 
-        message_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        message_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         message_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        if completed:
-            message = "Congratulations! You have reviewed all cards in this deck!"
-            ctk.CTkLabel(message_frame, text=message, font=("Roboto", 18, "bold"), wraplength=300).pack(pady=20)
-
-            return_button = ctk.CTkButton(
-                message_frame,
-                text="Return to Main Menu",
-                command=self.app.deck_manager.show_deck_manager,
-                fg_color="#2ecc71",
-                hover_color="#27ae60",
-            )
-            return_button.pack(pady=20)
-            return_button.focus_set()
-            return_button.bind("<Return>", lambda event: return_button.invoke())
-        else:
-            cards_left = len(self.cards_to_review) - self.reviewed_cards
-            message = f"You have reviewed {self.reviewed_cards} out of {len(self.cards_to_review)} cards. There are {cards_left} cards left to review."
-            ctk.CTkLabel(message_frame, text=message, font=("Roboto", 14), wraplength=300).pack(pady=20)
-
-            button_frame = ctk.CTkFrame(message_frame, fg_color="transparent")
-            button_frame.pack(pady=10)
-
-            quit_button = ctk.CTkButton(
-                button_frame,
-                text="Quit Anyways",
-                command=self.app.deck_manager.show_deck_manager,
-                fg_color="#e74c3c",
-                hover_color="#c0392b",
-            )
-            quit_button.pack(side=tk.LEFT, padx=10)
-            quit_button.focus_set()
-            quit_button.bind("<Return>", lambda event: quit_button.invoke())
-
-            continue_button = ctk.CTkButton(
-                button_frame,
-                text="Continue Learning",
-                command=self.show_flashcard,
-                fg_color="#2ecc71",
-                hover_color="#27ae60",
-            )
-            continue_button.pack(side=tk.LEFT, padx=10)
+        self.session_message_label = ctk.CTkLabel(message_frame, text="", font=("Roboto", 14), wraplength=300)
+        self.session_message_label.pack(pady=20)
+
+        # Shown when the deck was completed
+        self.return_button = ctk.CTkButton(
+            message_frame,
+            text="Return to Main Menu",
+            command=self.app.deck_manager.show_deck_manager,
+            fg_color="#2ecc71",
+            hover_color="#27ae60",
+        )
+        self.return_button.bind("<Return>", lambda event: self.return_button.invoke())
+
+        # Shown when the session was ended early
+        self.incomplete_button_frame = ctk.CTkFrame(message_frame, fg_color="transparent")
+
+        self.quit_button = ctk.CTkButton(
+            self.incomplete_button_frame,
+            text="Quit Anyways",
+            command=self.app.deck_manager.show_deck_manager,
+            fg_color="#e74c3c",
+            hover_color="#c0392b",
+        )
+        self.quit_button.pack(side=tk.LEFT, padx=10)
+        self.quit_button.bind("<Return>", lambda event: self.quit_button.invoke())
+
+        continue_button = ctk.CTkButton(
+            self.incomplete_button_frame,
+            text="Continue Learning",
+            command=self.show_flashcard,
+            fg_color="#2ecc71",
+            hover_color="#27ae60",
+        )
+        continue_button.pack(side=tk.LEFT, padx=10)
 
-    def show_empty_deck_message(self, set_index):
+    def show_empty_deck_message(self, deck_id):
         """
         Show a message to the user that the deck is empty and provide the option to add cards.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("empty_deck", self.build_empty_deck_screen)
 
-        header_frame = ctk.CTkFrame(self.app.main_frame, fg_color="#3498db", corner_radius=0)
+    def build_empty_deck_screen(self, screen):
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(header_frame, text="Empty Deck", font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
 
-        message_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        message_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         message_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         ctk.CTkLabel(message_frame, text="This deck has no cards. Would you like to add some cards?",
@@ -0,0 +1,80 @@
+import time
+
+# Longest time a slice of rendering work may block the event loop
+SLICE_BUDGET_MS = 8
+# Delay between slices, so that input events are handled between them
+SLICE_INTERVAL_MS = 1
+
+
+class RenderScheduler:
+    """
+    Runs rendering work in small slices between Tk events.
+
+    A job is an iterator whose every step builds or fills a small part of a screen, typically a generator that
+    yields after each row. The scheduler advances the jobs for at most SLICE_BUDGET_MS per slice and then gives the
+    event loop back, so building a large screen never freezes input. Callers render the first screenful directly
+    and hand the rest to the scheduler. Jobs are keyed by their owner: starting a job for an owner replaces its
+    pending job, and the ScreenManager cancels all jobs when another screen is shown.
+    """
+
+    def __init__(self, root, budget_ms=SLICE_BUDGET_MS):
+        self.root = root
+        self.budget = budget_ms / 1000
+        # Owner -> iterator of the pending job, in the order the jobs were started
+        self.jobs = {}
+        self._after_id = None
+
+    def run(self, owner, job):
+        """
+        Run the steps of the iterator job in slices, replacing the pending job of the same owner.
+        """
+        self.jobs.pop(owner, None)
+        self.jobs[owner] = iter(job)
+        if self._after_id is None:
+            self._after_id = self.root.after_idle(self._run_slice)
+
+    def cancel(self, owner):
+        """
+        Drop the pending job of the given owner, if any.
+        """
+        self.jobs.pop(owner, None)
+
+    def cancel_all(self):
+        """
+        Drop all pending jobs, e.g. when the screen they render is hidden.
+        """
+        self.jobs.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run_slice(self):
+        self._after_id = None
+        deadline = time.perf_counter() + self.budget
+        try:
+            while self.jobs and time.perf_counter() < deadline:
+                owner, job = next(iter(self.jobs.items()))
+                try:
+                    next(job)
+                except StopIteration:
+                    # The last step may have started a new job for the same owner
+                    if self.jobs.get(owner) is job:
+                        del self.jobs[owner]
+                except Exception:
+                    if self.jobs.get(owner) is job:
+                        del self.jobs[owner]
+                    raise
+        finally:
+            if self.jobs and self._after_id is None:
+                self._after_id = self.root.after(SLICE_INTERVAL_MS, self._run_slice)
+
+
+def render_scheduler(widget):
+    """
+    Return the RenderScheduler of the application the widget belongs to, creating it on first use.
+    """
+    root = widget._root()
+    scheduler = getattr(root, "render_scheduler", None)
+    if scheduler is None:
+        scheduler = root.render_scheduler = RenderScheduler(root)
+    return scheduler
@@ -0,0 +1,49 @@
+import tkinter as tk
+import customtkinter as ctk
+
+
+class ScreenManager:
+    """
+    Keeps one frame per screen inside the main frame.
+
+    A screen is built by its build function the first time it is shown. Afterwards showing it only swaps the
+    packed frame, and the controller updates the texts and states that changed, so navigating never destroys and
+    recreates widgets. Rendering work still pending in the RenderScheduler is cancelled when another screen is shown.
+    """
+
+    def __init__(self, parent, scheduler=None):
+        self.parent = parent
+        self.scheduler = scheduler
+        self.screens = {}
+        self.current = None
+
+    def get(self, name, build):
+        """
+        Return the frame of the screen with the given name, building it with build(frame) if it does not exist yet.
+        """
+        frame = self.screens.get(name)
+        if frame is None:
+            frame = ctk.CTkFrame(self.parent, fg_color="transparent", corner_radius=0)
+            self.screens[name] = frame
+            build(frame)
+        return frame
+
+    def show(self, name, build):
+        """
+        Show the screen with the given name instead of the current one and return its frame.
+        """
+        frame = self.get(name, build)
+        if self.current is not frame:
+            if self.scheduler is not None:
+                self.scheduler.cancel_all()
+            if self.current is not None:
+                self.current.pack_forget()
+            frame.pack(fill=tk.BOTH, expand=True)
+            self.current = frame
+        return frame
+
+    def is_shown(self, name):
+        """
+        Return True if the screen with the given name is the current screen.
+        """
+        return self.current is not None and self.screens.get(name) is self.current
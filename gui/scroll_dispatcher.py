@@ -0,0 +1,75 @@
+import tkinter as tk
+
+
+class ScrollDispatcher:
+    """
+    Application-wide mouse-wheel handling.
+
+    The wheel events are bound once with bind_all, and scrollable widgets register a scroll function instead of
+    binding the events on each of their descendants. An event is delivered to the innermost registered widget that
+    contains the widget under the mouse. Which one that is is found by comparing Tk path names, and cached per
+    widget path, so neither showing a screen nor turning the wheel walks the widget tree.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # Tk path name of each scrollable widget -> function scrolling it by a number of units
+        self.scrollables = {}
+        # Tk path name of a widget -> scroll function of the innermost scrollable containing it, or None
+        self._targets = {}
+        root.bind_all("<MouseWheel>", self._on_mousewheel, "+")
+        root.bind_all("<Button-4>", self._on_mousewheel, "+")
+        root.bind_all("<Button-5>", self._on_mousewheel, "+")
+
+    def register(self, widget, scroll):
+        """
+        Scroll the widget with scroll(units) when the wheel turns over it or one of its descendants. The widget is
+        unregistered when it is destroyed.
+        """
+        path = str(widget)
+        self.scrollables[path] = scroll
+        self._targets.clear()
+        # Bound on the Tk widget itself: customtkinter widgets forward bind() to their inner canvas
+        tk.Misc.bind(widget, "<Destroy>", lambda event: self.unregister(path) if str(event.widget) == path else None, "+")
+
+    def unregister(self, path):
+        if self.scrollables.pop(path, None) is not None:
+            self._targets.clear()
+
+    def _target(self, path):
+        target = self._targets.get(path, False)
+        if target is False:
+            target = None
+            # The path of a widget starts with the paths of all its ancestors, e.g. ".!frame.!virtuallist.!frame"
+            prefix = path
+            while prefix:
+                target = self.scrollables.get(prefix)
+                if target is not None:
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._targets[path] = target
+        return target
+
+    def _on_mousewheel(self, event):
+        target = self._target(str(event.widget))
+        if target is None:
+            return
+        if event.num == 4:
+            units = -1
+        elif event.num == 5:
+            units = 1
+        else:
+            # Windows reports multiples of 120, macOS small numbers
+            units = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        target(units)
+
+
+def scroll_dispatcher(widget):
+    """
+    Return the ScrollDispatcher of the application the widget belongs to, creating it on first use.
+    """
+    root = widget._root()
+    dispatcher = getattr(root, "scroll_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = root.scroll_dispatcher = ScrollDispatcher(root)
+    return dispatcher
@@ -1,20 +1,45 @@
 import tkinter as tk
 import customtkinter as ctk
 
+from core.stats import DUE_SOON_DAYS, FORECAST_DAYS
+from utils import instrumentation
+from .card_stats_table import CardStatsTable
+from .virtual_list import VirtualList
+
 
 class Statistics:
+    """
+    The statistics screens. The numbers come from the app's core.stats.StatsService.
+    """
+
     def __init__(self, app):
         self.app = app
+        # Forecast shown on the overall statistics screen, None if numpy is not installed or while it is computed
+        self.workload = None
+        # The task computing the forecast of the decks that changed, if one is running
+        self.forecast_task = None
 
+    @instrumentation.timed("show_statistics")
     def show_statistics(self):
         """
         Show the overall statistics of the flashcard sets. This includes the total score and success rate of all the flashcard sets combined.
+        The totals are running counts of the library; the forecast is computed in the background, see show_forecast.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("statistics", self.build_statistics_screen)
+
+        overall = self.app.stats.overall()
+        self.total_score_label.configure(text=f"Total Score: {overall.total_score}")
+        self.success_rate_label.configure(text=f"Success Rate: {overall.success_rate:.2f}%")
+
+        self.show_forecast()
+        self.deck_stats_list.refresh()
 
+    def build_statistics_screen(self, screen):
+        """
+        Build the overall statistics screen once; show_statistics updates it.
+        """
         header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+            screen, fg_color="#3498db", corner_radius=0
         )
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(
@@ -24,54 +49,8 @@ class Statistics:
             text_color="white",
         ).pack(pady=20)
 
-        stats_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
-        stats_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-        total_correct = sum(
-            card.correct_count for deck in self.app.flashcard_sets for card in deck.cards
-        )
-        total_reviews = sum(
-            card.review_count for deck in self.app.flashcard_sets for card in deck.cards
-        )
-
-        if total_reviews == 0:
-            success_rate = 0
-        else:
-            success_rate = (total_correct / total_reviews) * 100
-
-        ctk.CTkLabel(
-            stats_frame, text=f"Total Score: {total_correct}", font=("Roboto", 18)
-        ).pack(pady=10)
-        ctk.CTkLabel(
-            stats_frame, text=f"Success Rate: {success_rate:.2f}%", font=("Roboto", 18)
-        ).pack(pady=10)
-
-        individual_stats_frame = ctk.CTkScrollableFrame(stats_frame, fg_color="white")
-        individual_stats_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
-
-        for deck in self.app.flashcard_sets:
-            deck_frame = ctk.CTkFrame(
-                individual_stats_frame, fg_color="white", corner_radius=10
-            )
-            deck_frame.pack(fill=tk.X, pady=5)
-
-            deck_score = deck.total_score()
-            deck_success_rate = deck.success_rate()
-
-            ctk.CTkLabel(
-                deck_frame, text=f"Deck: {deck.title}", font=("Roboto", 14, "bold")
-            ).pack(anchor="w", padx=15, pady=(10, 5))
-            ctk.CTkLabel(
-                deck_frame, text=f"Score: {deck_score}", font=("Roboto", 12)
-            ).pack(anchor="w", padx=15, pady=(0, 5))
-            ctk.CTkLabel(
-                deck_frame,
-                text=f"Success Rate: {deck_success_rate:.2f}%",
-                font=("Roboto", 12),
-            ).pack(anchor="w", padx=15, pady=(0, 10))
-
         back_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Back to Decks",
             command=self.app.deck_manager.show_deck_manager,
             fg_color="#95a5a6",
@@ -81,71 +60,135 @@ class Statistics:
         )
         back_button.pack(padx=20, pady=(0, 20), fill=tk.X, side=tk.BOTTOM)
 
-    def show_individual_statistics(self, set_index):
+        stats_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        self.total_score_label = ctk.CTkLabel(stats_frame, text="", font=("Roboto", 18))
+        self.total_score_label.pack(pady=10)
+        self.success_rate_label = ctk.CTkLabel(stats_frame, text="", font=("Roboto", 18))
+        self.success_rate_label.pack(pady=10)
+
+        ctk.CTkLabel(stats_frame, text="Upcoming Reviews", font=("Roboto", 16, "bold")).pack(pady=(10, 0))
+        self.forecast_label = ctk.CTkLabel(stats_frame, text="", font=("Roboto", 14))
+        self.forecast_label.pack(pady=(0, 10))
+
+        # Scrollable list with widgets only for the visible decks
+        self.deck_stats_list = VirtualList(
+            stats_frame, create_row=self.create_deck_stats_row, bind_row=self.bind_deck_stats_row, background="white"
+        )
+        self.deck_stats_list.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
+        self.deck_stats_list.set_items(self.app.flashcard_sets)
+
+    def create_deck_stats_row(self, parent):
         """
-        Show the statistics of a specific flashcard set. Includes the total score and success rate of the flashcard set.
+        Create a row of the per-deck statistics; bind_deck_stats_row fills it with the statistics of a deck.
         """
-        self.app.current_set = self.app.flashcard_sets[set_index]
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        deck_frame = ctk.CTkFrame(parent, fg_color="white", corner_radius=10)
+        deck_frame.title_label = ctk.CTkLabel(deck_frame, text="", font=("Roboto", 14, "bold"))
+        deck_frame.title_label.pack(anchor="w", padx=15, pady=(10, 5))
+        deck_frame.score_label = ctk.CTkLabel(deck_frame, text="", font=("Roboto", 12))
+        deck_frame.score_label.pack(anchor="w", padx=15, pady=(0, 5))
+        deck_frame.success_rate_label = ctk.CTkLabel(deck_frame, text="", font=("Roboto", 12))
+        deck_frame.success_rate_label.pack(anchor="w", padx=15, pady=(0, 5))
+        deck_frame.due_label = ctk.CTkLabel(deck_frame, text="", font=("Roboto", 12))
+        deck_frame.due_label.pack(anchor="w", padx=15, pady=(0, 10))
+        return deck_frame
+
+    def bind_deck_stats_row(self, deck_frame, deck):
+        stats = self.app.stats.deck_stats(deck, self.workload)
+        deck_frame.title_label.configure(text=f"Deck: {stats.title}")
+        deck_frame.score_label.configure(text=f"Score: {stats.score}")
+        deck_frame.success_rate_label.configure(text=f"Success Rate: {stats.success_rate:.2f}%")
+        if stats.due_soon is not None:
+            due_text = f"Reviews due in the next {DUE_SOON_DAYS} days: {stats.due_soon}"
+        else:
+            due_text = ""
+        deck_frame.due_label.configure(text=due_text)
 
-        header_frame = ctk.CTkFrame(
-            self.app.main_frame, fg_color="#3498db", corner_radius=0
+    def show_forecast(self):
+        """
+        Update the "Upcoming Reviews" section: the number of reviews forecast for the next 7, 30 and 90 days over
+        all decks. A cached forecast is shown right away if the library has not changed since it was made.
+        Otherwise the decks that changed are forecast again on a worker thread, and the section and the deck rows
+        are updated when it finishes.
+        """
+        stats = self.app.stats
+        if not stats.forecast_available:
+            self.workload = None
+            self.forecast_label.configure(text="Install numpy to see the review forecast.", font=("Roboto", 12))
+            return
+
+        workload = stats.current_forecast()
+        if workload is not None:
+            self.show_workload(workload)
+            return
+        self.workload = None
+        self.forecast_label.configure(text="Calculating...")
+        if self.forecast_task is not None:
+            # show_forecast is called again when the running task finishes
+            return
+        snapshot = stats.forecast_snapshot()
+        if not snapshot.stale:
+            # Only decks were removed or reordered
+            self.show_workload(stats.update_forecast(snapshot, []))
+            return
+        self.forecast_task = self.app.tasks.submit(
+            lambda task: stats.simulate_forecast(snapshot),
+            on_done=lambda daily_due: self.forecast_done(snapshot, daily_due),
+            on_error=self.forecast_failed,
         )
-        header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(
-            header_frame,
-            text=f"Statistics: {self.app.current_set.title}",
-            font=("Roboto", 24, "bold"),
-            text_color="white",
-        ).pack(pady=20)
 
-        stats_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
-        stats_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+    def forecast_done(self, snapshot, daily_due):
+        """
+        Store the forecast computed by the worker and show it if the statistics screen is still shown.
+        """
+        self.forecast_task = None
+        self.app.stats.update_forecast(snapshot, daily_due)
+        if self.app.screens.is_shown("statistics"):
+            # If the library changed in the meantime, only the decks that changed are forecast again
+            self.show_forecast()
+            self.deck_stats_list.refresh()
+
+    def forecast_failed(self, error):
+        self.forecast_task = None
+        self.forecast_label.configure(text=f"The forecast could not be calculated: {error}", font=("Roboto", 12))
+
+    def show_workload(self, workload):
+        self.workload = workload
+        self.forecast_label.configure(
+            text=" | ".join(f"{days} days: {workload.total(days)}" for days in (7, 30, FORECAST_DAYS))
+        )
+
+    def show_individual_statistics(self, deck_id):
+        """
+        Show the statistics of a specific flashcard set. Includes the total score and success rate of the flashcard set
+        and a table of the statistics of its cards.
+        """
+        self.app.current_set = self.app.flashcard_sets.get(deck_id)
+        self.app.screens.show("deck_statistics", self.build_individual_statistics)
 
+        self.deck_title_label.configure(text=f"Statistics: {self.app.current_set.title}")
         total_score = self.app.current_set.total_score()
         success_rate = self.app.current_set.success_rate()
+        self.deck_score_label.configure(text=f"Total Score: {total_score}")
+        self.deck_success_rate_label.configure(text=f"Success Rate: {success_rate:.2f}%")
+        self.card_table.set_deck(self.app.current_set)
 
-        ctk.CTkLabel(
-            stats_frame, text=f"Total Score: {total_score}", font=("Roboto", 18)
-        ).pack(pady=10)
-        ctk.CTkLabel(
-            stats_frame, text=f"Success Rate: {success_rate:.2f}%", font=("Roboto", 18)
-        ).pack(pady=10)
-
-        stats_scroll_frame = ctk.CTkScrollableFrame(stats_frame, fg_color="white")
-        stats_scroll_frame.pack(fill=tk.BOTH, expand=True)
-
-        for i, card in enumerate(self.app.current_set.cards):
-            card_frame = ctk.CTkFrame(
-                stats_scroll_frame, fg_color="white", corner_radius=10
-            )
-            card_frame.pack(fill=tk.X, pady=5)
-
-            ctk.CTkLabel(
-                card_frame, text=f"Q: {card.front}", font=("Roboto", 14, "bold")
-            ).pack(anchor="w", padx=15, pady=(10, 5))
-            ctk.CTkLabel(card_frame, text=f"A: {card.back}", font=("Roboto", 12)).pack(
-                anchor="w", padx=15, pady=(0, 10)
-            )
-            ctk.CTkLabel(
-                card_frame,
-                text=f"Reviewed: {card.review_count} times",
-                font=("Roboto", 12),
-            ).pack(anchor="w", padx=15, pady=(0, 10))
-            ctk.CTkLabel(
-                card_frame,
-                text=f"Correct: {card.correct_count} times",
-                font=("Roboto", 12),
-            ).pack(anchor="w", padx=15, pady=(0, 10))
-            ctk.CTkLabel(
-                card_frame,
-                text=f"Success Rate: {card.success_rate():.2f}%",
-                font=("Roboto", 12),
-            ).pack(anchor="w", padx=15, pady=(0, 10))
+    def build_individual_statistics(self, screen):
+        header_frame = ctk.CTkFrame(
+            screen, fg_color="#3498db", corner_radius=0
+        )
+        header_frame.pack(fill=tk.X, pady=(0, 20))
+        self.deck_title_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("Roboto", 24, "bold"),
+            text_color="white",
+        )
+        self.deck_title_label.pack(pady=20)
 
         back_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Back to Decks",
             command=self.app.deck_manager.show_deck_manager,
             fg_color="#95a5a6",
@@ -154,3 +197,15 @@ class Statistics:
             corner_radius=10,
         )
         back_button.pack(padx=20, pady=(0, 20), fill=tk.X, side=tk.BOTTOM)
+
+        stats_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        self.deck_score_label = ctk.CTkLabel(stats_frame, text="", font=("Roboto", 18))
+        self.deck_score_label.pack(pady=10)
+        self.deck_success_rate_label = ctk.CTkLabel(stats_frame, text="", font=("Roboto", 18))
+        self.deck_success_rate_label.pack(pady=10)
+
+        # Paged, sortable table with a row per card of the current page
+        self.card_table = CardStatsTable(stats_frame)
+        self.card_table.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
@@ -0,0 +1,165 @@
+import math
+import tkinter as tk
+import customtkinter as ctk
+
+from .render_scheduler import render_scheduler
+from .scroll_dispatcher import scroll_dispatcher
+
+# Pixels scrolled per unit of the scrollbar arrows and the mouse wheel
+SCROLL_UNIT = 30
+# Rows kept bound above and below the visible ones
+BUFFER_ROWS = 2
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list of rows of equal height that only has widgets for the visible rows.
+
+    Rows are created with create_row(parent) and filled with bind_row(row, item). A small pool of rows, enough to
+    cover the visible area plus BUFFER_ROWS above and below, is reused while scrolling: the row for item i is always
+    pool[i % len(pool)], so scrolling by one row rebinds a single row. The time to show the list does not depend on
+    the number of items. Only the rows for the visible area are created before the list is first drawn; the
+    buffer rows are created afterwards by the RenderScheduler.
+    """
+
+    def __init__(self, master, create_row, bind_row, background="#F0F0F0", row_gap=10, **kwargs):
+        super().__init__(master, fg_color=background, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_gap = row_gap
+        self.items = []
+        self.row_height = None
+        # Pixel offset of the top of the viewport in the full list
+        self.top = 0
+        # Pool of (holder, row) pairs and the index of the item each pool slot shows (None if unbound)
+        self.pool = []
+        self.bound = []
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.viewport = tk.Frame(self, bg=background, highlightthickness=0)
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.viewport.bind("<Configure>", lambda event: self._layout())
+        scroll_dispatcher(self).register(self, self.scroll_units)
+        self.scheduler = render_scheduler(self)
+
+    def set_items(self, items):
+        """
+        Show the given sequence of items. The sequence must support len() and indexing.
+        """
+        self.items = items
+        self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        """
+        Rebind all visible rows, after items were added, removed or changed.
+        """
+        self.bound = [None] * len(self.pool)
+        self._layout()
+
+    def scroll_to(self, index):
+        """
+        Scroll so that the item at the given index is visible.
+        """
+        if self.row_height is None:
+            return
+        height = self.viewport.winfo_height()
+        row_top = index * self.row_height
+        if row_top < self.top:
+            self.top = row_top
+        elif row_top + self.row_height > self.top + height:
+            self.top = row_top + self.row_height - height
+        self._layout()
+
+    def yview(self, *args):
+        """
+        Scroll the list. Takes the arguments of the scrollbar command: ("moveto", fraction) or
+        ("scroll", number, "units" or "pages").
+        """
+        if not args or self.row_height is None:
+            return
+        height = self.viewport.winfo_height()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items) * self.row_height)
+        elif args[0] == "scroll":
+            step = height if args[2] == "pages" else SCROLL_UNIT
+            self.top += int(float(args[1]) * step)
+        self._layout()
+
+    def scroll_units(self, units):
+        """
+        Scroll by the given number of units, as the mouse wheel does.
+        """
+        self.yview("scroll", units, "units")
+
+    def _new_row(self):
+        # Each row sits in a plain Tk frame of fixed pixel height that is placed in the viewport
+        holder = tk.Frame(self.viewport, bg=self.viewport.cget("bg"), highlightthickness=0)
+        row = self.create_row(holder)
+        row.pack(fill=tk.X)
+        if self.row_height is None:
+            holder.update_idletasks()
+            self.row_height = row.winfo_reqheight() + self.row_gap
+        holder.configure(height=self.row_height - self.row_gap)
+        holder.pack_propagate(False)
+        return holder, row
+
+    def _ensure_pool(self, height):
+        if not self.pool:
+            self.pool.append(self._new_row())
+            self.bound.append(None)
+        # The rows for the visible area are created right away, the buffer rows in slices afterwards
+        visible = math.ceil(height / self.row_height) + 1
+        if visible > len(self.pool):
+            self._grow_pool(visible)
+        if visible + 2 * BUFFER_ROWS > len(self.pool):
+            self.scheduler.run(self, self._build_buffer_rows(visible + 2 * BUFFER_ROWS))
+
+    def _grow_pool(self, size):
+        while len(self.pool) < size:
+            self.pool.append(self._new_row())
+        # Slots depend on the pool size, so every row has to be rebound
+        self.bound = [None] * len(self.pool)
+
+    def _build_buffer_rows(self, size):
+        while len(self.pool) < size:
+            self._grow_pool(len(self.pool) + 1)
+            yield
+        self._layout()
+
+    def _layout(self):
+        """
+        Place and bind the rows for the current scroll position.
+        """
+        height = self.viewport.winfo_height()
+        if height <= 1 or not self.items:
+            for holder, _ in self.pool:
+                holder.place_forget()
+            self.scrollbar.set(0, 1)
+            return
+        self._ensure_pool(height)
+        count = len(self.items)
+        total = count * self.row_height
+        self.top = max(0, min(self.top, total - height))
+        first_visible = self.top // self.row_height
+        last_visible = (self.top + height) // self.row_height + 1
+        # Until the RenderScheduler has built the buffer rows, the pool only covers the visible rows, and bound rows
+        # must not share a slot
+        buffer = min(BUFFER_ROWS, (len(self.pool) - (last_visible - first_visible)) // 2)
+        first = max(0, first_visible - buffer)
+        last = min(count, last_visible + buffer)
+        used = set()
+        for index in range(first, last):
+            slot = index % len(self.pool)
+            holder, row = self.pool[slot]
+            if self.bound[slot] != index:
+                self.bind_row(row, self.items[index])
+                self.bound[slot] = index
+            holder.place(x=0, y=index * self.row_height - self.top, relwidth=1)
+            used.add(slot)
+        for slot, (holder, _) in enumerate(self.pool):
+            if slot not in used:
+                holder.place_forget()
+                self.bound[slot] = None
+        self.scrollbar.set(self.top / total, min(1, (self.top + height) / total))
@@ -1,9 +1,14 @@
+from utils.startup_timer import StartupTimer
+
+# Created before the other imports, so that the startup phases include them
+startup_timer = StartupTimer()
+
 import tkinter as tk
-from gui.flashcard_gui import FlashcardGUI
+
+with startup_timer.phase("import gui"):
+    from gui.flashcard_gui import FlashcardGUI
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = FlashcardGUI(root)
+    app = FlashcardGUI(root, startup_timer)
     root.mainloop()
-
-
@@ -0,0 +1,59 @@
+"""
+Run the deck server on the application's database and review log:
+
+    python -m server --port 8765
+
+Do not run the GUI on the same database at the same time: each of them only writes the changes it made itself
+and would overwrite the other's cards.
+"""
+import argparse
+import asyncio
+import signal
+
+from cards.review_log import ReviewLog
+from utils.storage import SQLiteStorage
+
+from .app import FLUSH_INTERVAL, DeckServer
+
+# The files of the GUI (gui.flashcard_gui), repeated here so the server does not import Tk
+DATABASE_PATH = "flashcards.db"
+REVIEW_LOG_PATH = "reviews.log"
+
+
+async def serve(args):
+    storage = SQLiteStorage(args.db)
+    library = storage.load_library()
+    review_log = ReviewLog(args.log)
+    review_log.catch_up(library)
+    server = DeckServer(library, storage, review_log, args.flush_interval)
+    await server.start(args.host, args.port)
+    print(f"Serving {len(library)} decks on http://{args.host}:{args.port}/decks")
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stopped.set)
+        except NotImplementedError:
+            # Windows: Ctrl+C raises KeyboardInterrupt instead, and the finally block still saves
+            pass
+    try:
+        await stopped.wait()
+    finally:
+        await server.close()
+        storage.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the flashcard library over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=DATABASE_PATH, help="SQLite database of the library")
+    parser.add_argument("--log", default=REVIEW_LOG_PATH, help="review log file")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL,
+                        help="seconds between writes of the reviews to the database")
+    asyncio.run(serve(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
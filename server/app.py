@@ -0,0 +1,241 @@
+"""
+Local HTTP/JSON server that shares one deck library with many study clients.
+
+Endpoints:
+
+    GET  /decks                            list of the decks with their card counts and scores
+    GET  /decks/<deck id>/cards?offset=&limit=   a page of the cards of a deck
+    GET  /decks/<deck id>/due?limit=       the cards of a deck that are due for review, most overdue first
+    POST /decks/<deck id>/reviews          [{"card_id": ..., "correct": true, "response_time": 2.5}, ...]
+
+Everything runs on one asyncio event loop, so the library is only changed from one thread, as in the GUI. GET
+responses are cached as encoded JSON, keyed by the library or deck version they were made for, so repeated reads
+of an unchanged deck cost a dictionary lookup. Reviews are applied to the cards and appended to the review log
+at once, and the storage writes the changed cards in one transaction every FLUSH_INTERVAL seconds.
+"""
+import asyncio
+from collections import OrderedDict
+
+from cards.flashcard import CARD_FIELDS
+from core.stats import StatsService
+
+from .protocol import HTTPError, encode_json, read_request, response_bytes
+
+# Default and largest number of cards per page, and default number of due cards
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DUE_LIMIT = 20
+# Largest number of reviews in one request
+MAX_REVIEWS = 1000
+# Seconds between writes of the pending changes to the storage
+FLUSH_INTERVAL = 1.0
+# Number of encoded responses kept in the cache
+CACHE_SIZE = 1024
+
+
+class ResponseCache:
+    """
+    Least recently used cache of encoded response bodies. Keys contain the versions of the data they were made
+    from, so a change never has to invalidate entries: outdated entries are simply no longer asked for and fall
+    out of the cache.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, make):
+        """
+        Return the body cached under key, creating it with make() if it is not cached.
+        """
+        body = self.entries.get(key)
+        if body is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return body
+        self.misses += 1
+        body = self.entries[key] = make()
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return body
+
+
+class DeckServer:
+    """
+    Serves a FlashCardLibrary over HTTP. storage (a SQLiteStorage tracking the library) and review_log are
+    optional; without them reviews only change the library in memory.
+    """
+
+    def __init__(self, library, storage=None, review_log=None, flush_interval=FLUSH_INTERVAL):
+        self.library = library
+        self.storage = storage
+        self.review_log = review_log
+        self.flush_interval = flush_interval
+        self.stats = StatsService(library)
+        self.cache = ResponseCache()
+        self.server = None
+        self._flush_task = None
+        # Library version at the last flush, so idle intervals do not write to the database
+        self._flushed_version = library.version
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self._flush_task = asyncio.ensure_future(self._flush_periodically())
+        return self.server
+
+    async def close(self):
+        """
+        Stop accepting connections and write all pending changes.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.flush()
+
+    def flush(self):
+        self._flushed_version = self.library.version
+        # The review log first, so the saved log offset never points behind the end of the log file
+        if self.review_log is not None:
+            self.review_log.flush()
+        if self.storage is not None:
+            self.storage.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.library.version != self._flushed_version:
+                self.flush()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answer the requests of one connection until the client closes it or asks to close it.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    # The rest of a malformed request cannot be told apart from the next one, so the connection
+                    # is closed after the error
+                    writer.write(response_bytes(e.status, encode_json({"error": e.message}), keep_alive=False))
+                    await writer.drain()
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                if request is None:
+                    break
+                keep_alive = request.keep_alive
+                try:
+                    status, body = 200, self.dispatch(request)
+                except HTTPError as e:
+                    status, body = e.status, encode_json({"error": e.message})
+                except Exception as e:
+                    status, body = 500, encode_json({"error": str(e)})
+                writer.write(response_bytes(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def dispatch(self, request):
+        """
+        Return the encoded JSON body answering the request, or raise HTTPError.
+        """
+        parts = request.path.strip("/").split("/")
+        if parts == ["decks"]:
+            self._require_method(request, "GET")
+            return self.cache.get(("decks", self.library.version), self.deck_list)
+        if len(parts) == 3 and parts[0] == "decks":
+            flashcard_set = self._deck(parts[1])
+            if parts[2] == "cards":
+                self._require_method(request, "GET")
+                offset = request.int_param("offset", 0)
+                limit = request.int_param("limit", PAGE_SIZE, 1, MAX_PAGE_SIZE)
+                return self.cache.get(
+                    ("cards", flashcard_set.id, flashcard_set.version, offset, limit),
+                    lambda: self.card_page(flashcard_set, offset, limit),
+                )
+            if parts[2] == "due":
+                self._require_method(request, "GET")
+                limit = request.int_param("limit", DUE_LIMIT, 1, MAX_PAGE_SIZE)
+                # Due cards depend on the time as well, so they are not cached
+                return encode_json([_card_data(card) for card in flashcard_set.due_cards(limit)])
+            if parts[2] == "reviews":
+                self._require_method(request, "POST")
+                return encode_json({"recorded": self.record_reviews(flashcard_set, request.json())})
+        raise HTTPError(404, f"no such resource: {request.path}")
+
+    def _require_method(self, request, method):
+        if request.method != method:
+            raise HTTPError(405, f"{request.path} only supports {method}")
+
+    def _deck(self, deck_id):
+        try:
+            return self.library.get(deck_id)
+        except KeyError:
+            raise HTTPError(404, f"no deck with id {deck_id}")
+
+    def deck_list(self):
+        decks = []
+        for flashcard_set in self.library:
+            stats = self.stats.deck_stats(flashcard_set)
+            decks.append({
+                "id": stats.deck_id,
+                "title": stats.title,
+                "card_count": stats.card_count,
+                "score": stats.score,
+                "success_rate": stats.success_rate,
+                "version": flashcard_set.version,
+            })
+        return encode_json(decks)
+
+    def card_page(self, flashcard_set, offset, limit):
+        cards = flashcard_set.cards
+        return encode_json({
+            "deck_id": flashcard_set.id,
+            "version": flashcard_set.version,
+            "offset": offset,
+            "total": len(cards),
+            "cards": [_card_data(card) for card in cards[offset:offset + limit]],
+        })
+
+    def record_reviews(self, flashcard_set, reviews):
+        """
+        Apply a list of reviews of cards of the deck and return how many were recorded. The list is checked
+        completely before the first review is applied, so a bad request changes nothing.
+        """
+        if not isinstance(reviews, list) or len(reviews) > MAX_REVIEWS:
+            raise HTTPError(400, f"expected a list of at most {MAX_REVIEWS} reviews")
+        checked = []
+        for review in reviews:
+            try:
+                card_id = review["card_id"]
+                correct = review["correct"]
+                response_time = float(review.get("response_time", 0.0))
+            except (TypeError, KeyError, ValueError):
+                raise HTTPError(400, "every review needs a card_id and correct")
+            if not isinstance(correct, bool):
+                raise HTTPError(400, "correct must be true or false")
+            if not isinstance(card_id, int) or not flashcard_set.cards.has(card_id):
+                raise HTTPError(404, f"no card with id {card_id} in deck {flashcard_set.id}")
+            checked.append((card_id, correct, response_time))
+        for card_id, correct, response_time in checked:
+            card = flashcard_set.cards.get(card_id)
+            if self.review_log is not None:
+                self.review_log.record_review(card, correct, response_time, self.library)
+            elif correct:
+                card.mark_correct()
+            else:
+                card.mark_incorrect()
+        return len(checked)
+
+
+def _card_data(card):
+    return dict(zip(CARD_FIELDS, card.record()))
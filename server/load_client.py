@@ -0,0 +1,145 @@
+"""
+Load client for the deck server. Opens a number of keep-alive connections to a running server, each of which
+repeatedly lists the decks, fetches a random page of cards of a random deck and its due cards and submits reviews
+of them, then reports the requests per second and the latency percentiles per endpoint:
+
+    python -m server.load_client --port 8765 --connections 50 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from .protocol import encode_json
+
+# Share of the review submissions that are correct answers
+CORRECT_SHARE = 0.8
+PERCENTILES = (50, 90, 99)
+
+
+class Connection:
+    """
+    One persistent HTTP/1.1 connection to the server.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, method, target, data=None):
+        """
+        Send a request and return (status, decoded JSON body) of the response.
+        """
+        body = b"" if data is None else encode_json(data)
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("the server closed the connection")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        self.writer.close()
+
+
+async def timed_request(connection, latencies, endpoint, method, target, data=None):
+    start = time.perf_counter()
+    status, body = await connection.request(method, target, data)
+    latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+    if status != 200:
+        raise RuntimeError(f"{method} {target} returned {status}: {body}")
+    return body
+
+
+async def client(host, port, deadline, latencies, rng, page_size, reviews_per_request):
+    """
+    Run study rounds on one connection until the deadline.
+    """
+    connection = await Connection.open(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            decks = await timed_request(connection, latencies, "decks", "GET", "/decks")
+            decks = [deck for deck in decks if deck["card_count"]]
+            if not decks:
+                raise RuntimeError("the server has no cards to study")
+            deck = rng.choice(decks)
+            offset = rng.randrange(0, deck["card_count"], page_size)
+            await timed_request(
+                connection, latencies, "cards", "GET", f"/decks/{deck['id']}/cards?offset={offset}&limit={page_size}"
+            )
+            due = await timed_request(
+                connection, latencies, "due", "GET", f"/decks/{deck['id']}/due?limit={reviews_per_request}"
+            )
+            reviews = [
+                {"card_id": card["id"], "correct": rng.random() < CORRECT_SHARE,
+                 "response_time": round(rng.uniform(1, 10), 2)}
+                for card in due
+            ]
+            if reviews:
+                await timed_request(connection, latencies, "reviews", "POST", f"/decks/{deck['id']}/reviews", reviews)
+    finally:
+        connection.close()
+
+
+def percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+def report(latencies, seconds):
+    """
+    Print the request rate and the latency percentiles of every endpoint and of all requests together.
+    """
+    every = sorted(value for values in latencies.values() for value in values)
+    rows = [(endpoint, sorted(values)) for endpoint, values in sorted(latencies.items())] + [("all", every)]
+    print(f"{'endpoint':<10} {'requests':>9} {'req/s':>9} " + " ".join(f"{'p%d ms' % p:>9}" for p in PERCENTILES))
+    for endpoint, values in rows:
+        if not values:
+            continue
+        print(
+            f"{endpoint:<10} {len(values):>9} {len(values) / seconds:>9.0f} "
+            + " ".join(f"{percentile(values, p) * 1000:>9.2f}" for p in PERCENTILES)
+        )
+
+
+async def run(args):
+    latencies = {}
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    await asyncio.gather(*(
+        client(args.host, args.port, deadline, latencies, random.Random(args.seed + number), args.page_size,
+               args.reviews)
+        for number in range(args.connections)
+    ))
+    report(latencies, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a running deck server over keep-alive connections.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--reviews", type=int, default=5, help="reviews submitted per round")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
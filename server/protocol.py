@@ -0,0 +1,133 @@
+"""
+A minimal HTTP/1.1 implementation on asyncio streams, just enough for the JSON API of the deck server: requests
+with a Content-Length body, JSON responses and persistent (keep-alive) connections.
+"""
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+# Limits protecting the server from oversized requests
+MAX_HEADER_LINES = 100
+MAX_BODY_SIZE = 1 << 20
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """
+    An error that is answered with the given status and a JSON body {"error": message}.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+
+    @property
+    def keep_alive(self):
+        """
+        Return True if the connection stays open after the response: the default of HTTP/1.1, opt-in for HTTP/1.0.
+        """
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self):
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "the request body is not valid JSON")
+
+    def int_param(self, name, default, minimum=0, maximum=None):
+        """
+        Return the query parameter name as an integer between minimum and maximum.
+        """
+        value = self.query.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise HTTPError(400, f"{name} must be an integer")
+        if number < minimum or (maximum is not None and number > maximum):
+            raise HTTPError(400, f"{name} must be between {minimum} and {maximum}")
+        return number
+
+
+async def _read_line(reader, status, message):
+    """
+    Read a line from the stream, raising HTTPError(status, message) if it is longer than the stream's limit.
+    """
+    try:
+        return await reader.readline()
+    except ValueError:
+        # readline turns asyncio.LimitOverrunError into ValueError
+        raise HTTPError(status, message)
+
+
+async def read_request(reader):
+    """
+    Read the next request from the stream. Returns None if the client closed the connection between requests.
+    """
+    request_line = await _read_line(reader, 400, "the request line is too long")
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await _read_line(reader, 431, "a header line is too long")
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(431, "too many header lines")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "malformed Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, "the request body is too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method, target, version, headers, body)
+
+
+def encode_json(data):
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def response_bytes(status, body, keep_alive=True):
+    """
+    Return a complete HTTP response with the given status and an already encoded JSON body.
+    """
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from cards.card_store import CardList, CompactCardStore, RowIndex
+from cards.flashcard import FlashCard
+
+
+class Rows:
+    """
+    The rows a RowIndex indexes: the card id stored in every row.
+    """
+
+    def __init__(self):
+        self.ids = []
+
+    def row_id(self, row):
+        return self.ids[row]
+
+
+@pytest.mark.parametrize("stride", [1, 8, 64])
+def test_row_index_matches_a_dict(stride):
+    # Ids that are multiples of a power of two collide in the low bits the index hashes on
+    rng = random.Random(stride)
+    rows = Rows()
+    index = RowIndex(rows.row_id)
+    expected = {}
+    free_ids = list(range(0, 5000 * stride, stride))
+    rng.shuffle(free_ids)
+    for _ in range(3000):
+        if expected and rng.random() < 0.4:
+            card_id = rng.choice(list(expected))
+            index.discard(card_id)
+            del expected[card_id]
+            rows.ids[rows.ids.index(card_id)] = None
+        else:
+            card_id = free_ids.pop()
+            rows.ids.append(card_id)
+            index.set(card_id, len(rows.ids) - 1)
+            expected[card_id] = len(rows.ids) - 1
+        for probe in rng.sample(range(0, 5000 * stride, stride), 20) + list(expected)[-5:]:
+            assert index.get(probe) == expected.get(probe)
+    assert all(index.get(card_id) == row for card_id, row in expected.items())
+
+
+def test_row_index_discard_of_a_missing_id():
+    rows = Rows()
+    index = RowIndex(rows.row_id)
+    rows.ids.append(8)
+    index.set(8, 0)
+    index.discard(16)
+    assert index.get(8) == 0
+    assert index.get(16) is None
+
+
+def test_row_index_rebuild():
+    rows = Rows()
+    index = RowIndex(rows.row_id)
+    rows.ids.extend(range(0, 640, 64))
+    index.rebuild(len(rows.ids))
+    assert [index.get(card_id) for card_id in rows.ids] == list(range(len(rows.ids)))
+    assert index.get(1) is None
+
+
+@pytest.mark.parametrize("store_type", [CardList, CompactCardStore])
+def test_store_matches_a_list(store_type):
+    rng = random.Random(0)
+    store = store_type()
+    expected = []
+    ids = rng.sample(range(0, 64 * 1000, 64), 400)
+    for card_id in ids:
+        operation = rng.random()
+        if operation < 0.3 and expected:
+            position = rng.randrange(len(expected))
+            store[position] = FlashCard("replaced", "back", card_id=card_id)
+            expected[position] = card_id
+        elif operation < 0.4 and expected:
+            # A replacement with the same id keeps it
+            position = rng.randrange(len(expected))
+            store[position] = FlashCard("edited", "back", card_id=expected[position])
+        elif operation < 0.6 and expected:
+            store.discard(expected.pop(rng.randrange(len(expected))))
+        else:
+            store.append(FlashCard("front", "back", card_id=card_id))
+            expected.append(card_id)
+        for probe in ids:
+            assert store.has(probe) == (probe in expected)
+    assert [card.id for card in store] == expected
+    assert all(store.get(card_id).id == card_id for card_id in expected)
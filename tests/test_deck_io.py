@@ -0,0 +1,111 @@
+import io
+import json
+
+import pytest
+
+from cards.flashcard_set import FlashCardSet
+from utils.deck_io import JSONStream, iter_deck_file, iter_flashcard_sets, write_deck_file
+
+DECKS = [
+    {
+        "id": "deck-1",
+        "title": "Farben",
+        "cards": [
+            {"id": 1, "front": "blue", "back": "blau", "review_count": 3, "correct_count": 2, "ease": 2.36,
+             "interval": 6.0, "repetitions": 2, "due": 1700000000.5},
+            {"id": 2, "front": "white \"snow\"", "back": "weiß ❄ \\ 😀", "review_count": 0,
+             "correct_count": 0},
+            {"id": 3, "front": "line\nbreak", "back": "x" * 300},
+        ],
+    },
+    {"id": "deck-2", "title": "Empty", "cards": []},
+    {"id": "deck-3", "title": "Numbers", "device": "device", "cards": [
+        {"id": 12345678901234567, "front": "1e3", "back": "-0.5", "review_count": 12345, "correct_count": 1}
+    ]},
+]
+
+
+def document(decks=DECKS, indent=None):
+    return json.dumps(decks, indent=indent, ensure_ascii=False).encode("utf-8")
+
+
+def parse(data, compact=False):
+    return [flashcard_set.to_dict() for flashcard_set in iter_flashcard_sets(io.BytesIO(data), compact)]
+
+
+def expected(decks=DECKS, compact=False):
+    return [FlashCardSet.from_dict(deck, compact).to_dict() for deck in decks]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("compact", [False, True])
+def test_parses_like_json_load(indent, compact):
+    assert parse(document(indent=indent), compact) == expected(compact=compact)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_values_split_across_chunks(chunk_size):
+    values = [{"a": [1, 2.5, -3e-7]}, "weiß \\\" 😀", 12345678901234567890, True, None, [], {}]
+    data = (" [ " + json.dumps(values, ensure_ascii=False)[1:]).encode("utf-8")
+    stream = JSONStream(io.BytesIO(data), chunk_size=chunk_size)
+    assert list(stream.array_values()) == values
+    stream.end()
+
+
+def test_reports_progress():
+    data = document()
+    reports = []
+    parse_with_progress = iter_flashcard_sets(io.BytesIO(data), progress=lambda *report: reports.append(report))
+    assert len(list(parse_with_progress)) == len(DECKS)
+    assert reports[-1][0] == len(data)
+
+
+def test_empty_and_non_array_documents():
+    assert parse(b" [ ] ") == []
+    with pytest.raises(TypeError):
+        parse(b"7")
+
+
+def test_every_truncation_fails():
+    data = document(indent=1)
+    for end in range(len(data.rstrip())):
+        with pytest.raises(ValueError):
+            parse(data[:end])
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda text: text.replace('"cards": [{', '"cards": [{,', 1),
+    lambda text: text.replace('"title"', '"title" "', 1),
+    lambda text: text.replace("}, {", "} {", 1),
+    lambda text: text.replace("3,", "3x,", 1),
+    lambda text: text.replace('"Empty"', "Empty", 1),
+    lambda text: text + " []",
+    lambda text: text.replace("\\\\", "\\q", 1),
+])
+def test_corrupt_documents_fail_like_json_load(corrupt):
+    data = corrupt(document().decode("utf-8")).encode("utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(data)
+    with pytest.raises(json.JSONDecodeError):
+        parse(data)
+
+
+def test_missing_fields_fail_like_from_dict():
+    with pytest.raises(KeyError):
+        parse(b'[{"id": "deck", "cards": []}]')
+    with pytest.raises(KeyError):
+        parse(b'[{"title": "No cards"}]')
+    with pytest.raises(KeyError):
+        parse(b'[{"title": "Deck", "cards": [{"front": "only a front"}]}]')
+
+
+@pytest.mark.parametrize("name", ["decks.json", "decks.ndjson", "decks.json.gz", "decks.jsonl.xz"])
+def test_deck_files_round_trip(tmp_path, name):
+    decks = [FlashCardSet.from_dict(deck) for deck in DECKS]
+    decks[0].rename("Colours", now=1000.5)
+    decks[0].edit_card(1, "light blue", "hellblau", now=2000.5)
+    path = str(tmp_path / name)
+    write_deck_file(path, decks)
+    read = list(iter_deck_file(path))
+    assert [flashcard_set.to_dict() for flashcard_set in read] == [deck.to_dict() for deck in decks]
+    assert [flashcard_set.source_hash for flashcard_set in read] == [deck.to_dict()["hash"] for deck in decks]
@@ -0,0 +1,34 @@
+from cards.flashcard_set import FlashCardSet
+from cards.library import FlashCardLibrary
+from cards.review_log import ReviewLog
+
+
+def test_catch_up_applies_the_events_after_the_offset(tmp_path):
+    library = FlashCardLibrary()
+    deck, compact_deck = FlashCardSet("Deck"), FlashCardSet("Compact", compact=True)
+    library.extend([deck, compact_deck])
+    card = deck.add_card("front", "back")
+    compact_card = compact_deck.add_card("front", "back")
+    log = ReviewLog(str(tmp_path / "reviews.log"))
+    log.record_review(card, True, library=library)
+    # The library as last saved
+    saved = FlashCardLibrary([FlashCardSet.from_dict(deck.to_dict()),
+                              FlashCardSet.from_dict(compact_deck.to_dict(), compact=True)])
+    saved.review_log_offset = library.review_log_offset
+    log.record_review(card, False, library=library)
+    log.record_review(compact_card, True, library=library)
+    log.record_review(compact_card, True, library=library)
+    log.record(12345, True)
+    log.flush()
+
+    assert ReviewLog(str(tmp_path / "reviews.log")).catch_up(saved) == 3
+    assert saved.get(deck.id).get_card(card.id).record() == card.record()
+    assert saved.get(compact_deck.id).get_card(compact_card.id).record() == compact_card.record()
+    assert saved.review_log_offset == log.end_offset
+
+
+def test_catch_up_without_new_events(tmp_path):
+    library = FlashCardLibrary([FlashCardSet("Deck")])
+    log = ReviewLog(str(tmp_path / "reviews.log"))
+    assert log.catch_up(library) == 0
+    assert library.review_log_offset == 0
@@ -0,0 +1,110 @@
+import sqlite3
+
+from cards.flashcard_set import FlashCardSet
+from utils.storage import SQLiteStorage
+
+
+def open_library(path):
+    storage = SQLiteStorage(str(path))
+    return storage, storage.load_library()
+
+
+def test_changes_are_written_and_loaded(tmp_path):
+    storage, library = open_library(tmp_path / "cards.db")
+    flashcard_set = FlashCardSet("Deck")
+    library.append(flashcard_set)
+    card = flashcard_set.add_card("front", "back")
+    storage.flush()
+    card.mark_correct()
+    flashcard_set.edit_card(card.id, "new front", "back")
+    storage.close()
+
+    storage, library = open_library(tmp_path / "cards.db")
+    loaded = library.get(flashcard_set.id).get_card(card.id)
+    assert (loaded.front, loaded.review_count, loaded.correct_count) == ("new front", 1, 1)
+    storage.close()
+
+
+def test_deleting_a_deck_with_pending_card_changes(tmp_path):
+    storage, library = open_library(tmp_path / "cards.db")
+    deleted = FlashCardSet("Deleted")
+    kept = FlashCardSet("Kept")
+    library.extend([deleted, kept])
+    reviewed = deleted.add_card("reviewed", "back")
+    removed = deleted.add_card("removed", "back")
+    kept_card = kept.add_card("kept", "back")
+    storage.flush()
+    reviewed.mark_correct()
+    deleted.edit_card(reviewed.id, "edited", "back")
+    deleted.add_card("added", "back")
+    deleted.delete_card(removed.id)
+    kept_card.mark_incorrect()
+    library.delete(deleted.id)
+    storage.close()
+
+    storage, library = open_library(tmp_path / "cards.db")
+    assert [flashcard_set.id for flashcard_set in library] == [kept.id]
+    assert library.get(kept.id).get_card(kept_card.id).review_count == 1
+    (card_count,) = storage.connection.execute("SELECT COUNT(*) FROM cards").fetchone()
+    assert card_count == 1
+    storage.close()
+
+
+def test_deleted_deck_added_again_is_written_in_full(tmp_path):
+    storage, library = open_library(tmp_path / "cards.db")
+    flashcard_set = FlashCardSet("Deck")
+    library.append(flashcard_set)
+    card = flashcard_set.add_card("front", "back")
+    storage.flush()
+    card.mark_correct()
+    library.delete(flashcard_set.id)
+    library.append(flashcard_set)
+    storage.close()
+
+    storage, library = open_library(tmp_path / "cards.db")
+    assert library.get(flashcard_set.id).get_card(card.id).review_count == 1
+    storage.close()
+
+
+def test_edit_times_are_stored(tmp_path):
+    storage, library = open_library(tmp_path / "cards.db")
+    flashcard_set = FlashCardSet("Deck")
+    library.append(flashcard_set)
+    card = flashcard_set.add_card("front", "back")
+    storage.flush()
+    flashcard_set.edit_card(card.id, "edited", "back", now=1000.5)
+    flashcard_set.rename("Renamed", now=2000.5)
+    storage.close()
+
+    storage, library = open_library(tmp_path / "cards.db")
+    loaded = library.get(flashcard_set.id)
+    assert (loaded.title, loaded.title_edited) == ("Renamed", 2000.5)
+    assert loaded.get_card(card.id).edited == 1000.5
+    storage.close()
+
+
+def test_databases_without_edit_times_are_upgraded(tmp_path):
+    path = str(tmp_path / "cards.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE decks (id TEXT PRIMARY KEY, seq INTEGER NOT NULL, title TEXT NOT NULL);
+        CREATE TABLE cards (
+            id INTEGER PRIMARY KEY, deck_id TEXT NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL, front TEXT NOT NULL, back TEXT NOT NULL,
+            review_count INTEGER NOT NULL DEFAULT 0, correct_count INTEGER NOT NULL DEFAULT 0, ease REAL NOT NULL,
+            interval REAL NOT NULL DEFAULT 0, repetitions INTEGER NOT NULL DEFAULT 0, due REAL NOT NULL DEFAULT 0
+        );
+        INSERT INTO decks VALUES ('deck', 1, 'Old deck');
+        INSERT INTO cards (id, deck_id, seq, front, back, ease) VALUES (7, 'deck', 1, 'front', 'back', 2.5);
+    """)
+    connection.close()
+
+    storage, library = open_library(path)
+    flashcard_set = library.get("deck")
+    assert (flashcard_set.title, flashcard_set.title_edited) == ("Old deck", 0)
+    assert flashcard_set.get_card(7).edited == 0
+    flashcard_set.edit_card(7, "edited", "back", now=1000.5)
+    storage.close()
+    storage, library = open_library(path)
+    assert library.get("deck").get_card(7).edited == 1000.5
+    storage.close()
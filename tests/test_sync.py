@@ -0,0 +1,186 @@
+import itertools
+
+import pytest
+
+from cards.flashcard_set import FlashCardSet
+from cards.library import FlashCardLibrary
+from cards.sync import content_hash, merge_deck, merge_into_library
+
+NOW = 1_700_000_000.0
+
+
+def export(flashcard_set, keep_hash=False):
+    """
+    Return a copy of the set as read back from a deck file. Without keep_hash the copy cannot be skipped by its
+    content hash, so the merge itself is tested.
+    """
+    copy = FlashCardSet.from_dict(flashcard_set.to_dict())
+    if not keep_hash:
+        copy.source_hash = None
+    return copy
+
+
+def state(library):
+    """
+    Return what every device has to agree on after merging: the titles, texts and review totals of the decks.
+    """
+    return {
+        flashcard_set.id: (
+            flashcard_set.title,
+            sorted((card.id, card.front, card.back, card.review_count, card.correct_count)
+                   for card in flashcard_set.cards),
+        )
+        for flashcard_set in library
+    }
+
+
+def make_deck(title="Farben", fronts=("blue", "red", "green")):
+    flashcard_set = FlashCardSet(title)
+    for front in fronts:
+        flashcard_set.add_card(front, front.upper())
+    return flashcard_set
+
+
+def devices(names="abc"):
+    """
+    Return libraries of the given devices that all start with a copy of the same deck.
+    """
+    original = make_deck()
+    libraries = []
+    for name in names:
+        library = FlashCardLibrary(device_id=name)
+        library.append(export(original))
+        libraries.append(library)
+    return original, libraries
+
+
+def study(library, deck_id, offset):
+    """
+    Review, edit and rename on one device, differently for every offset.
+    """
+    flashcard_set = library.get(deck_id)
+    cards = list(flashcard_set.cards)
+    cards[offset % len(cards)].mark_correct(NOW + offset)
+    cards[(offset + 1) % len(cards)].mark_incorrect(NOW + offset)
+    flashcard_set.edit_card(cards[offset % len(cards)].id, f"front {offset}", "back", NOW + offset)
+    if offset == 1:
+        flashcard_set.rename("Colours", NOW + offset)
+
+
+def test_merging_in_any_order_converges():
+    original, libraries = devices()
+    for offset, library in enumerate(libraries):
+        study(library, original.id, offset)
+    exports = [export(library.get(original.id)) for library in libraries]
+    results = []
+    for order in itertools.permutations(range(len(libraries))):
+        library = FlashCardLibrary(device_id="reader")
+        for number in order:
+            merge_into_library(library, export(exports[number]))
+        results.append(state(library))
+    assert all(result == results[0] for result in results)
+    (title, cards), = results[0].values()
+    assert title == "Colours"
+    assert sum(card[3] for card in cards) == 6
+    assert {card[1] for card in cards} == {"front 0", "front 1", "front 2"}
+
+
+def test_devices_converge_after_exchanging_exports():
+    original, libraries = devices()
+    for offset, library in enumerate(libraries):
+        study(library, original.id, offset)
+    exports = [export(library.get(original.id)) for library in libraries]
+    for number, library in enumerate(libraries):
+        for other in exports[number + 1:] + exports[:number]:
+            merge_into_library(library, export(other))
+    assert state(libraries[0]) == state(libraries[1]) == state(libraries[2])
+
+
+def test_merging_twice_changes_nothing():
+    original, (first, second) = devices("ab")
+    study(second, original.id, 1)
+    copy = export(second.get(original.id))
+    merge_into_library(first, export(copy))
+    merged = state(first)
+    version = first.get(original.id).version
+    assert merge_deck(first.get(original.id), export(copy)) == 0
+    assert state(first) == merged
+    assert first.get(original.id).version == version
+
+
+def test_unchanged_copies_are_skipped_by_their_hash():
+    library = FlashCardLibrary(device_id="a")
+    library.append(make_deck())
+    flashcard_set = library[0]
+    copy = export(flashcard_set, keep_hash=True)
+    assert copy.source_hash == content_hash(flashcard_set)
+    assert merge_deck(flashcard_set, copy) == 0
+
+
+def test_an_old_export_does_not_revert_an_edit():
+    library = FlashCardLibrary(device_id="a")
+    library.append(make_deck(fronts=["zebra"]))
+    flashcard_set = library[0]
+    card = flashcard_set.cards[0]
+    backup = export(flashcard_set)
+    flashcard_set.edit_card(card.id, "apple", "APPLE", NOW)
+    merge_into_library(library, backup)
+    assert (card.front, card.back, card.edited) == ("apple", "APPLE", NOW)
+
+
+def test_a_later_edit_wins():
+    original, (first, second) = devices("ab")
+    card_id = original.cards[0].id
+    first.get(original.id).edit_card(card_id, "earlier", "back", NOW)
+    second.get(original.id).edit_card(card_id, "later", "back", NOW + 1)
+    merge_into_library(first, export(second.get(original.id)))
+    merge_into_library(second, export(first.get(original.id)))
+    assert first.get(original.id).get_card(card_id).front == "later"
+    assert second.get(original.id).get_card(card_id).front == "later"
+
+
+def test_copies_without_edit_times_keep_the_local_texts():
+    library = FlashCardLibrary(device_id="a")
+    library.append(make_deck(fronts=["apple"]))
+    flashcard_set = library[0]
+    other = export(flashcard_set)
+    other.cards[0].front = "zebra"
+    merge_into_library(library, other)
+    assert flashcard_set.cards[0].front == "apple"
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_an_old_export_does_not_revert_reviews_or_a_rename(compact):
+    library = FlashCardLibrary(device_id="a")
+    library.append(FlashCardSet.from_dict(make_deck().to_dict(), compact=compact))
+    flashcard_set = library[0]
+    card = flashcard_set.cards[0]
+    backup = export(flashcard_set)
+    card.mark_correct(NOW)
+    flashcard_set.rename("Renamed", NOW)
+    reviewed = card.record()
+    merge_into_library(library, backup)
+    assert card.record() == reviewed
+    assert flashcard_set.title == "Renamed"
+
+
+def test_a_later_rename_wins():
+    original, (first, second) = devices("ab")
+    first.get(original.id).rename("First", NOW)
+    second.get(original.id).rename("Second", NOW + 1)
+    merge_into_library(first, export(second.get(original.id)))
+    merge_into_library(second, export(first.get(original.id)))
+    assert first.get(original.id).title == second.get(original.id).title == "Second"
+
+
+def test_review_counts_of_every_device_are_kept():
+    original, (first, second) = devices("ab")
+    card_id = original.cards[0].id
+    first.get(original.id).get_card(card_id).mark_correct(NOW)
+    second.get(original.id).get_card(card_id).mark_incorrect(NOW)
+    second.get(original.id).get_card(card_id).mark_correct(NOW + 1)
+    merge_into_library(first, export(second.get(original.id)))
+    card = first.get(original.id).get_card(card_id)
+    assert (card.review_count, card.correct_count) == (3, 2)
+    assert first.get(original.id).remote_counts[card_id] == {"b": (2, 1)}
+    assert (first.total_reviews, first.total_correct) == (3, 2)
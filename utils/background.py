@@ -0,0 +1,156 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of worker threads and how often the Tk thread checks for results of the workers
+MAX_WORKERS = 2
+POLL_INTERVAL_MS = 50
+
+
+class TaskCancelled(Exception):
+    """
+    Raised inside a task that was cancelled, at the next check_cancelled or report_progress.
+    """
+
+
+class Task:
+    """
+    Handle of a function running on a worker thread of a TaskRunner.
+
+    The function gets the task as its first argument. It can report progress, check for cancellation and post
+    callbacks to the Tk thread through it. The task's on_progress, on_done, on_error and on_cancel callbacks are
+    always called on the Tk thread.
+    """
+
+    def __init__(self, runner, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        self.runner = runner
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self._cancel_event = threading.Event()
+        # Future of the worker call, set by TaskRunner.submit
+        self.future = None
+        # Latest (done, total) reported by the worker and the last one passed to on_progress. Only the latest
+        # progress is delivered, so a fast worker cannot flood the Tk thread.
+        self.progress = None
+        self._shown_progress = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Ask the task to stop. The worker stops at its next check_cancelled or report_progress and on_cancel is
+        called instead of on_done.
+        """
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """
+        Raise TaskCancelled if the task was cancelled. Called by the worker.
+        """
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, done, total):
+        """
+        Report that done of total units of work are finished. total may be None if it is unknown. Called by the
+        worker.
+        """
+        self.progress = (done, total)
+        self.check_cancelled()
+
+    def post(self, callback, *args):
+        """
+        Call callback with the given arguments on the Tk thread. Called by the worker to hand over results, for
+        example objects that must only be changed on the Tk thread once they are shared.
+        """
+        self.runner.events.put((self, callback, args))
+
+
+class TaskRunner:
+    """
+    Runs long operations such as imports and exports on a pool of worker threads while the Tk mainloop keeps
+    running.
+
+    Workers never call into Tk or change shared objects. They send callbacks through a thread-safe queue, which the
+    Tk thread drains with root.after while tasks are running, so the library is only ever changed on the Tk thread.
+    """
+
+    def __init__(self, root, max_workers=MAX_WORKERS):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="flashcards-worker")
+        self.events = queue.SimpleQueue()
+        self.tasks = set()
+        self._poll_id = None
+
+    def submit(self, work, *args, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        """
+        Run work(task, *args) on a worker thread and return the Task. on_done is called with the result of work,
+        on_error with the exception it raised and on_cancel without arguments if it was cancelled. on_progress is
+        called with the progress reported by the worker.
+        """
+        task = Task(self, on_progress, on_done, on_error, on_cancel)
+        self.tasks.add(task)
+        task.future = self.executor.submit(self._run, task, work, args)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+        return task
+
+    def _run(self, task, work, args):
+        try:
+            result = work(task, *args)
+        except TaskCancelled:
+            self.events.put((task, self._finish, (task, task.on_cancel)))
+        except Exception as e:
+            if task.cancelled:
+                self.events.put((task, self._finish, (task, task.on_cancel)))
+            else:
+                self.events.put((task, self._finish, (task, task.on_error, e)))
+        else:
+            self.events.put((task, self._finish, (task, task.on_done, result)))
+
+    def _finish(self, task, callback, *args):
+        self._show_progress(task)
+        self.tasks.discard(task)
+        if callback is not None:
+            callback(*args)
+
+    def _show_progress(self, task):
+        progress = task.progress
+        if progress is not None and progress != task._shown_progress and task.on_progress is not None:
+            task._shown_progress = progress
+            task.on_progress(*progress)
+
+    def _poll(self):
+        """
+        Deliver the progress and the callbacks posted by the workers, on the Tk thread.
+        """
+        self._poll_id = None
+        for task in list(self.tasks):
+            self._show_progress(task)
+        while True:
+            try:
+                task, callback, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            # Callbacks posted by a cancelled task are dropped, except the final one
+            if callback == self._finish or not task.cancelled:
+                callback(*args)
+        if self.tasks:
+            self._poll_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def shutdown(self):
+        """
+        Cancel all tasks and stop the workers without waiting for them.
+        """
+        for task in self.tasks:
+            task.cancel()
+            # Tasks that have not started yet never run
+            task.future.cancel()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,435 @@
+import codecs
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+
+from cards.flashcard_set import FlashCardSet
+from cards.sync import ContentHasher, card_json
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+# Number of bytes read from the file at a time
+CHUNK_SIZE = 1 << 16
+# Number of cards encoded before they are written to the file together
+WRITE_BATCH_SIZE = 1024
+
+# Formats of deck files: a JSON array of decks (see FlashCardSet.to_dict), or JSON lines with one card per line
+JSON_FORMAT = "json"
+NDJSON_FORMAT = "ndjson"
+FORMAT_EXTENSIONS = {".json": JSON_FORMAT, ".ndjson": NDJSON_FORMAT, ".jsonl": NDJSON_FORMAT}
+
+# Compressed deck files are recognised by their extension. zstd needs the compression.zstd module of Python 3.14+.
+COMPRESSION_EXTENSIONS = (".gz", ".xz", ".zst")
+COMPRESSORS = {
+    ".gz": lambda file, mode: gzip.GzipFile(fileobj=file, mode=mode),
+    ".xz": lzma.LZMAFile,
+}
+if zstd is not None:
+    COMPRESSORS[".zst"] = zstd.ZstdFile
+
+# Keys of the deck in the lines of an NDJSON file. The rename time, the device and the content hash of a deck are in a
+# line of their own after its cards.
+NDJSON_DECK_KEYS = {"deck_id", "deck_title", "deck_title_edited", "deck_device", "deck_hash"}
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# The separator after an array element, together with the whitespace up to the next element
+ARRAY_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*(?=[^ \t\n\r])")
+
+
+class JSONStream:
+    """
+    Pull parser for the structure of a large JSON document.
+
+    Only a window of the document is kept in memory. Containers are walked with expect() and next_separator(),
+    and the values inside them are decoded one at a time with value(), so a huge array of small objects is parsed
+    in memory bounded by the size of its largest element.
+    """
+
+    def __init__(self, file, progress=None, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.total_bytes = _file_size(file)
+
+    def _fill(self, size):
+        """
+        Read at least size more bytes into the buffer, dropping the part of the buffer that was already parsed.
+        """
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(data, final=not data)
+        self.pos = 0
+        if not data:
+            self.eof = True
+        if self.progress is not None:
+            self.progress(self.bytes_read, self.total_bytes)
+
+    def _skip_whitespace(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return
+            self._fill(self.chunk_size)
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """
+        Return the next non-whitespace character without consuming it, or "" at the end of the document.
+        """
+        self._skip_whitespace()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        """
+        Consume the next non-whitespace character, which must be char.
+        """
+        if self.peek() != char:
+            raise self.error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def next_separator(self, end):
+        """
+        Consume the separator after an element of a container. Return True if another element follows and False if
+        the container ended with the end character.
+        """
+        char = self.peek()
+        if char != "," and char != end:
+            raise self.error(f"Expecting ',' delimiter or {end!r}")
+        self.pos += 1
+        return char == ","
+
+    def _may_be_truncated(self, error):
+        """
+        Return True if the decode error may be caused by the end of the buffer rather than by invalid JSON, so that
+        an invalid document fails without reading the rest of it.
+        """
+        # An escape sequence is at most 6 characters long
+        return error.pos >= len(self.buffer) - 6 or error.msg.startswith("Unterminated string")
+
+    def value(self):
+        """
+        Decode and consume the next complete JSON value.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof or not self._may_be_truncated(e):
+                    raise
+                end = None
+            # A value ending at the end of the buffer may be a number cut in half
+            if end is not None and (end < len(self.buffer) or self.eof):
+                self.pos = end
+                return value
+            # Read as much as is already buffered again, so a value spanning many chunks is re-parsed only a
+            # logarithmic number of times
+            self._fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def array_values(self):
+        """
+        Consume an array whose elements are decoded with value() and yield them one by one. This is the hot loop of
+        an import, so elements that are completely buffered are decoded without going through value().
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        raw_decode = self.json_decoder.raw_decode
+        match_separator = ARRAY_SEPARATOR.match
+        while True:
+            try:
+                value, end = raw_decode(self.buffer, self.pos)
+                separator = match_separator(self.buffer, end)
+            except json.JSONDecodeError:
+                separator = None
+            if separator is None:
+                # The element or the separator after it is not completely buffered
+                yield self.value()
+                if not self.next_separator("]"):
+                    return
+                self._skip_whitespace()
+            else:
+                self.pos = separator.end()
+                yield value
+                if separator.group(1) == "]":
+                    return
+
+    def end(self):
+        """
+        Check that nothing but whitespace follows the parsed document.
+        """
+        if self.peek():
+            raise self.error("Extra data")
+
+
+def _file_size(file):
+    try:
+        return os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _read_flashcard_set(stream, compact):
+    """
+    Read one deck object from the stream. Its cards are added to the deck one by one as they are decoded, so the
+    card dictionaries are never all in memory at once.
+    """
+    if stream.peek() != "{":
+        # Not a deck object; fail the way FlashCardSet.from_dict does
+        return FlashCardSet.from_dict(stream.value(), compact=compact)
+    stream.expect("{")
+    flashcard_set = FlashCardSet(None, compact=compact)
+    fields = {}
+    has_cards = False
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            key = stream.value()
+            if not isinstance(key, str):
+                raise stream.error("Expecting property name enclosed in double quotes")
+            stream.expect(":")
+            if key == "cards":
+                # A repeated key replaces the earlier value, as it does in json.load
+                if has_cards:
+                    flashcard_set.delete_cards([card.id for card in flashcard_set.cards])
+                has_cards = True
+                append = flashcard_set.append_card_data
+                if stream.peek() == "[":
+                    for card_data in stream.array_values():
+                        append(card_data)
+                else:
+                    for card_data in stream.value():
+                        append(card_data)
+            else:
+                fields[key] = stream.value()
+            if not stream.next_separator("}"):
+                break
+    flashcard_set.title = fields["title"]
+    flashcard_set.title_edited = fields.get("title_edited", 0)
+    if not has_cards:
+        raise KeyError("cards")
+    if fields.get("id"):
+        flashcard_set.id = fields["id"]
+    flashcard_set.device_id = fields.get("device")
+    flashcard_set.source_hash = fields.get("hash")
+    return flashcard_set
+
+
+def iter_flashcard_sets(file, compact=False, progress=None):
+    """
+    Parse a JSON export of flashcard sets (see FlashCardSet.to_dict) incrementally and yield each FlashCardSet as
+    soon as it has been read. file is a file opened in binary mode. progress is called with the number of bytes read
+    and the size of the file (None if unknown) every time a chunk is read.
+
+    The sets are the same as the ones FlashCardSet.from_dict creates, and the same exceptions are raised for
+    invalid documents: json.JSONDecodeError for malformed JSON and KeyError for missing fields.
+    """
+    stream = JSONStream(file, progress)
+    if stream.peek() != "[":
+        # Let anything that is not an array fail the way iterating over the loaded document would
+        data = stream.value()
+        stream.end()
+        for set_data in data:
+            yield FlashCardSet.from_dict(set_data, compact=compact)
+        return
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+    else:
+        yield _read_flashcard_set(stream, compact)
+        while stream.next_separator("]"):
+            yield _read_flashcard_set(stream, compact)
+    stream.end()
+
+
+def _iter_ndjson_flashcard_sets(file, compact=False, progress=None):
+    """
+    Yield the decks of an NDJSON file. Consecutive lines with the same deck id belong to the same deck, and a line
+    with only the deck keys is a deck without cards.
+    """
+    total_bytes = _file_size(file)
+    bytes_read = 0
+    flashcard_set = None
+    deck_id = None
+    for line_number, line in enumerate(file):
+        bytes_read += len(line)
+        if progress is not None and line_number % WRITE_BATCH_SIZE == 0:
+            progress(bytes_read, total_bytes)
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        if flashcard_set is None or data["deck_id"] != deck_id:
+            if flashcard_set is not None:
+                yield flashcard_set
+            deck_id = data["deck_id"]
+            flashcard_set = FlashCardSet(data["deck_title"], compact=compact, deck_id=deck_id)
+        if data.keys() - NDJSON_DECK_KEYS:
+            flashcard_set.append_card_data(data)
+        elif "deck_hash" in data:
+            flashcard_set.title_edited = data.get("deck_title_edited", 0)
+            flashcard_set.device_id = data.get("deck_device")
+            flashcard_set.source_hash = data["deck_hash"]
+    if flashcard_set is not None:
+        yield flashcard_set
+
+
+def deck_file_type(path):
+    """
+    Return the (format, compression) of a deck file from its extension, for example ("ndjson", ".gz") for
+    "decks.ndjson.gz". Files with an unknown extension are read and written as uncompressed JSON.
+    """
+    root, extension = os.path.splitext(path.lower())
+    compression = None
+    if extension in COMPRESSION_EXTENSIONS:
+        compression = extension
+        root, extension = os.path.splitext(root)
+    return FORMAT_EXTENSIONS.get(extension, JSON_FORMAT), compression
+
+
+def open_deck_file(path, mode="rb"):
+    """
+    Open a deck file in binary mode, compressing or decompressing it according to its extension. Return the
+    uncompressed file and the file on disk, whose position tells how much of a compressed file was read. Raises
+    ValueError for a compression this Python does not support.
+    """
+    compression = deck_file_type(path)[1]
+    if compression is not None and compression not in COMPRESSORS:
+        raise ValueError(f"{compression} files are not supported on this Python version (zstd needs Python 3.14+)")
+    raw = open(path, mode)
+    if compression is None:
+        return raw, raw
+    try:
+        return COMPRESSORS[compression](raw, mode), raw
+    except Exception:
+        raw.close()
+        raise
+
+
+def iter_deck_file(path, compact=False, progress=None):
+    """
+    Yield the FlashCardSets of a JSON or NDJSON deck file, optionally compressed, as they are parsed. progress is
+    called with the number of bytes of the file read so far and the size of the file.
+    """
+    file_format = deck_file_type(path)[0]
+    file, raw = open_deck_file(path, "rb")
+    with raw, file:
+        size = os.fstat(raw.fileno()).st_size
+        report = None if progress is None else lambda *_: progress(raw.tell(), size)
+        if file_format == NDJSON_FORMAT:
+            yield from _iter_ndjson_flashcard_sets(file, compact, report)
+        else:
+            yield from iter_flashcard_sets(file, compact, report)
+
+
+def _encode_cards(flashcard_set, encode, hasher, deck_prefix=None):
+    """
+    Yield the JSON encoding of every card of the set (see cards.sync.card_json), in card order, and add it to the
+    content hasher. deck_prefix, the JSON of the deck fields without the closing brace, is put in front of the card
+    fields of every card.
+    """
+    for record in flashcard_set.cards.records():
+        encoded = card_json(flashcard_set, record, encode)
+        hasher.add(encoded)
+        yield encoded if deck_prefix is None else f"{deck_prefix}, {encoded[1:]}"
+
+
+def _write_batches(file, items, separator, on_batch):
+    """
+    Write the strings of items separated by separator, WRITE_BATCH_SIZE at a time. on_batch is called with the
+    number of items written in a batch.
+    """
+    batch = []
+    first = True
+    for item in items:
+        batch.append(item)
+        if len(batch) == WRITE_BATCH_SIZE:
+            file.write(("" if first else separator) + separator.join(batch))
+            on_batch(len(batch))
+            batch.clear()
+            first = False
+    if batch:
+        file.write(("" if first else separator) + separator.join(batch))
+        on_batch(len(batch))
+
+
+def write_flashcard_sets(file, flashcard_sets, file_format=JSON_FORMAT, progress=None):
+    """
+    Write flashcard sets to a text file deck by deck and card by card, in JSON or NDJSON format. Only
+    WRITE_BATCH_SIZE encoded cards are held in memory at a time. The JSON output is identical to json.dump of the
+    list of FlashCardSet.to_dict results. progress is called with the number of cards written and the total number
+    of cards after every batch.
+    """
+    encode = json.JSONEncoder().encode
+    flashcard_sets = list(flashcard_sets)
+    total_cards = sum(len(flashcard_set.cards) for flashcard_set in flashcard_sets)
+    written = 0
+
+    def on_batch(count):
+        nonlocal written
+        written += count
+        if progress is not None:
+            progress(written, total_cards)
+
+    if file_format == NDJSON_FORMAT:
+        for flashcard_set in flashcard_sets:
+            deck_fields = {"deck_id": flashcard_set.id, "deck_title": flashcard_set.title}
+            hasher = ContentHasher(flashcard_set)
+            if flashcard_set.cards:
+                deck_prefix = encode(deck_fields)[:-1]
+                _write_batches(file, _encode_cards(flashcard_set, encode, hasher, deck_prefix), "\n", on_batch)
+                file.write("\n")
+            deck_fields.update(
+                deck_title_edited=flashcard_set.title_edited,
+                deck_device=flashcard_set.device_id,
+                deck_hash=hasher.hexdigest(),
+            )
+            file.write(encode(deck_fields) + "\n")
+        return
+    file.write("[")
+    for index, flashcard_set in enumerate(flashcard_sets):
+        if index:
+            file.write(", ")
+        file.write(
+            f'{{"id": {encode(flashcard_set.id)}, "title": {encode(flashcard_set.title)}, '
+            f'"title_edited": {encode(flashcard_set.title_edited)}, "device": {encode(flashcard_set.device_id)}, '
+            f'"cards": ['
+        )
+        hasher = ContentHasher(flashcard_set)
+        _write_batches(file, _encode_cards(flashcard_set, encode, hasher), ", ", on_batch)
+        file.write(f'], "hash": {encode(hasher.hexdigest())}}}')
+    file.write("]")
+
+
+def write_deck_file(path, flashcard_sets, progress=None):
+    """
+    Write flashcard sets to a deck file in the format and compression given by its extension (see deck_file_type).
+    The file is written under a temporary name and only replaces path once it is complete, so an export that fails
+    or is cancelled leaves no partial file behind.
+    """
+    directory, name = os.path.split(path)
+    temporary_path = os.path.join(directory, ".~" + name)
+    try:
+        file, raw = open_deck_file(temporary_path, "wb")
+        with raw, file, io.TextIOWrapper(file, encoding="utf-8", newline="") as text:
+            write_flashcard_sets(text, flashcard_sets, deck_file_type(path)[0], progress)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
@@ -1,47 +1,133 @@
 import json
 from tkinter import filedialog
-from cards.flashcard_set import FlashCardSet
+from . import instrumentation
+from .deck_io import COMPRESSORS, iter_deck_file, write_deck_file
+
+# File types offered by the import and export dialogs. The format and compression follow from the extension; only
+# the compressions this Python supports are offered.
+DECK_FILE_TYPES = [
+    ("JSON files", "*.json"),
+    ("JSON lines, one card per line", "*.ndjson *.jsonl"),
+    ("Compressed files", " ".join("*" + extension for extension in COMPRESSORS)),
+    ("All files", "*.*"),
+]
 
 
 class FileOperations:
+    """
+    Import and export of deck files. Both run on a worker thread of the app's TaskRunner behind a progress screen,
+    so the window stays responsive, and both can be cancelled.
+    """
+
     def __init__(self, app):
         self.app = app
 
     def export_flashcard_sets(self):
         """
         Export the flashcard sets to a JSON file. The user can select the file path where the flashcard sets will be saved.
+        A ".ndjson" or ".jsonl" file gets one card per line, and a ".gz", ".xz" or (on Python 3.14+) ".zst" suffix
+        compresses the file.
         """
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=DECK_FILE_TYPES,
         )
-        if file_path:
-            data = [flashcard_set.to_dict() for flashcard_set in self.app.flashcard_sets]
-            with open(file_path, "w") as file:
-                json.dump(data, file)
-            self.app.message_box.show_message(
-                "Export Successful", f"Flashcard sets have been exported to {file_path}"
+        if not file_path:
+            return
+        # Timed from the end of the file dialog, which waits for the user
+        with instrumentation.measure("start_export"):
+            flashcard_sets = list(self.app.flashcard_sets)
+            # The worker only reads the decks, and the progress screen keeps them from being edited meanwhile.
+            # Compacting them here makes sure reading does not have to drop deleted cards on the worker thread.
+            for flashcard_set in flashcard_sets:
+                flashcard_set.cards.compact()
+            task = self.app.tasks.submit(
+                self._write_deck_file,
+                file_path,
+                flashcard_sets,
+                on_progress=lambda done, total: self.app.message_box.update_progress(done, total, "cards"),
+                on_done=lambda _: self.app.message_box.show_message(
+                    "Export Successful", f"Flashcard sets have been exported to {file_path}"
+                ),
+                on_error=lambda e: self.app.message_box.show_message(
+                    "Export Error", f"An error occurred while exporting: {str(e)}"
+                ),
+                on_cancel=self.app.deck_manager.show_deck_manager,
             )
+            self.app.message_box.show_progress("Exporting Decks", f"Exporting to {file_path}", on_cancel=task.cancel)
+
+    @instrumentation.timed("write_deck_file")
+    def _write_deck_file(self, task, file_path, flashcard_sets):
+        """
+        Worker of export_flashcard_sets.
+        """
+        write_deck_file(file_path, flashcard_sets, progress=task.report_progress)
 
     def import_flashcard_sets(self):
         """
         Import flashcard sets from a JSON file. The user can select the file path from which the flashcard sets will
-        be imported. The imported flashcard sets will be added to the existing flashcard sets. Exceptions are handled.
+        be imported. Imported sets that are already in the library, e.g. a deck studied on another device, are
+        merged into it; the others are added to the existing flashcard sets. Exceptions are handled.
         """
         file_path = filedialog.askopenfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=DECK_FILE_TYPES,
         )
-        if file_path:
-            try:
-                with open(file_path, "r") as file:
-                    data = json.load(file)
-                imported_sets = [FlashCardSet.from_dict(set_data) for set_data in data]
-                self.app.flashcard_sets.extend(imported_sets)
+        if not file_path:
+            return
+        with instrumentation.measure("start_import"):
+            imported_sets = []
+
+            def add_imported_set(flashcard_set):
+                # Decks join the library on the Tk thread as soon as the worker has parsed them
+                if self.app.decks.merge_deck(flashcard_set) is flashcard_set:
+                    imported_sets.append(flashcard_set)
+
+            def remove_imported_sets():
+                # New decks of a file that fails part way through, or whose import is cancelled, are removed again.
+                # Merges into existing decks are kept: merging is idempotent, so importing the file again completes
+                # the import.
+                for flashcard_set in imported_sets:
+                    self.app.flashcard_sets.remove(flashcard_set)
+
+            def on_error(error):
+                remove_imported_sets()
+                self.show_import_error(error)
+
+            def on_cancel():
+                remove_imported_sets()
                 self.app.deck_manager.show_deck_manager()
-            except json.JSONDecodeError:
-                self.app.message_box.show_message("Import Error", "The selected file is not a valid JSON file.")
-            except KeyError as e:
-                self.app.message_box.show_message("Import Error", f"The JSON file is missing required data: {str(e)}")
-            except Exception as e:
-                self.app.message_box.show_message("Import Error", f"An error occurred while importing: {str(e)}")
+
+            task = self.app.tasks.submit(
+                self._read_deck_file,
+                file_path,
+                add_imported_set,
+                on_progress=lambda done, total: self.app.message_box.update_progress(
+                    done // 1024, total and total // 1024, "KB"
+                ),
+                on_done=lambda _: self.app.deck_manager.show_deck_manager(),
+                on_error=on_error,
+                on_cancel=on_cancel,
+            )
+            self.app.message_box.show_progress("Importing Decks", f"Importing {file_path}", on_cancel=task.cancel)
+
+    @instrumentation.timed("read_deck_file")
+    def _read_deck_file(self, task, file_path, add_imported_set):
+        """
+        Worker of import_flashcard_sets. The decks it creates are not shared with the Tk thread until they are
+        complete and handed over with task.post.
+        """
+        for flashcard_set in iter_deck_file(file_path, progress=task.report_progress):
+            task.check_cancelled()
+            task.post(add_imported_set, flashcard_set)
+
+    def show_import_error(self, error):
+        """
+        Show a message explaining why an import failed.
+        """
+        if isinstance(error, json.JSONDecodeError):
+            self.app.message_box.show_message("Import Error", "The selected file is not a valid JSON file.")
+        elif isinstance(error, KeyError):
+            self.app.message_box.show_message("Import Error", f"The JSON file is missing required data: {str(error)}")
+        else:
+            self.app.message_box.show_message("Import Error", f"An error occurred while importing: {str(error)}")
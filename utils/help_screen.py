@@ -1,127 +1,156 @@
 import customtkinter as ctk
 import tkinter as tk
 import tkinter.font as tkfont
+import os
 import re
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
 
-class SimpleMarkdownText(tk.Frame):
+# Line-level markdown syntax: headings ("# " to "###### ") and bullet points ("* ")
+HEADING = re.compile(r'(#{1,6})\s+(.*)')
+BULLET_PREFIX = '* '
+# Inline bold (**text**) and italic (*text*) spans
+INLINE = re.compile(r'\*\*(.+?)\*\*|\*(.+?)\*')
+
+# File with the help text, and the text shown if it is missing
+HELP_TEXT_PATH = "help_text.txt"
+HELP_TEXT_MISSING = (
+    "Help text file not found. Please ensure 'help_text.txt' is in the same directory as the application."
+)
+
+TEXT_COLOR = "#45494E"
+BACKGROUND_COLOR = "#F0F0F0"
+
+# Parsed help documents by path: path -> (modification time, document)
+_document_cache: Dict[str, Tuple[float, list]] = {}
+
+
+def parse_markdown(markdown_text: str) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    Parses markdown text into a document: a list of (text, tags) runs, with the tag names used by
+    SimpleMarkdownText. Every line ends with a newline run.
+
+    Args:
+        markdown_text (str): The markdown text to parse.
+
+    Returns:
+        list: The (text, tags) runs of the document, in order.
+    """
+    document = []
+    for line in markdown_text.split('\n'):
+        heading = HEADING.match(line)
+        if heading:
+            level = len(heading.group(1))
+            document.append((heading.group(2) + '\n', (f'h{level}',)))
+            continue
+        line_tags: Tuple[str, ...] = ()
+        if line.startswith(BULLET_PREFIX):
+            line_tags = ('bullet',)
+            document.append(('• ', line_tags))
+            line = line[len(BULLET_PREFIX):]
+        position = 0
+        for match in INLINE.finditer(line):
+            if match.start() > position:
+                document.append((line[position:match.start()], line_tags))
+            if match.group(1) is not None:
+                document.append((match.group(1), line_tags + ('bold',)))
+            else:
+                document.append((match.group(2), line_tags + ('italic',)))
+            position = match.end()
+        document.append((line[position:] + '\n', line_tags))
+    return document
+
+
+def load_markdown_document(path: str) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+    """
+    Loads and parses a markdown file. The parsed document is cached and only parsed again when the modification
+    time of the file changes.
+
+    Args:
+        path (str): The path of the markdown file.
+
+    Returns:
+        list: The parsed document (see parse_markdown), or None if the file does not exist.
     """
-    A Tkinter Frame that renders a simple Markdown text.
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        _document_cache.pop(path, None)
+        return None
+    cached = _document_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as file:
+        document = parse_markdown(file.read())
+    _document_cache[path] = (mtime, document)
+    return document
+
+
+class SimpleMarkdownText(tk.Text):
+    """
+    A read-only Tkinter Text widget that renders simple Markdown.
+
+    The whole document is a single widget: headings, bullet points and bold and italic spans are styled with text
+    tags instead of separate labels, so long documents do not create a widget per line.
 
     Attributes:
-        markdown_text (str): The markdown text to be rendered.
+        document (list): The parsed document that is shown, see parse_markdown.
 
     Methods:
-        create_widgets(): Parses the markdown text and creates corresponding widgets.
-        create_heading(line): Creates a heading widget for a given markdown heading line.
-        create_bullet_point(line): Creates a bullet point widget for a given markdown bullet point line.
-        create_bold_text(line): Creates a text widget with bold formatting for given markdown bold text.
-        create_italic_text(line): Creates a text widget with italic formatting for given markdown italic text.
-        create_normal_text(line): Creates a normal text widget for a given line of text.
+        configure_tags(): Defines the text tags used for the markdown styles.
+        set_markdown(markdown_text): Parses and shows the given markdown text.
+        render(document): Shows a parsed document.
     """
-    def __init__(self, parent, markdown_text, *args, **kwargs):
+    def __init__(self, parent, markdown_text="", *args, **kwargs):
         """
-        Initializes the SimpleMarkdownText frame.
+        Initializes the SimpleMarkdownText widget.
 
         Args:
             parent (tk.Widget): The parent widget.
             markdown_text (str): The markdown text to render.
-            *args: Additional positional arguments for the Tkinter Frame.
-            **kwargs: Additional keyword arguments for the Tkinter Frame.
-        """
-        super().__init__(parent, *args, **kwargs)
-        self.markdown_text = markdown_text
-        self.create_widgets()
-        self.configure(bg="#F0F0F0")  # Set background color
-
-    def create_widgets(self):
-        """
-        Parses the markdown text and creates corresponding widgets for each line.
-        """
-        lines = self.markdown_text.split('\n')
-        for line in lines:
-            if line.startswith('#'):
-                self.create_heading(line)
-            elif line.startswith('* '):
-                self.create_bullet_point(line)
-            elif re.match(r'\*\*(.*?)\*\*', line):
-                self.create_bold_text(line)
-            elif re.match(r'\*(.*?)\*', line):
-                self.create_italic_text(line)
-            else:
-                self.create_normal_text(line)
-
-    def create_heading(self, line):
+            *args: Additional positional arguments for the Tkinter Text.
+            **kwargs: Additional keyword arguments for the Tkinter Text.
         """
-        Creates a heading widget for a given markdown heading line.
-
-        Args:
-            line (str): The markdown heading line.
-        """
-        level = len(line.split(' ')[0])
-        text = ' '.join(line.split(' ')[1:])
-        font_size = 20 - (level - 1) * 2
-        label = tk.Label(self, text=text, font=('Roboto', font_size, 'bold'), anchor='w', bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT)
-        label.pack(fill='x', pady=(10, 0))
+        kwargs.setdefault("bg", BACKGROUND_COLOR)
+        super().__init__(
+            parent, *args, wrap=tk.WORD, relief=tk.FLAT, borderwidth=0, highlightthickness=0,
+            fg=TEXT_COLOR, font=('Roboto', 12), cursor="arrow", **kwargs
+        )
+        self.document = []
+        self.configure_tags()
+        self.set_markdown(markdown_text)
 
-    def create_bullet_point(self, line):
+    def configure_tags(self) -> None:
         """
-        Creates a bullet point widget for a given markdown bullet point line.
-
-        Args:
-            line (str): The markdown bullet point line.
+        Defines the text tags for headings of level 1 to 6, bullet points, bold and italic text.
         """
-        text = line[2:]
-        label = tk.Label(self, text='• ' + text, font=('Roboto', 12), anchor='w', bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT)
-        label.pack(fill='x')
+        for level in range(1, 7):
+            self.tag_configure(f'h{level}', font=('Roboto', 20 - (level - 1) * 2, 'bold'), spacing1=10)
+        self.tag_configure('bullet', lmargin2=14)
+        self.tag_configure('bold', font=('Roboto', 12, 'bold'))
+        self.tag_configure('italic', font=('Roboto', 12, 'italic'))
 
-    def create_bold_text(self, line):
+    def set_markdown(self, markdown_text: str) -> None:
         """
-        Creates a text widget with bold formatting for given markdown bold text.
+        Parses and shows the given markdown text.
 
         Args:
-            line (str): The markdown bold text line.
-        """
-        parts = re.split(r'(\*\*.*?\*\*)', line)
-        frame = tk.Frame(self, bg="#F0F0F0")
-        frame.pack(fill='x')
-        for part in parts:
-            if part.startswith('**') and part.endswith('**'):
-                part = part[2:-2]
-                label = tk.Label(frame, text=part, font=('Roboto', 12, 'bold'), bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT, anchor='w')
-                label.pack(side='left')
-            else:
-                label = tk.Label(frame, text=part, font=('Roboto', 12), bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT, anchor='w')
-                label.pack(side='left')
-
-    def create_italic_text(self, line):
+            markdown_text (str): The markdown text to render.
         """
-        Creates a text widget with italic formatting for given markdown italic text.
+        self.render(parse_markdown(markdown_text))
 
-        Args:
-            line (str): The markdown italic text line.
-        """
-        parts = re.split(r'(\*.*?\*)', line)
-        frame = tk.Frame(self, bg="#F0F0F0")
-        frame.pack(fill='x')
-        for part in parts:
-            if part.startswith('*') and part.endswith('*'):
-                part = part[1:-1]
-                label = tk.Label(frame, text=part, font=('Roboto', 12, 'italic'), bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT, anchor='w')
-                label.pack(side='left')
-            else:
-                label = tk.Label(frame, text=part, font=('Roboto', 12), bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT, anchor='w')
-                label.pack(side='left')
-
-    def create_normal_text(self, line):
+    def render(self, document: List[Tuple[str, Tuple[str, ...]]]) -> None:
         """
-        Creates a normal text widget for a given line of text.
+        Replaces the content of the widget with a parsed document, inserted in a single call.
 
         Args:
-            line (str): The line of text.
+            document (list): The (text, tags) runs to show, see parse_markdown.
         """
-        label = tk.Label(self, text=line, font=('Roboto', 12), anchor='w', bg="#F0F0F0", fg="#45494E", wraplength=350, justify=tk.LEFT)
-        label.pack(fill='x')
+        self.document = document
+        self.configure(state=tk.NORMAL)
+        self.delete('1.0', tk.END)
+        if document:
+            self.insert(tk.END, *(item for run in document for item in run))
+        self.configure(state=tk.DISABLED)
 
 class HelpScreen:
     """
@@ -133,7 +162,8 @@ class HelpScreen:
     Methods:
         set_default_font(): Sets the default font to Roboto if available.
         show(): Displays the help screen with instructions on how the app works.
-        load_help_text(): Loads the help text from a file.
+        build(screen): Builds the help screen layout.
+        load_help_document(): Loads the parsed help text from a file.
     """
     def __init__(self, app: Any):
         """
@@ -162,28 +192,29 @@ class HelpScreen:
     def show(self) -> None:
         """
         Displays the help screen, explaining how the application works.
-        It clears any existing widgets in the main frame and creates a new help screen layout.
+        The screen is built the first time it is shown and kept for later visits. The help text is shown again
+        only if the help file changed since it was last parsed.
+        """
+        self.app.screens.show("help", self.build)
+        document = self.load_help_document()
+        if document is not self.markdown_widget.document:
+            self.markdown_widget.render(document)
+
+    def build(self, screen: ctk.CTkFrame) -> None:
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        Builds the help screen layout.
 
+        Args:
+            screen (ctk.CTkFrame): The frame of the help screen.
+        """
         # Header
-        header_frame = ctk.CTkFrame(self.app.main_frame, fg_color="#3498db", corner_radius=0)
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
         header_frame.pack(fill=tk.X, pady=(0, 20))
         ctk.CTkLabel(header_frame, text="Help", font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
 
-        # Scrollable frame for help
-        scroll_frame = ctk.CTkScrollableFrame(self.app.main_frame, fg_color="#F0F0F0")
-        scroll_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
-
-        # Help text
-        help_text = self.load_help_text()
-        markdown_widget = SimpleMarkdownText(scroll_frame, help_text, bg="#F0F0F0")
-        markdown_widget.pack(fill='both', expand=True)
-
         # Back Button
         back_button = ctk.CTkButton(
-            self.app.main_frame,
+            screen,
             text="Back to Decks",
             command=self.app.deck_manager.show_deck_manager,
             fg_color="#95a5a6",
@@ -191,17 +222,25 @@ class HelpScreen:
             height=50,
             corner_radius=10,
         )
-        back_button.pack(padx=20, pady=(0, 20), fill=tk.X)
+        back_button.pack(padx=20, pady=(0, 20), fill=tk.X, side=tk.BOTTOM)
 
-    def load_help_text(self) -> str:
+        # Help text in a single scrollable Text widget, filled by show()
+        text_frame = ctk.CTkFrame(screen, fg_color=BACKGROUND_COLOR)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        self.markdown_widget = SimpleMarkdownText(text_frame)
+        scrollbar = ctk.CTkScrollbar(text_frame, command=self.markdown_widget.yview)
+        self.markdown_widget.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.markdown_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0), pady=10)
+
+    def load_help_document(self) -> List[Tuple[str, Tuple[str, ...]]]:
         """
-        Loads the help text from a file named 'help_text.txt'.
+        Loads the parsed help text from the file HELP_TEXT_PATH, using the parse cache.
 
         Returns:
-            str: The content of the help text file. If the file is not found, returns an error message.
+            list: The parsed help text. If the file is not found, a parsed error message.
         """
-        try:
-            with open("help_text.txt", "r") as file:
-                return file.read()
-        except FileNotFoundError:
-            return "Help text file not found. Please ensure 'help_text.txt' is in the same directory as the application."
\ No newline at end of file
+        document = load_markdown_document(HELP_TEXT_PATH)
+        if document is None:
+            return parse_markdown(HELP_TEXT_MISSING)
+        return document
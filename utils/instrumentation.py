@@ -0,0 +1,136 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Set this environment variable to record timings; without it the decorators and measure() cost nothing
+INSTRUMENTATION_ENV = "FLASHCARDS_INSTRUMENTATION"
+ENABLED = bool(os.environ.get(INSTRUMENTATION_ENV))
+# Number of most recent calls kept
+RING_SIZE = 2000
+
+# Recorded calls as (name, monotonic start time, duration in seconds, number of widgets or None, thread name)
+records = deque(maxlen=RING_SIZE)
+# Root window whose widgets are counted after every call on the Tk thread
+_root = None
+_NO_MEASUREMENT = nullcontext()
+
+
+def set_root(root):
+    """
+    Count the widgets of the given root window after every measured call on the main thread.
+    """
+    global _root
+    _root = root
+
+
+def count_widgets(widget):
+    """
+    Return the number of widgets in the tree below the given widget, including the widget itself.
+    """
+    count = 0
+    pending = [widget]
+    while pending:
+        count += 1
+        pending.extend(pending.pop().winfo_children())
+    return count
+
+
+def _record(name, start, end):
+    widgets = None
+    # Tk may only be called from the thread that created it
+    if _root is not None and threading.current_thread() is threading.main_thread():
+        widgets = count_widgets(_root)
+    records.append((name, start, end - start, widgets, threading.current_thread().name))
+
+
+@contextmanager
+def _measure(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, start, time.perf_counter())
+
+
+def measure(name):
+    """
+    Context manager recording the time spent in the with block as a call of name. Returns a shared no-op context
+    manager if instrumentation is disabled.
+    """
+    if not ENABLED:
+        return _NO_MEASUREMENT
+    return _measure(name)
+
+
+def timed(name=None):
+    """
+    Decorator recording every call of the function, under the given name or the function's qualified name. If
+    instrumentation is disabled, the function is returned unchanged.
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(label, start, time.perf_counter())
+
+        return wrapper
+
+    return decorate
+
+
+def summary():
+    """
+    Return statistics of the recorded calls per name, sorted by total time: a list of dictionaries with the keys
+    "name", "calls", "total_ms", "mean_ms", "p95_ms", "max_ms" and "widgets" (the last widget count, or None).
+    """
+    durations = {}
+    widgets = {}
+    # list() copies the ring buffer in one step, while workers may still append to it
+    for name, _, duration, widget_count, _ in list(records):
+        durations.setdefault(name, []).append(duration)
+        if widget_count is not None:
+            widgets[name] = widget_count
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({
+            "name": name,
+            "calls": len(values),
+            "total_ms": sum(values) * 1000,
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))] * 1000,
+            "max_ms": values[-1] * 1000,
+            "widgets": widgets.get(name),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def dump(path):
+    """
+    Write the recorded calls and their summary to a JSON file for offline analysis.
+    """
+    data = {
+        "calls": [
+            {"name": name, "start": start, "duration_ms": duration * 1000, "widgets": widget_count, "thread": thread}
+            for name, start, duration, widget_count, thread in list(records)
+        ],
+        "summary": summary(),
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def clear():
+    records.clear()
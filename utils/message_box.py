@@ -6,70 +6,132 @@ class MessageBox:
     def __init__(self, app):
         self.app = app
 
-    def show_message(self, title, message, type="info"): # TODO implement message types properly
-        # Clear the main frame
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+    def show_message(self, title, message, type="info", on_ok=None): # TODO implement message types properly
+        """
+        Show a message with an OK button. OK returns to the deck manager unless on_ok is given.
+        """
+        self.app.screens.show("message", self.build_message_screen)
+        self.message_title_label.configure(text=title)
+        self.message_label.configure(text=message)
+        self.ok_button.configure(command=on_ok or self.app.deck_manager.show_deck_manager)
+        self.ok_button.focus_set()  # Set focus to the OK button
 
+    def build_message_screen(self, screen):
        # Create the message box layout
-        header_frame = ctk.CTkFrame(self.app.main_frame, fg_color="#3498db", corner_radius=0)
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(header_frame, text=title, font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
+        self.message_title_label = ctk.CTkLabel(header_frame, text="", font=("Roboto", 24, "bold"), text_color="white")
+        self.message_title_label.pack(pady=20)
 
         # Create the message frame
-        message_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        message_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         message_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        ctk.CTkLabel(message_frame, text=message, font=("Roboto", 14), wraplength=300).pack(pady=20)
+        self.message_label = ctk.CTkLabel(message_frame, text="", font=("Roboto", 14), wraplength=300)
+        self.message_label.pack(pady=20)
 
         # Create the OK button
-        ok_button = ctk.CTkButton(
+        self.ok_button = ctk.CTkButton(
             message_frame,
             text="OK",
-            command=self.app.deck_manager.show_deck_manager,
             fg_color="#3498db",
             hover_color="#2980b9",
         )
-        ok_button.pack(pady=10)
-        ok_button.focus_set()  # Set focus to the OK button
-        ok_button.bind("<Return>", lambda event: ok_button.invoke())  # Bind Enter key to OK button
+        self.ok_button.pack(pady=10)
+        self.ok_button.bind("<Return>", lambda event: self.ok_button.invoke())  # Bind Enter key to OK button
 
     def show_confirmation(self, title, message, on_yes, on_no):
         """
         Show a confirmation message box with Yes and No buttons. Used across modules to confirm actions.
         """
-        for widget in self.app.main_frame.winfo_children():
-            widget.destroy()
+        self.app.screens.show("confirmation", self.build_confirmation_screen)
+        self.confirmation_title_label.configure(text=title)
+        self.confirmation_label.configure(text=message)
+        self.yes_button.configure(command=on_yes)
+        self.no_button.configure(command=on_no)
+        self.yes_button.focus_set()  # Set focus to the Yes button
 
-        header_frame = ctk.CTkFrame(self.app.main_frame, fg_color="#3498db", corner_radius=0)
+    def build_confirmation_screen(self, screen):
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
         header_frame.pack(fill=tk.X, pady=(0, 20))
-        ctk.CTkLabel(header_frame, text=title, font=("Roboto", 24, "bold"), text_color="white").pack(pady=20)
+        self.confirmation_title_label = ctk.CTkLabel(
+            header_frame, text="", font=("Roboto", 24, "bold"), text_color="white"
+        )
+        self.confirmation_title_label.pack(pady=20)
 
-        message_frame = ctk.CTkFrame(self.app.main_frame, fg_color="white", corner_radius=10)
+        message_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
         message_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        ctk.CTkLabel(message_frame, text=message, font=("Roboto", 14), wraplength=300).pack(pady=20)
+        self.confirmation_label = ctk.CTkLabel(message_frame, text="", font=("Roboto", 14), wraplength=300)
+        self.confirmation_label.pack(pady=20)
 
         button_frame = ctk.CTkFrame(message_frame, fg_color="transparent")
         button_frame.pack(pady=10)
 
-        yes_button = ctk.CTkButton(
+        self.yes_button = ctk.CTkButton(
             button_frame,
             text="Yes",
-            command=on_yes,
             fg_color="#2ecc71",
             hover_color="#27ae60",
         )
-        yes_button.pack(side=tk.LEFT, padx=10)
-        yes_button.focus_set()  # Set focus to the Yes button
-        yes_button.bind("<Return>", lambda event: yes_button.invoke())  # Bind Enter key to Yes button
+        self.yes_button.pack(side=tk.LEFT, padx=10)
+        self.yes_button.bind("<Return>", lambda event: self.yes_button.invoke())  # Bind Enter key to Yes button
 
-        no_button = ctk.CTkButton(
+        self.no_button = ctk.CTkButton(
             button_frame,
             text="No",
-            command=on_no,
             fg_color="#e74c3c",
             hover_color="#c0392b",
         )
-        no_button.pack(side=tk.LEFT, padx=10)
-        no_button.bind("<Return>", lambda event: no_button.invoke())  # Bind Enter key to No button
+        self.no_button.pack(side=tk.LEFT, padx=10)
+        self.no_button.bind("<Return>", lambda event: self.no_button.invoke())  # Bind Enter key to No button
+
+    def show_progress(self, title, message, on_cancel):
+        """
+        Show a progress screen with a progress bar and a Cancel button. Used while a long operation runs in the
+        background. The progress is updated with update_progress.
+        """
+        self.app.screens.show("progress", self.build_progress_screen)
+        self.progress_title_label.configure(text=title)
+        self.progress_message_label.configure(text=message)
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="")
+        self.cancel_button.configure(command=on_cancel)
+        self.cancel_button.focus_set()
+
+    def build_progress_screen(self, screen):
+        header_frame = ctk.CTkFrame(screen, fg_color="#3498db", corner_radius=0)
+        header_frame.pack(fill=tk.X, pady=(0, 20))
+        self.progress_title_label = ctk.CTkLabel(header_frame, text="", font=("Roboto", 24, "bold"), text_color="white")
+        self.progress_title_label.pack(pady=20)
+
+        message_frame = ctk.CTkFrame(screen, fg_color="white", corner_radius=10)
+        message_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        self.progress_message_label = ctk.CTkLabel(message_frame, text="", font=("Roboto", 14), wraplength=300)
+        self.progress_message_label.pack(pady=20)
+
+        self.progress_bar = ctk.CTkProgressBar(message_frame, width=300)
+        self.progress_bar.pack(pady=10)
+
+        self.progress_label = ctk.CTkLabel(message_frame, text="", font=("Roboto", 14))
+        self.progress_label.pack(pady=10)
+
+        self.cancel_button = ctk.CTkButton(
+            message_frame,
+            text="Cancel",
+            fg_color="#e74c3c",
+            hover_color="#c0392b",
+        )
+        self.cancel_button.pack(pady=10)
+        self.cancel_button.bind("<Return>", lambda event: self.cancel_button.invoke())  # Bind Enter key to Cancel button
+
+    def update_progress(self, done, total, unit=""):
+        """
+        Update the progress screen shown by show_progress. total may be None if it is unknown.
+        """
+        if total:
+            self.progress_bar.set(min(done / total, 1))
+            self.progress_label.configure(text=f"{done:,} of {total:,} {unit}".rstrip())
+        else:
+            self.progress_label.configure(text=f"{done:,} {unit}".rstrip())
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Set this environment variable to print the startup phases once the first frame is shown
+STARTUP_TIMING_ENV = "FLASHCARDS_STARTUP_TIMING"
+
+
+class StartupTimer:
+    """
+    Records how long the phases of the application start take, from the creation of the timer (as early as possible
+    in main.py) to the first frame.
+
+    Every phase is recorded as (name, seconds). The whole start is summed up in total(), and report() formats the
+    phases for printing, so a slower cold start shows which phase grew.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+        self.finished = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Record the time spent in the with block as the phase name.
+        """
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - phase_start))
+
+    def finish(self):
+        """
+        Mark the end of the start, when the first frame was shown. Prints the report if STARTUP_TIMING_ENV is set.
+        """
+        if self.finished is not None:
+            return
+        self.finished = time.perf_counter()
+        if os.environ.get(STARTUP_TIMING_ENV):
+            print(self.report(), file=sys.stderr)
+
+    def total(self):
+        """
+        Return the seconds from the creation of the timer to finish(), or until now if the start is not finished.
+        """
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def report(self):
+        lines = [f"{name:<24}{seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'total to first frame':<24}{self.total() * 1000:8.1f} ms")
+        return "\n".join(lines)
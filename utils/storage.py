@@ -0,0 +1,284 @@
+import sqlite3
+
+from cards.flashcard import FlashCard
+from cards.flashcard_set import FlashCardSet
+from cards.library import FlashCardLibrary, new_device_id
+
+# Decks with more cards than this are loaded into compact array-backed storage
+COMPACT_THRESHOLD = 50_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    title_edited REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    deck_id TEXT NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    due REAL NOT NULL DEFAULT 0,
+    edited REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS cards_by_deck ON cards(deck_id, seq);
+-- Review counts other devices contributed to a card, see cards.sync
+CREATE TABLE IF NOT EXISTS card_counts (
+    card_id INTEGER NOT NULL REFERENCES cards(id) ON DELETE CASCADE,
+    device TEXT NOT NULL,
+    review_count INTEGER NOT NULL,
+    correct_count INTEGER NOT NULL,
+    PRIMARY KEY (card_id, device)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns added since the first version of the schema, added to older databases when they are opened
+ADDED_COLUMNS = {
+    "decks": {"title_edited": "REAL NOT NULL DEFAULT 0"},
+    "cards": {"edited": "REAL NOT NULL DEFAULT 0"},
+}
+
+UPSERT_DECK = """
+INSERT INTO decks (id, seq, title, title_edited) VALUES (?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET title = excluded.title, title_edited = excluded.title_edited
+"""
+
+# Existing cards keep their seq, so the order of the cards in a deck is the order in which they were added
+UPSERT_CARD = """
+INSERT INTO cards (id, deck_id, seq, front, back, review_count, correct_count, ease, interval, repetitions, due, edited)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    deck_id = excluded.deck_id,
+    front = excluded.front,
+    back = excluded.back,
+    review_count = excluded.review_count,
+    correct_count = excluded.correct_count,
+    ease = excluded.ease,
+    interval = excluded.interval,
+    repetitions = excluded.repetitions,
+    due = excluded.due,
+    edited = excluded.edited
+"""
+
+UPSERT_CARD_COUNTS = """
+INSERT INTO card_counts (card_id, device, review_count, correct_count) VALUES (?, ?, ?, ?)
+ON CONFLICT(card_id, device) DO UPDATE SET
+    review_count = excluded.review_count,
+    correct_count = excluded.correct_count
+"""
+
+DELETE_CARD = "DELETE FROM cards WHERE id = ?"
+DELETE_DECK = "DELETE FROM decks WHERE id = ?"
+SET_META = "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+
+SELECT_DECKS = "SELECT id, title, title_edited FROM decks ORDER BY seq"
+SELECT_CARDS = """
+SELECT id, front, back, review_count, correct_count, ease, interval, repetitions, due, edited
+FROM cards WHERE deck_id = ? ORDER BY seq
+"""
+SELECT_CARD_COUNTS = """
+SELECT card_id, device, card_counts.review_count, card_counts.correct_count
+FROM card_counts JOIN cards ON cards.id = card_counts.card_id WHERE deck_id = ?
+"""
+
+
+class SQLiteStorage:
+    """
+    Persistent storage of the library in a SQLite database in WAL mode.
+
+    The storage listens to the changes of the library (see FlashCardLibrary.listeners) and only remembers which
+    decks and cards changed. flush() writes just those rows in a single transaction with executemany, so saving
+    after a study session costs a few row updates instead of re-serialising the whole library.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self._add_missing_columns()
+        self.library = None
+        self._new_decks = {}
+        self._changed_decks = {}
+        self._removed_decks = set()
+        # Pending card changes and removals, by card id to the deck of the card
+        self._changed_cards = {}
+        self._removed_cards = {}
+        self._next_deck_seq = self._max_seq("decks") + 1
+        self._next_card_seq = self._max_seq("cards") + 1
+
+    def _add_missing_columns(self):
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns.items():
+                if name not in existing:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    def _max_seq(self, table):
+        return self.connection.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {table}").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        """
+        Return the value stored under the given key in the meta table.
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_meta(self, key, value):
+        """
+        Store a value under the given key in the meta table.
+        """
+        with self.connection:
+            self.connection.execute(SET_META, (key, str(value)))
+
+    def load_library(self):
+        """
+        Load the stored library and start tracking its changes. Decks with more than COMPACT_THRESHOLD cards use
+        compact storage.
+        """
+        device_id = self.get_meta("device_id")
+        if device_id is None:
+            device_id = new_device_id()
+            self.set_meta("device_id", device_id)
+        library = FlashCardLibrary(device_id=device_id)
+        for deck_id, title, title_edited in self.connection.execute(SELECT_DECKS).fetchall():
+            (card_count,) = self.connection.execute(
+                "SELECT COUNT(*) FROM cards WHERE deck_id = ?", (deck_id,)
+            ).fetchone()
+            flashcard_set = FlashCardSet(title, compact=card_count > COMPACT_THRESHOLD, deck_id=deck_id)
+            flashcard_set.title_edited = title_edited
+            append = flashcard_set.cards.append
+            for card_id, front, back, review_count, correct_count, ease, interval, repetitions, due, edited in (
+                self.connection.execute(SELECT_CARDS, (deck_id,))
+            ):
+                append(FlashCard(
+                    front, back, review_count, correct_count, card_id, ease, interval, repetitions, due, edited
+                ))
+            remote_counts = flashcard_set.remote_counts
+            for card_id, device, review_count, correct_count in self.connection.execute(SELECT_CARD_COUNTS, (deck_id,)):
+                remote_counts.setdefault(card_id, {})[device] = (review_count, correct_count)
+            library.append(flashcard_set)
+        library.review_log_offset = int(self.get_meta("review_log_offset", 0))
+        self.attach(library)
+        return library
+
+    def attach(self, library):
+        """
+        Start tracking the changes of the given library.
+        """
+        self.library = library
+        library.listeners.append(self.on_change)
+
+    def on_change(self, flashcard_set, card_id, removed):
+        """
+        Library listener remembering which rows have to be written by the next flush.
+        """
+        if card_id is None:
+            if removed:
+                self._new_decks.pop(flashcard_set.id, None)
+                self._changed_decks.pop(flashcard_set.id, None)
+                self._removed_decks.add(flashcard_set.id)
+                # Deleting the deck deletes its cards, and writing them after it would violate the foreign key
+                self._changed_cards = {
+                    card_id: deck for card_id, deck in self._changed_cards.items() if deck is not flashcard_set
+                }
+                self._removed_cards = {
+                    card_id: deck for card_id, deck in self._removed_cards.items() if deck is not flashcard_set
+                }
+            elif flashcard_set.id in self._new_decks or flashcard_set.library is None:
+                return
+            elif flashcard_set.id in self._removed_decks or not self._deck_is_stored(flashcard_set):
+                # A deck added to the library is written in full, with all its cards
+                self._removed_decks.discard(flashcard_set.id)
+                self._new_decks[flashcard_set.id] = flashcard_set
+            else:
+                self._changed_decks[flashcard_set.id] = flashcard_set
+        elif flashcard_set.id not in self._new_decks:
+            if removed:
+                self._changed_cards.pop(card_id, None)
+                self._removed_cards[card_id] = flashcard_set
+            else:
+                self._removed_cards.pop(card_id, None)
+                self._changed_cards[card_id] = flashcard_set
+
+    def _deck_is_stored(self, flashcard_set):
+        return self.connection.execute("SELECT 1 FROM decks WHERE id = ?", (flashcard_set.id,)).fetchone() is not None
+
+    def _deck_row(self, flashcard_set):
+        seq = self._next_deck_seq
+        self._next_deck_seq += 1
+        return flashcard_set.id, seq, flashcard_set.title, flashcard_set.title_edited
+
+    def _card_row(self, deck_id, record):
+        """
+        Return the cards table row for a card record (see FlashCard.record).
+        """
+        seq = self._next_card_seq
+        self._next_card_seq += 1
+        return (record[0], deck_id, seq, *record[1:])
+
+    def flush(self):
+        """
+        Write all pending changes in one transaction, together with the library's review log offset.
+        """
+        if self.library is None:
+            return
+        changed_cards = [
+            self._card_row(flashcard_set.id, flashcard_set.cards.get(card_id).record())
+            for card_id, flashcard_set in self._changed_cards.items()
+            if flashcard_set.cards.has(card_id)
+        ]
+        with self.connection:
+            execute_many = self.connection.executemany
+            # New decks are rewritten from scratch, in case a deck was removed and added again before this flush
+            execute_many(DELETE_DECK, ((deck_id,) for deck_id in [*self._removed_decks, *self._new_decks]))
+            execute_many(UPSERT_DECK, (self._deck_row(deck) for deck in self._new_decks.values()))
+            execute_many(UPSERT_DECK, (self._deck_row(deck) for deck in self._changed_decks.values()))
+            for flashcard_set in self._new_decks.values():
+                records = flashcard_set.cards.records()
+                execute_many(UPSERT_CARD, (self._card_row(flashcard_set.id, record) for record in records))
+                execute_many(UPSERT_CARD_COUNTS, _count_rows(flashcard_set.remote_counts))
+            execute_many(DELETE_CARD, ((card_id,) for card_id in self._removed_cards))
+            execute_many(UPSERT_CARD, changed_cards)
+            # The counts of other devices only grow, so rows are never removed but with their card
+            execute_many(UPSERT_CARD_COUNTS, _count_rows({
+                card_id: flashcard_set.remote_counts[card_id]
+                for card_id, flashcard_set in self._changed_cards.items()
+                if card_id in flashcard_set.remote_counts
+            }))
+            self.connection.execute(SET_META, ("review_log_offset", str(self.library.review_log_offset)))
+        self._new_decks.clear()
+        self._changed_decks.clear()
+        self._removed_decks.clear()
+        self._changed_cards.clear()
+        self._removed_cards.clear()
+
+    def close(self):
+        """
+        Write pending changes and close the database.
+        """
+        self.flush()
+        self.connection.close()
+
+
+def _count_rows(remote_counts):
+    """
+    Yield the card_counts rows of a FlashCardSet.remote_counts dictionary.
+    """
+    for card_id, counts in remote_counts.items():
+        for device, (review_count, correct_count) in counts.items():
+            yield card_id, device, review_count, correct_count